@@ -0,0 +1,26 @@
+"""add applications status updated_at index
+
+Revision ID: 0a9c3e5b7d24
+Revises: f6b2d8e4a013
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0a9c3e5b7d24"
+down_revision: Union[str, Sequence[str], None] = "f6b2d8e4a013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_applications_status_updated_at", "applications", ["status", "updated_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_applications_status_updated_at", table_name="applications")
@@ -0,0 +1,31 @@
+"""add application audit log history index
+
+Revision ID: 1b4d6f8a0c35
+Revises: 0a9c3e5b7d24
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "1b4d6f8a0c35"
+down_revision: Union[str, Sequence[str], None] = "0a9c3e5b7d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_application_audit_logs_application_id_timestamp",
+        "application_audit_logs",
+        ["application_id", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_application_audit_logs_application_id_timestamp", table_name="application_audit_logs"
+    )
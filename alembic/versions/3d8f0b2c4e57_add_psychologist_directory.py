@@ -0,0 +1,79 @@
+"""add consult area tags and psychologist directory indexes
+
+Revision ID: 3d8f0b2c4e57
+Revises: 2c5e7a9b1d46
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "3d8f0b2c4e57"
+down_revision: Union[str, Sequence[str], None] = "2c5e7a9b1d46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# То же, что models.psychologists.parse_consult_areas: части через запятую без лишних пробелов
+SPLIT_CONSULT_AREAS = """
+    SELECT p.id AS psychologist_id, regexp_replace(trim(area), '\\s+', ' ', 'g') AS name
+    FROM psychologists p, unnest(string_to_array(p.consult_areas, ',')) AS area
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        "consult_areas",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "psychologists_consult_areas",
+        sa.Column("psychologist_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("consult_area_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["psychologist_id"], ["psychologists.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["consult_area_id"], ["consult_areas.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("psychologist_id", "consult_area_id"),
+    )
+    op.create_index(
+        "ix_psychologists_consult_areas_consult_area_id",
+        "psychologists_consult_areas",
+        ["consult_area_id", "psychologist_id"],
+        unique=False,
+    )
+
+    op.execute(f"""
+        INSERT INTO consult_areas (id, name)
+        SELECT gen_random_uuid(), name
+        FROM (SELECT DISTINCT name FROM ({SPLIT_CONSULT_AREAS}) split WHERE name <> '') names
+    """)
+    op.execute(f"""
+        INSERT INTO psychologists_consult_areas (psychologist_id, consult_area_id)
+        SELECT DISTINCT split.psychologist_id, ca.id
+        FROM ({SPLIT_CONSULT_AREAS}) split
+        JOIN consult_areas ca ON ca.name = split.name
+    """)
+
+    op.create_index("ix_psychologists_office", "psychologists", ["office"], unique=False)
+    op.create_index("ix_psychologists_qualification", "psychologists", ["qualification"], unique=False)
+    op.execute(
+        "CREATE INDEX ix_users_full_name_trgm ON users USING gin "
+        "((first_name || ' ' || coalesce(middle_name, '') || ' ' || last_name) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_full_name_trgm", table_name="users")
+    op.drop_index("ix_psychologists_qualification", table_name="psychologists")
+    op.drop_index("ix_psychologists_office", table_name="psychologists")
+    op.drop_index("ix_psychologists_consult_areas_consult_area_id", table_name="psychologists_consult_areas")
+    op.drop_table("psychologists_consult_areas")
+    op.drop_table("consult_areas")
@@ -0,0 +1,36 @@
+"""add keyset pagination indexes
+
+Revision ID: 3e7a9c1d5b2f
+Revises: 8a7b6c5d4e3f
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "3e7a9c1d5b2f"
+down_revision: Union[str, Sequence[str], None] = "8a7b6c5d4e3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_applications_created_at_id", "applications", ["created_at", "id"]),
+    ("ix_applications_updated_at_id", "applications", ["updated_at", "id"]),
+    ("ix_applications_status_id", "applications", ["status", "id"]),
+    ("ix_applications_user_id_created_at_id", "applications", ["user_id", "created_at", "id"]),
+    ("ix_news_created_at_id", "news", ["created_at", "id"]),
+    ("ix_articles_title_id", "articles", ["title", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,73 @@
+"""add materialized views for manager statistics
+
+Revision ID: 4e9a1c3d5f68
+Revises: 3d8f0b2c4e57
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "4e9a1c3d5f68"
+down_revision: Union[str, Sequence[str], None] = "3d8f0b2c4e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Уникальный индекс нужен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+VIEWS = (
+    (
+        "statistics_application_counts",
+        """
+        SELECT status, university_status, count(*) AS applications
+        FROM applications
+        GROUP BY status, university_status
+        """,
+        ["status", "university_status"],
+    ),
+    (
+        "statistics_application_durations",
+        """
+        SELECT 1 AS id,
+               percentile_cont(0.5) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM processing_started_at - created_at)
+               ) AS median_seconds_to_in_progress,
+               percentile_cont(0.5) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM completed_at - created_at)
+               ) AS median_seconds_to_completed,
+               count(processing_started_at) AS started,
+               count(completed_at) AS completed,
+               now() AS refreshed_at
+        FROM applications
+        """,
+        ["id"],
+    ),
+    (
+        # Недели по московскому времени (SCHEDULE_TIMEZONE по умолчанию); при смене пояса
+        # поменять и repositories.statistics.WEEKLY_LOAD_TIMEZONE - иначе refresher не запустится
+        "statistics_psychologist_weekly_load",
+        """
+        SELECT psychologist_id,
+               date_trunc('week', scheduled_time AT TIME ZONE 'Europe/Moscow')::date AS week,
+               count(*) AS appointments,
+               count(*) FILTER (WHERE status = 'done') AS done,
+               count(*) FILTER (WHERE status = 'cancelled') AS cancelled
+        FROM appointments
+        GROUP BY psychologist_id, week
+        """,
+        ["week", "psychologist_id"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, query, unique_columns in VIEWS:
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+        op.execute(f"CREATE UNIQUE INDEX ux_{name} ON {name} ({', '.join(unique_columns)})")
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(VIEWS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
@@ -0,0 +1,43 @@
+"""link email outbox rows to password reset tokens
+
+Revision ID: 5f0a2b4c6d79
+Revises: 4e9a1c3d5f68
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "5f0a2b4c6d79"
+down_revision: Union[str, Sequence[str], None] = "4e9a1c3d5f68"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "email_outbox",
+        sa.Column("password_reset_token_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_email_outbox_password_reset_token_id",
+        "email_outbox",
+        "password_reset_tokens",
+        ["password_reset_token_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    # Уже отправленные письма восстановления пароля хранят ссылку с токеном в открытом виде
+    op.execute(
+        "UPDATE email_outbox SET text = '', html = '' "
+        "WHERE status IN ('sent', 'dead') AND subject = 'Восстановление пароля'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_email_outbox_password_reset_token_id", "email_outbox", type_="foreignkey")
+    op.drop_column("email_outbox", "password_reset_token_id")
@@ -0,0 +1,44 @@
+"""add applications indexes for filtered sorts
+
+Revision ID: 6a1c3e5b7d80
+Revises: 5f0a2b4c6d79
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "6a1c3e5b7d80"
+down_revision: Union[str, Sequence[str], None] = "5f0a2b4c6d79"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (фильтр, поле сортировки, id) для сочетаний, которых не было
+INDEXES = (
+    ("ix_applications_status_updated_at_id", ["status", "updated_at", "id"]),
+    ("ix_applications_status_scheduled_at_id", ["status", "scheduled_at", "id"]),
+    ("ix_applications_assigned_to_updated_at_id", ["assigned_to", "updated_at", "id"]),
+    ("ix_applications_assigned_to_scheduled_at_id", ["assigned_to", "scheduled_at", "id"]),
+    ("ix_applications_assigned_to_status_id", ["assigned_to", "status", "id"]),
+    ("ix_applications_user_id_updated_at_id", ["user_id", "updated_at", "id"]),
+    ("ix_applications_user_id_scheduled_at_id", ["user_id", "scheduled_at", "id"]),
+    ("ix_applications_user_id_status_id", ["user_id", "status", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "applications", columns, unique=False)
+    # Покрывается ix_applications_status_updated_at_id (поиск просроченных заявок)
+    op.drop_index("ix_applications_status_updated_at", table_name="applications")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_applications_status_updated_at", "applications", ["status", "updated_at"], unique=False
+    )
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="applications")
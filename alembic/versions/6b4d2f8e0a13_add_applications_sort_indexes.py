@@ -0,0 +1,33 @@
+"""add applications sort indexes
+
+Revision ID: 6b4d2f8e0a13
+Revises: 3e7a9c1d5b2f
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "6b4d2f8e0a13"
+down_revision: Union[str, Sequence[str], None] = "3e7a9c1d5b2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_applications_scheduled_at_id", ["scheduled_at", "id"]),
+    ("ix_applications_status_created_at_id", ["status", "created_at", "id"]),
+    ("ix_applications_assigned_to_created_at_id", ["assigned_to", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "applications", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="applications")
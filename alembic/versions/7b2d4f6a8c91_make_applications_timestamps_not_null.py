@@ -0,0 +1,42 @@
+"""make applications created_at and updated_at not null
+
+Revision ID: 7b2d4f6a8c91
+Revises: 6a1c3e5b7d80
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "7b2d4f6a8c91"
+down_revision: Union[str, Sequence[str], None] = "6a1c3e5b7d80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Строки, вставленные в обход ORM без дат
+    op.execute("UPDATE applications SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL")
+    op.execute("UPDATE applications SET updated_at = created_at WHERE updated_at IS NULL")
+    for column in ("created_at", "updated_at"):
+        op.alter_column(
+            "applications",
+            column,
+            existing_type=sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    for column in ("created_at", "updated_at"):
+        op.alter_column(
+            "applications",
+            column,
+            existing_type=sa.DateTime(timezone=True),
+            server_default=None,
+            nullable=True,
+        )
@@ -0,0 +1,32 @@
+"""add appointments access indexes
+
+Revision ID: 7c2e9a4f1b86
+Revises: 6b4d2f8e0a13
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "7c2e9a4f1b86"
+down_revision: Union[str, Sequence[str], None] = "6b4d2f8e0a13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_appointments_patient_id_scheduled_time", ["patient_id", "scheduled_time"]),
+    ("ix_appointments_psychologist_id_scheduled_time", ["psychologist_id", "scheduled_time"]),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "appointments", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="appointments")
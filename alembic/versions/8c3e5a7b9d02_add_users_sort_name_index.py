@@ -0,0 +1,25 @@
+"""add users sort name index for psychologist directory paging
+
+Revision ID: 8c3e5a7b9d02
+Revises: 7b2d4f6a8c91
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "8c3e5a7b9d02"
+down_revision: Union[str, Sequence[str], None] = "7b2d4f6a8c91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Выражение должно совпадать с models.users.USER_SORT_NAME
+    op.execute("CREATE INDEX ix_users_sort_name_id ON users ((last_name || ' ' || first_name), id)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_sort_name_id", table_name="users")
@@ -0,0 +1,30 @@
+"""drop single-column applications indexes covered by composite ones
+
+Revision ID: 9d4f6b8c0e13
+Revises: 8c3e5a7b9d02
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "9d4f6b8c0e13"
+down_revision: Union[str, Sequence[str], None] = "8c3e5a7b9d02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Каждый - префикс составного индекса (колонка, ..., id)
+REDUNDANT_INDEXES = ("user_id", "status", "assigned_to")
+
+
+def upgrade() -> None:
+    for column in REDUNDANT_INDEXES:
+        op.drop_index(op.f(f"ix_applications_{column}"), table_name="applications")
+
+
+def downgrade() -> None:
+    for column in REDUNDANT_INDEXES:
+        op.create_index(op.f(f"ix_applications_{column}"), "applications", [column], unique=False)
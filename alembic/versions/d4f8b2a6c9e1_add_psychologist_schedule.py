@@ -0,0 +1,84 @@
+"""add psychologist schedule
+
+Revision ID: d4f8b2a6c9e1
+Revises: 7c2e9a4f1b86
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from psychohelp.config.config import config
+
+
+revision: str = "d4f8b2a6c9e1"
+down_revision: Union[str, Sequence[str], None] = "7c2e9a4f1b86"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "psychologist_working_hours",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("psychologist_id", sa.UUID(), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False, comment="День недели, 0 - понедельник"),
+        sa.Column("start_time", sa.Time(), nullable=False, comment="Начало рабочего времени"),
+        sa.Column("end_time", sa.Time(), nullable=False, comment="Конец рабочего времени"),
+        sa.Column("slot_minutes", sa.Integer(), nullable=False, comment="Длительность одного слота"),
+        sa.CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_working_hours_weekday"),
+        sa.CheckConstraint("start_time < end_time", name="ck_working_hours_time_range"),
+        sa.CheckConstraint("slot_minutes > 0", name="ck_working_hours_slot_minutes"),
+        sa.ForeignKeyConstraint(["psychologist_id"], ["psychologists.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_psychologist_working_hours_psychologist_id"),
+        "psychologist_working_hours",
+        ["psychologist_id"],
+        unique=False,
+    )
+
+    op.add_column(
+        "appointments",
+        sa.Column(
+            "scheduled_end_time",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Время окончания встречи",
+        ),
+    )
+    # Та же длительность, что у новых встреч; от нее зависит ограничение ниже
+    op.execute(
+        sa.text(
+            "UPDATE appointments SET scheduled_end_time = scheduled_time + make_interval(mins => :minutes)"
+        ).bindparams(minutes=config.APPOINTMENT_DURATION_MINUTES)
+    )
+    op.alter_column("appointments", "scheduled_end_time", nullable=False)
+
+    # Ожидающие встречи одного психолога не должны пересекаться по времени.
+    # Если в базе уже есть такие пересечения, их нужно разобрать до миграции.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE appointments
+        ADD CONSTRAINT ex_appointments_psychologist_time
+        EXCLUDE USING gist (
+            psychologist_id WITH =,
+            tstzrange(scheduled_time, scheduled_end_time) WITH &&
+        )
+        WHERE (status = 'awaiting')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE appointments DROP CONSTRAINT ex_appointments_psychologist_time")
+    op.drop_column("appointments", "scheduled_end_time")
+    op.drop_index(
+        op.f("ix_psychologist_working_hours_psychologist_id"),
+        table_name="psychologist_working_hours",
+    )
+    op.drop_table("psychologist_working_hours")
@@ -0,0 +1,46 @@
+"""add appointment reminders
+
+Revision ID: f6b2d8e4a013
+Revises: e5a1c7d3f902
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f6b2d8e4a013"
+down_revision: Union[str, Sequence[str], None] = "e5a1c7d3f902"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "appointments",
+        sa.Column(
+            "reminder_sent_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Когда отправлено напоминание",
+        ),
+    )
+    # Прошедшие напоминания не отправляем задним числом
+    op.execute(
+        "UPDATE appointments SET reminder_sent_at = now() "
+        "WHERE remind_time IS NOT NULL AND remind_time < now()"
+    )
+    op.create_index(
+        "ix_appointments_pending_reminders",
+        "appointments",
+        ["remind_time"],
+        unique=False,
+        postgresql_where=sa.text("status = 'awaiting' AND reminder_sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_appointments_pending_reminders", table_name="appointments")
+    op.drop_column("appointments", "reminder_sent_at")
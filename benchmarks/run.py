@@ -0,0 +1,299 @@
+"""
+Нагрузочный прогон горячих эндпоинтов против ASGI-приложения и локального Postgres.
+
+База берется из тех же переменных POSTGRES_*, что и у приложения, и должна
+быть отдельной (схема - alembic upgrade head). С --seed в пустую базу
+загружается синтетический набор (как psychohelp-seed).
+
+    python benchmarks/run.py --seed --concurrency 32 --duration 30 --output bench.json
+    python benchmarks/run.py --compare bench.json
+
+Результат - JSON с p50/p95/p99, запросами в секунду и числом SQL-запросов
+на HTTP-запрос по каждому сценарию; --compare печатает разницу с прошлым
+прогоном (например, с результатом на предыдущем коммите).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@dataclass
+class Actor:
+    email: str
+    address: str
+    is_psychologist: bool
+    application_ids: list = field(default_factory=list)
+
+
+@dataclass
+class ScenarioStats:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def record(self, seconds: float, queries: int, status: int) -> None:
+        self.latencies.append(seconds)
+        self.queries.append(queries)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self, duration: float) -> dict:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        errors = sum(n for status, n in self.statuses.items() if status >= 400)
+        return {
+            "requests": count,
+            "errors": errors,
+            "rps": round(count / duration, 2) if duration else 0.0,
+            "latency_ms": {
+                "p50": _percentile_ms(latencies, 50),
+                "p95": _percentile_ms(latencies, 95),
+                "p99": _percentile_ms(latencies, 99),
+                "max": round(latencies[-1] * 1000, 2) if latencies else None,
+            },
+            "queries_per_request": round(sum(self.queries) / count, 2) if count else None,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+        }
+
+
+def _percentile_ms(sorted_values: list[float], percent: float) -> float | None:
+    """Перцентиль по ближайшему рангу"""
+    if not sorted_values:
+        return None
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return round(sorted_values[rank - 1] * 1000, 2)
+
+
+# Сценарий -> относительная частота
+SCENARIOS = {
+    "login": 1,
+    "users_me": 4,
+    "appointments_list": 4,
+    "applications_list": 3,
+    "application_detail": 3,
+    "therapists_list": 5,
+}
+
+
+def _request(name: str, actor: Actor, rng: random.Random) -> tuple[str, str, dict]:
+    from psychohelp.seeding.generator import SEED_PASSWORD
+
+    if name == "login":
+        return "POST", "/users/login", {"json": {"email": actor.email, "password": SEED_PASSWORD}}
+    if name == "users_me":
+        return "GET", "/users/user", {}
+    if name == "appointments_list":
+        return "GET", "/appointments/", {"params": {"take": 20}}
+    if name == "applications_list":
+        return "GET", "/applications/", {"params": {"limit": 20}}
+    if name == "application_detail":
+        return "GET", f"/applications/{rng.choice(actor.application_ids)}", {}
+    if name == "therapists_list":
+        return "GET", "/therapists/", {"params": {"take": 20}}
+    raise ValueError(name)
+
+
+def git_revision() -> dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+async def seed_if_empty(args) -> None:
+    from psychohelp.seeding.cli import seed, size_from_args
+
+    started = time.perf_counter()
+    loaded = await seed(size_from_args(args), args.random_seed)
+    if loaded is None:
+        print("Набор данных уже загружен, пропускаем --seed", file=sys.stderr)
+    else:
+        print(f"Загружено {loaded} за {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+async def load_actors(args) -> list[Actor]:
+    """Пациенты с заявками и психологи, от имени которых идут запросы"""
+    from sqlalchemy import select
+
+    from psychohelp.config.config import get_async_db
+    from psychohelp.models.applications import Application
+    from psychohelp.models.psychologists import Psychologist
+    from psychohelp.models.users import User
+
+    psychologists_count = max(args.concurrency // 10, 1)
+    async with get_async_db() as session:
+        patients = (await session.execute(
+            select(User.email, Application.id)
+            .join(Application, Application.user_id == User.id)
+            .where(User.email.like("%@seed.example.com"))
+            .order_by(Application.id)
+            .limit((args.concurrency - psychologists_count) * 3)
+        )).all()
+        psychologists = (await session.execute(
+            select(User.email)
+            .join(Psychologist, Psychologist.user_id == User.id)
+            .where(User.email.like("%@seed.example.com"))
+            .order_by(User.email)
+            .limit(psychologists_count)
+        )).scalars().all()
+        any_applications = (await session.execute(
+            select(Application.id).order_by(Application.id).limit(100)
+        )).scalars().all()
+
+    by_email: dict[str, Actor] = {}
+    for email, application_id in patients:
+        actor = by_email.setdefault(email, Actor(email, f"10.1.0.{len(by_email) + 1}", False))
+        actor.application_ids.append(application_id)
+    actors = list(by_email.values())
+    actors += [
+        Actor(email, f"10.2.0.{index + 1}", True, list(any_applications))
+        for index, email in enumerate(psychologists)
+    ]
+    if not actors or not any_applications:
+        raise SystemExit("В базе нет синтетических данных, запустите с --seed")
+    return actors
+
+
+async def worker(app, actor: Actor, deadline: float, warmup_until: float, rng: random.Random, stats: dict) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from psychohelp.services.query_log import track_queries
+
+    names = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+    transport = ASGITransport(app=app, client=(actor.address, 40000))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        method, url, kwargs = _request("login", actor, rng)
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, url, kwargs = _request(name, actor, rng)
+            with track_queries() as log:
+                started = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                elapsed = time.perf_counter() - started
+            if started >= warmup_until:
+                stats[name].record(elapsed, log.count, response.status_code)
+
+
+async def run(args) -> dict:
+    from psychohelp.config.config import async_engine, config
+
+    # До импорта приложения: кэш подключается в get_application()
+    if args.no_http_cache:
+        config.HTTP_CACHE_ENABLED = False
+    from psychohelp.main import app
+    from psychohelp.routes.controllers.users import limiter
+
+    # Лимит попыток входа рассчитан на одного человека, а не на нагрузочный прогон
+    limiter.enabled = False
+
+    if args.seed:
+        await seed_if_empty(args)
+    actors = await load_actors(args)
+
+    stats = {name: ScenarioStats() for name in SCENARIOS}
+    rng = random.Random(args.random_seed)
+    started = time.perf_counter()
+    warmup_until = started + args.warmup
+    deadline = warmup_until + args.duration
+    await asyncio.gather(*(
+        worker(app, actors[index % len(actors)], deadline, warmup_until, random.Random(rng.random()), stats)
+        for index in range(args.concurrency)
+    ))
+    measured = time.perf_counter() - warmup_until
+    await async_engine.dispose()
+
+    scenarios = {name: scenario.summary(measured) for name, scenario in stats.items()}
+    total = ScenarioStats()
+    for scenario in stats.values():
+        total.latencies += scenario.latencies
+        total.queries += scenario.queries
+        for status, count in scenario.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "settings": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "random_seed": args.random_seed,
+            "http_cache": config.HTTP_CACHE_ENABLED,
+        },
+        "scenarios": scenarios,
+        "total": total.summary(measured),
+    }
+
+
+def compare(baseline: dict, current: dict) -> str:
+    def change(old, new) -> str:
+        if not old or new is None:
+            return "n/a"
+        return f"{old} -> {new} ({(new - old) / old * 100:+.1f}%)"
+
+    lines = []
+    for name, new in [*current["scenarios"].items(), ("total", current["total"])]:
+        old = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        lines.append(
+            f"{name:<20} rps {change(old['rps'], new['rps'])}; "
+            f"p95 {change(old['latency_ms']['p95'], new['latency_ms']['p95'])} мс; "
+            f"SQL/запрос {change(old['queries_per_request'], new['queries_per_request'])}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    from psychohelp.seeding.cli import add_size_arguments
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32, help="одновременных клиентов")
+    parser.add_argument("--duration", type=float, default=30, help="секунд измерения")
+    parser.add_argument("--warmup", type=float, default=5, help="секунд прогрева (не учитываются)")
+    parser.add_argument("--random-seed", type=int, default=1, help="seed набора данных и выбора сценариев")
+    parser.add_argument("--seed", action="store_true", help="загрузить набор данных, если база пуста")
+    add_size_arguments(parser)
+    parser.add_argument("--no-http-cache", action="store_true", help="выключить кэш HTTP-ответов")
+    parser.add_argument("--output", type=Path, help="куда записать JSON (по умолчанию stdout)")
+    parser.add_argument("--compare", type=Path, help="JSON прошлого прогона для сравнения")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    # До импорта приложения: уровень логов читается при импорте
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text(encoding="utf-8")), result), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
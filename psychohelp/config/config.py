@@ -1,9 +1,15 @@
+import inspect
 import os
+import time
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable
 
 load_dotenv()
 
@@ -20,10 +26,92 @@ class Config:
         f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
 
+    # Пул соединений общий для приложения и репозиториев
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
     SECRET_KEY = os.getenv("SECRET_KEY", "secret-key")
     ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE = int(os.getenv("REFRESH_TOKEN_EXPIRE", "43200"))
+    # Класть коды ролей в access-токен (проверки ролей без запроса к БД)
+    ACCESS_TOKEN_EMBED_ROLES = os.getenv("ACCESS_TOKEN_EMBED_ROLES", "true").lower() == "true"
+
+    # bcrypt выполняется в отдельном пуле потоков
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "100"))
+
+    # Кэширование ответов публичных GET-эндпоинтов
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    HTTP_CACHE_TTL_SECONDS = float(os.getenv("HTTP_CACHE_TTL_SECONDS", "60"))
+    HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "1000"))
+    HTTP_CACHE_MAX_BODY_BYTES = int(os.getenv("HTTP_CACHE_MAX_BODY_BYTES", str(1024 * 1024)))
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+    HTTP_CACHE_IMAGES_MAX_AGE = int(os.getenv("HTTP_CACHE_IMAGES_MAX_AGE", "86400"))
+
+    # Отправка писем из email_outbox фоновым диспетчером
+    EMAIL_OUTBOX_DISPATCHER_ENABLED = os.getenv("EMAIL_OUTBOX_DISPATCHER_ENABLED", "true").lower() == "true"
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", "2"))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+    EMAIL_OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE_SECONDS", "10"))
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+    EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "60"))
+    EMAIL_OUTBOX_RETENTION_DAYS = float(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "30"))
+    EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS = float(os.getenv("EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS", "3600"))
+
+    # Напоминания о встречах: окно загрузки в память и период перезагрузки
+    REMINDERS_ENABLED = os.getenv("REMINDERS_ENABLED", "true").lower() == "true"
+    REMINDER_HORIZON_SECONDS = float(os.getenv("REMINDER_HORIZON_SECONDS", "3600"))
+    REMINDER_RELOAD_SECONDS = float(os.getenv("REMINDER_RELOAD_SECONDS", "300"))
+    REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "100"))
+    REMINDER_MAX_LOADED = int(os.getenv("REMINDER_MAX_LOADED", "10000"))
+
+    # Автоматическое истечение заявок: срок без изменений по статусам, в часах
+    APPLICATION_EXPIRY_ENABLED = os.getenv("APPLICATION_EXPIRY_ENABLED", "true").lower() == "true"
+    # По умолчанию только считает заявки; отключать после проверки счетчиков в логах
+    APPLICATION_EXPIRY_DRY_RUN = os.getenv("APPLICATION_EXPIRY_DRY_RUN", "true").lower() == "true"
+    APPLICATION_EXPIRY_INTERVAL_SECONDS = float(os.getenv("APPLICATION_EXPIRY_INTERVAL_SECONDS", "600"))
+    APPLICATION_EXPIRY_BATCH_SIZE = int(os.getenv("APPLICATION_EXPIRY_BATCH_SIZE", "500"))
+    APPLICATION_EXPIRY_NEW_HOURS = float(os.getenv("APPLICATION_EXPIRY_NEW_HOURS", "168"))
+    APPLICATION_EXPIRY_IN_PROGRESS_HOURS = float(os.getenv("APPLICATION_EXPIRY_IN_PROGRESS_HOURS", "336"))
+    APPLICATION_EXPIRY_AWAITING_CONFIRMATION_HOURS = float(
+        os.getenv("APPLICATION_EXPIRY_AWAITING_CONFIRMATION_HOURS", "72")
+    )
+
+    # Журнал аудита заявок: transactional - строка в транзакции перехода,
+    # buffered - после commit в буфер, который пишется пачками раз в N мс
+    AUDIT_WRITE_MODE = os.getenv("AUDIT_WRITE_MODE", "transactional").lower()
+    AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_BUFFER_MAX = int(os.getenv("AUDIT_BUFFER_MAX", "10000"))
+
+    # Расписание психологов: рабочие часы задаются в этом часовом поясе
+    SCHEDULE_TIMEZONE = os.getenv("SCHEDULE_TIMEZONE", "Europe/Moscow")
+    APPOINTMENT_DURATION_MINUTES = int(os.getenv("APPOINTMENT_DURATION_MINUTES", "60"))
+    SLOTS_MAX_RANGE_DAYS = int(os.getenv("SLOTS_MAX_RANGE_DAYS", "62"))
+
+    # Статистика для менеджеров: материализованные представления пересчитываются
+    # раз в интервал, если менялись заявки или встречи, и не реже чем раз в max age
+    STATISTICS_REFRESH_ENABLED = os.getenv("STATISTICS_REFRESH_ENABLED", "true").lower() == "true"
+    STATISTICS_REFRESH_INTERVAL_SECONDS = float(os.getenv("STATISTICS_REFRESH_INTERVAL_SECONDS", "60"))
+    STATISTICS_MAX_AGE_SECONDS = float(os.getenv("STATISTICS_MAX_AGE_SECONDS", "3600"))
+
+    # Метрики Prometheus на /metrics (закрывать от внешнего доступа на прокси)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Разработка/CI: счетчик SQL-запросов на HTTP-запрос и поиск N+1
+    DB_QUERY_DEBUG = os.getenv("DB_QUERY_DEBUG", "false").lower() == "true"
+    DB_QUERY_REPEAT_THRESHOLD = int(os.getenv("DB_QUERY_REPEAT_THRESHOLD", "3"))
+    DB_QUERY_MAX_PER_REQUEST = int(os.getenv("DB_QUERY_MAX_PER_REQUEST", "0"))
+
+    RBAC_USER_CACHE_TTL_SECONDS = float(os.getenv("RBAC_USER_CACHE_TTL_SECONDS", "60"))
+    RBAC_USER_CACHE_MAX_ENTRIES = int(os.getenv("RBAC_USER_CACHE_MAX_ENTRIES", "10000"))
 
     APP_PORT = int(os.getenv("APP_PORT", "8000"))
     APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
@@ -33,6 +121,11 @@ class Config:
 
     MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME", "Психологическая поддержка Мосполитеха")
     MAIL_REQUEST_TIMEOUT_SECONDS = float(os.getenv("MAIL_REQUEST_TIMEOUT_SECONDS", "10"))
+    # http - почтовый сервис, stub - письма только запоминаются в памяти
+    MAIL_PROVIDER = os.getenv("MAIL_PROVIDER", "http")
+    MAIL_MAX_IN_FLIGHT = int(os.getenv("MAIL_MAX_IN_FLIGHT", "10"))
+    MAIL_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("MAIL_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    MAIL_CIRCUIT_RESET_SECONDS = float(os.getenv("MAIL_CIRCUIT_RESET_SECONDS", "30"))
 
     MAIL_SERVICE_URL = os.getenv("MAIL_SERVICE_URL", "https://mail.liquve.space")
     MAIL_SERVICE_FROM_USER = os.getenv("MAIL_SERVICE_FROM_USER", "root")
@@ -47,21 +140,155 @@ class Config:
 
 config = Config()
 
+
+class PoolMetrics:
+    """Счетчики пула соединений: выдачи, возвраты и время ожидания соединения."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        @event.listens_for(sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts += 1
+
+        @event.listens_for(sync_engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            self.checkins += 1
+
+        @event.listens_for(sync_engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+
+    def snapshot(self, engine: AsyncEngine) -> dict:
+        pool = engine.sync_engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checked_in": pool.checkedin(),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_count": self.wait_count,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который замеряет время ожидания свободного соединения."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.observe_wait(time.perf_counter() - started)
+
+
+def build_async_engine(cfg: Config = config) -> AsyncEngine:
+    """Создать async engine с настройками пула из конфигурации."""
+    engine = create_async_engine(
+        cfg.DATABASE_URL,
+        echo=cfg.DB_ECHO,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=cfg.DB_POOL_SIZE,
+        max_overflow=cfg.DB_MAX_OVERFLOW,
+        pool_timeout=cfg.DB_POOL_TIMEOUT,
+        pool_pre_ping=cfg.DB_POOL_PRE_PING,
+        pool_recycle=cfg.DB_POOL_RECYCLE,
+    )
+    return engine
+
+
+# Сессия текущей единицы работы (HTTP-запроса, фоновой задачи и т.п.)
+_current_session: ContextVar[AsyncSession | None] = ContextVar(
+    "current_session", default=None
+)
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
 @asynccontextmanager
 async def get_async_db():
-    from sqlalchemy import exc
+    """
+    Единица работы над БД.
+
+    Вложенные вызовы переиспользуют сессию внешнего вызова (например, сессию
+    HTTP-запроса из dependencies.database.get_db_session), поэтому все
+    репозитории внутри запроса работают в одной транзакции. Commit выполняет
+    только владелец сессии при успешном выходе, при ошибке - rollback.
+    """
+    current = _current_session.get()
+    if current is not None:
+        yield current
+        return
 
     session: AsyncSession = async_session()
+    token = _current_session.set(session)
     try:
         yield session
-    except exc.SQLAlchemyError:
+        if session.in_transaction():
+            await session.commit()
+    except BaseException:
+        session.info.pop(_AFTER_COMMIT_KEY, None)
         await session.rollback()
         raise
     finally:
+        _current_session.reset(token)
         await session.close()
 
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        result = callback()
+        if inspect.isawaitable(result):
+            await result
+
+
+async def call_after_commit(callback: Callable[[], Awaitable[None] | None]) -> None:
+    """
+    Вызвать callback после commit текущей единицы работы, а при rollback не вызывать.
+
+    Для сброса кэшей: если сбросить до commit, параллельный запрос успеет
+    закэшировать еще старые данные. Вне транзакции callback вызывается сразу.
+    """
+    session = _current_session.get()
+    if session is not None and session.in_transaction():
+        session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+        return
+    result = callback()
+    if inspect.isawaitable(result):
+        await result
+
 
-async_engine = create_async_engine(config.DATABASE_URL, future=True, echo=True)
+async_engine = build_async_engine(config)
+pool_metrics.attach(async_engine)
 async_session = sessionmaker(
     bind=async_engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -1,18 +1,121 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
 
+# Идентификатор текущего HTTP-запроса, выставляется RequestIdMiddleware
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Атрибуты LogRecord, которые не считаются extra-полями
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+_listener: QueueListener | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает долю записей ниже WARNING для логгеров с заданной частотой.
+
+    rates: префикс имени логгера -> доля от 0 до 1, берется самый длинный
+    подходящий префикс. Предупреждения и ошибки не сэмплируются.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись, extra-поля попадают в объект как есть"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        data.update(
+            (key, value) for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith("_")
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Аргументы подставляются здесь, а traceback форматируется заранее:
+        # форматтер в потоке слушателя не должен видеть изменяемые объекты
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_sample_rates(value: str | None) -> dict[str, float]:
+    """'psychohelp.routes.controllers.therapists=0.1,other=0.5' -> словарь"""
+    rates: dict[str, float] = {}
+    for item in (value or "").split(","):
+        name, sep, rate = item.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
 def setup_logging(
     level: str = "DEBUG",
     log_file: Optional[Path] = None,
     format_string: Optional[str] = None,
+    json_format: bool = False,
+    sample_rates: Optional[dict[str, float]] = None,
 ) -> None:
+    """
+    Логи пишутся в очередь, в stdout/файл их выводит отдельный поток
+    QueueListener, поэтому event loop не ждет ввода-вывода.
+    """
+    global _listener
+
     if format_string is None:
         format_string = (
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s"
         )
+    formatter = JsonFormatter() if json_format else logging.Formatter(format_string)
 
     handlers: list[logging.Handler] = [
         logging.StreamHandler(sys.stdout)
@@ -23,11 +126,21 @@ def setup_logging(
         handlers.append(
             logging.FileHandler(log_file, encoding="utf-8")
         )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    shutdown_logging()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     logging.basicConfig(
         level=getattr(logging, level.upper()),
-        format=format_string,
-        handlers=handlers,
+        handlers=[queue_handler],
         force=True,
     )
 
@@ -35,6 +148,16 @@ def setup_logging(
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Дописать очередь и остановить поток вывода"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
-
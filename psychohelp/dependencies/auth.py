@@ -2,18 +2,50 @@ from fastapi import Request, HTTPException, Depends
 from starlette.status import HTTP_401_UNAUTHORIZED
 from psychohelp.services.users.users import get_user_by_token
 from psychohelp.models.users import User
+from psychohelp.repositories import decode_access_token
+from psychohelp.services.rbac.cache import permission_cache
+from psychohelp.services.users.models import CurrentPrincipal, RequestIdentity
 
+from uuid import UUID
+
+import jwt
+
+
+def _stored_identity(request: Request) -> RequestIdentity | None:
+    state = getattr(request, "state", None)
+    return getattr(state, "identity", None)
+
+
+def _store_identity(request: Request, identity: RequestIdentity) -> RequestIdentity:
+    state = getattr(request, "state", None)
+    if state is not None:
+        state.identity = identity
+    return identity
+
+
+async def _load_user(request: Request) -> User | None:
+    identity = _stored_identity(request)
+    if identity is not None and identity.user is not None:
+        return identity.user
 
-async def get_current_user(request: Request) -> User:
-    """Dependency для получения текущего пользователя из токена"""
     token = request.cookies.get("access_token")
     if not token:
-        raise HTTPException(
-            status_code=HTTP_401_UNAUTHORIZED, 
-            detail="Пользователь не авторизован"
-        )
-    
+        return None
+
     user = await get_user_by_token(token)
+    if user is None:
+        return None
+
+    if identity is None:
+        identity = RequestIdentity(principal=CurrentPrincipal.from_user(user))
+    identity.user = user
+    _store_identity(request, identity)
+    return user
+
+
+async def get_current_user(request: Request) -> User:
+    """Dependency для получения текущего пользователя из токена"""
+    user = await _load_user(request)
     if user is None:
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED, 
@@ -25,8 +57,50 @@ async def get_current_user(request: Request) -> User:
 
 async def get_optional_user(request: Request) -> User | None:
     """Dependency для опционального получения пользователя (если токен есть)"""
+    return await _load_user(request)
+
+
+async def principal_from_token(token: str) -> CurrentPrincipal | None:
+    """Собрать CurrentPrincipal из access-токена, None - если токен недействителен"""
+    try:
+        payload = decode_access_token(token)
+        user_id = UUID(payload["sub"])
+    except (jwt.InvalidTokenError, KeyError, ValueError):
+        return None
+
+    roles = payload.get("roles")
+    if roles is None:
+        # Токен выпущен без ролей - берем их из кэша RBAC
+        role_codes = await permission_cache.get_user_role_codes(user_id)
+    else:
+        role_codes = frozenset(roles)
+    return CurrentPrincipal(user_id=user_id, role_codes=role_codes)
+
+
+async def get_request_identity(request: Request) -> RequestIdentity | None:
+    """Пользователь запроса из request.state; при первом обращении - из access-токена"""
+    identity = _stored_identity(request)
+    if identity is not None:
+        return identity
+
     token = request.cookies.get("access_token")
-    if not token:
+    principal = await principal_from_token(token) if token else None
+    if principal is None:
         return None
-    
-    return await get_user_by_token(token)
\ No newline at end of file
+    return _store_identity(request, RequestIdentity(principal=principal))
+
+
+async def get_current_principal(request: Request) -> CurrentPrincipal:
+    """Dependency: идентификатор и роли пользователя без загрузки его из БД"""
+    identity = await get_request_identity(request)
+    if identity is None:
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail="Пользователь не авторизован"
+        )
+    return identity.principal
+
+
+async def get_optional_principal(request: Request) -> CurrentPrincipal | None:
+    identity = await get_request_identity(request)
+    return identity.principal if identity is not None else None
@@ -0,0 +1,11 @@
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from psychohelp.config.config import get_async_db
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency: одна сессия и одна транзакция на весь HTTP-запрос"""
+    async with get_async_db() as session:
+        yield session
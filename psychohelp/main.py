@@ -1,18 +1,36 @@
 import os
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
 
 from psychohelp.config.config import (
     Base,
+    async_engine,
     config,
 )
-from psychohelp.config.logging import setup_logging, get_logger
+from psychohelp.config.logging import setup_logging, get_logger, parse_sample_rates
+from psychohelp.middleware.http_cache import HTTPCacheMiddleware
+from psychohelp.middleware.metrics import MetricsMiddleware
+from psychohelp.middleware.query_budget import (
+    DB_QUERIES_HEADER,
+    DB_REPEATED_QUERIES_HEADER,
+    QueryBudgetMiddleware,
+)
+from psychohelp.middleware.request_id import REQUEST_ID_HEADER, RequestIdMiddleware
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER
 from psychohelp.routes import api_router
+from psychohelp.services.users.passwords import PasswordHasherOverloaded, password_hasher
+from psychohelp.services.email import close_email_provider
+from psychohelp.services.email_outbox import email_outbox_dispatcher
+from psychohelp.services.appointments.reminders import reminder_scheduler
+from psychohelp.services.applications.expiry import application_expiry_job
+from psychohelp.services.statistics import statistics_refresher
+from psychohelp.services.audit import audit_writer
 
 from psychohelp.models import (
     users,
@@ -37,6 +55,8 @@ log_file_path = os.getenv("LOG_FILE")
 setup_logging(
     level=log_level,
     log_file=Path(log_file_path) if log_file_path else None,
+    json_format=os.getenv("LOG_FORMAT", "text").lower() == "json",
+    sample_rates=parse_sample_rates(os.getenv("LOG_SAMPLE_RATES")),
 )
 
 logger = get_logger(__name__)
@@ -50,7 +70,12 @@ async def reset_database(engine: AsyncEngine) -> None:
     logger.info("Database reset completed")
 
 
-engine = create_async_engine(config.DATABASE_URL, echo=False)
+async def password_hasher_overloaded_handler(request: Request, exc: PasswordHasherOverloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервис перегружен, повторите попытку позже"},
+        headers={"Retry-After": "1"},
+    )
 
 
 def get_application() -> FastAPI:
@@ -58,6 +83,18 @@ def get_application() -> FastAPI:
     application.include_router(api_router)
 
     application.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    application.add_exception_handler(PasswordHasherOverloaded, password_hasher_overloaded_handler)
+
+    if config.HTTP_CACHE_ENABLED:
+        application.add_middleware(
+            HTTPCacheMiddleware,
+            rules={
+                "/news": config.HTTP_CACHE_MAX_AGE,
+                "/articles": config.HTTP_CACHE_MAX_AGE,
+                "/therapists": config.HTTP_CACHE_MAX_AGE,
+                "/image": config.HTTP_CACHE_IMAGES_MAX_AGE,
+            },
+        )
 
     application.add_middleware(
         CORSMiddleware,
@@ -82,19 +119,44 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, REQUEST_ID_HEADER, DB_QUERIES_HEADER, DB_REPEATED_QUERIES_HEADER],
     )
+    if config.DB_QUERY_DEBUG:
+        application.add_middleware(QueryBudgetMiddleware)
+    if config.METRICS_ENABLED:
+        application.add_middleware(MetricsMiddleware)
+    # Снаружи остальных, чтобы идентификатор был и в логах, и в кэшированных ответах
+    application.add_middleware(RequestIdMiddleware)
 
     @application.on_event("startup")
     async def on_startup() -> None:
         logger.info("Starting application")
 
         if config.RESET_DB_ON_START:
-            await reset_database(engine)
+            await reset_database(async_engine)
+        if config.EMAIL_OUTBOX_DISPATCHER_ENABLED:
+            email_outbox_dispatcher.start()
+        if config.REMINDERS_ENABLED:
+            reminder_scheduler.start()
+        if config.APPLICATION_EXPIRY_ENABLED:
+            application_expiry_job.start()
+        if config.AUDIT_WRITE_MODE == "buffered":
+            audit_writer.start()
+        if config.STATISTICS_REFRESH_ENABLED:
+            statistics_refresher.start()
         logger.info("Application started successfully")
 
     @application.on_event("shutdown")
     async def on_shutdown() -> None:
         logger.info("Shutting down application")
+        await statistics_refresher.stop()
+        await application_expiry_job.stop()
+        await reminder_scheduler.stop()
+        await email_outbox_dispatcher.stop()
+        await audit_writer.stop()
+        await close_email_provider()
+        await async_engine.dispose()
+        password_hasher.shutdown()
 
     return application
 
@@ -0,0 +1,165 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from psychohelp.config.config import config
+from psychohelp.services.cache import CacheBackend, CachedResponse, get_response_cache
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Сравнение слабое: W/"x" и "x" считаются одним тегом
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def _not_modified(request_headers: Headers, cached: CachedResponse) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, cached.etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(cached.last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+class HTTPCacheMiddleware:
+    """
+    Кэширует успешные GET-ответы публичных эндпоинтов.
+
+    rules: префикс пути -> max-age для Cache-Control. Ответы хранятся в
+    CacheBackend с TTL, к ним добавляются ETag и Last-Modified, на
+    If-None-Match / If-Modified-Since отвечаем 304 без тела.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: dict[str, int],
+        backend: Callable[[], CacheBackend] = get_response_cache,
+        ttl_seconds: float = config.HTTP_CACHE_TTL_SECONDS,
+        max_body_bytes: int = config.HTTP_CACHE_MAX_BODY_BYTES,
+    ) -> None:
+        self.app = app
+        self.rules = rules
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_body_bytes = max_body_bytes
+
+    def _max_age(self, path: str) -> int | None:
+        for prefix, max_age in self.rules.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return max_age
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        max_age = self._max_age(scope["path"])
+        if max_age is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        key = f"{scope['path']}?{query}"
+        backend = self.backend()
+
+        cached = await backend.get(key)
+        cache_status = "HIT"
+        if cached is None:
+            cached = await self._fetch(scope, receive, send)
+            if cached is None:
+                # Ответ не кэшируется и уже отправлен клиенту
+                return
+            await backend.set(key, cached, self.ttl_seconds)
+            cache_status = "MISS"
+
+        await self._send_cached(cached, Headers(scope=scope), send, max_age, cache_status)
+
+    async def _fetch(self, scope: Scope, receive: Receive, send: Send) -> CachedResponse | None:
+        start: Message | None = None
+        chunks: list[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, size, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # Например, http.response.pathsend - такой ответ не кэшируем
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            chunks.append(body)
+            size += len(body)
+            if start["status"] != 200 or size > self.max_body_bytes:
+                # Ошибки и большие ответы отдаем как есть
+                passthrough = True
+                await send(start)
+                await send({
+                    "type": "http.response.body",
+                    "body": b"".join(chunks),
+                    "more_body": message.get("more_body", False),
+                })
+                chunks.clear()
+
+        await self.app(scope, receive, capture)
+        if passthrough or start is None:
+            return None
+
+        body = b"".join(chunks)
+        headers = Headers(raw=start["headers"])
+        return CachedResponse(
+            status=start["status"],
+            headers=[
+                (name, value) for name, value in start["headers"]
+                if name.lower() not in (b"etag", b"last-modified", b"cache-control")
+            ],
+            body=body,
+            etag=headers.get("etag") or f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            last_modified=headers.get("last-modified") or formatdate(usegmt=True),
+        )
+
+    async def _send_cached(
+        self,
+        cached: CachedResponse,
+        request_headers: Headers,
+        send: Send,
+        max_age: int,
+        cache_status: str,
+    ) -> None:
+        not_modified = _not_modified(request_headers, cached)
+
+        headers = MutableHeaders(raw=[] if not_modified else list(cached.headers))
+        headers["ETag"] = cached.etag
+        headers["Last-Modified"] = cached.last_modified
+        headers["Cache-Control"] = f"public, max-age={max_age}"
+        headers["X-Cache"] = cache_status
+
+        await send({
+            "type": "http.response.start",
+            "status": 304 if not_modified else cached.status,
+            "headers": headers.raw,
+        })
+        await send({
+            "type": "http.response.body",
+            "body": b"" if not_modified else cached.body,
+        })
@@ -0,0 +1,61 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from psychohelp.services.metrics import (
+    RequestDbStats,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+    request_db_stats,
+)
+
+
+# Запросы мимо маршрутов (404, сканеры) складываем в одну метку
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Время ответа, коды ответов и число SQL-запросов по шаблону маршрута.
+
+    Шаблон (/applications/{application_id}) берется из scope["route"],
+    который FastAPI заполняет при маршрутизации, поэтому число меток
+    не растет с числом идентификаторов.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestDbStats()
+        token = request_db_stats.set(stats)
+        http_requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec(method=method)
+            request_db_stats.reset(token)
+
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            http_requests_total.inc(method=method, route=route, status=str(status))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_request_db_queries.observe(stats.queries, method=method, route=route)
+            http_request_db_seconds.observe(stats.seconds, method=method, route=route)
@@ -0,0 +1,57 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from psychohelp.config.config import config
+from psychohelp.config.logging import get_logger
+from psychohelp.services.query_log import track_queries
+
+
+logger = get_logger(__name__)
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_REPEATED_QUERIES_HEADER = "X-DB-Repeated-Queries"
+
+
+class QueryBudgetMiddleware:
+    """
+    Режим разработки/CI: считает SQL-запросы каждого HTTP-запроса.
+
+    Число запросов отдается в X-DB-Queries, лишние выполнения повторяющихся
+    запросов (похоже на N+1) - в X-DB-Repeated-Queries и в предупреждении
+    в лог, как и превышение max_queries. Запросы после начала ответа
+    (потоковые ответы) в заголовки не попадают.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        repeat_threshold: int = config.DB_QUERY_REPEAT_THRESHOLD,
+        max_queries: int = config.DB_QUERY_MAX_PER_REQUEST,
+    ) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.max_queries = max_queries
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as log:
+            async def send_with_counts(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    repeated = log.repeated(self.repeat_threshold)
+                    headers = MutableHeaders(scope=message)
+                    headers[DB_QUERIES_HEADER] = str(log.count)
+                    headers[DB_REPEATED_QUERIES_HEADER] = str(sum(repeated.values()) - len(repeated))
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
+
+        request = f"{scope['method']} {scope['path']}"
+        for statement, count in log.repeated(self.repeat_threshold).items():
+            logger.warning("Possible N+1 in %s: statement executed %s times: %s", request, count, statement)
+        if self.max_queries and log.count > self.max_queries:
+            logger.warning(
+                "Query budget exceeded in %s: %s > %s\n%s", request, log.count, self.max_queries, log.report()
+            )
@@ -6,5 +6,7 @@ from psychohelp.models import appointments
 from psychohelp.models import reviews
 from psychohelp.models import articles
 from psychohelp.models import password_reset_tokens
+from psychohelp.models import working_hours
+from psychohelp.models import email_outbox
 from .applications import Application
 from .news import News
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 import uuid
@@ -8,6 +8,10 @@ from psychohelp.config.config import Base
 
 class ApplicationAuditLog(Base):
     __tablename__ = "application_audit_logs"
+    __table_args__ = (
+        # История заявки по времени без сортировки в памяти
+        Index("ix_application_audit_logs_application_id_timestamp", "application_id", "timestamp"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -16,4 +20,4 @@ class ApplicationAuditLog(Base):
     actor_type = Column(String(20), nullable=False)  # user, psychologist, manager, system
     actor_id = Column(UUID(as_uuid=True), nullable=True)
     timestamp = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    comment = Column(Text, nullable=True)
\ No newline at end of file
+    comment = Column(Text, nullable=True)
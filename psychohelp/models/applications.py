@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime, timezone
 import uuid
 import enum
@@ -37,25 +38,69 @@ class MeetingType(str, enum.Enum):
     ONLINE = "online"
 
 
+class ApplicationSortField(str, enum.Enum):
+    """
+    Поля, по которым разрешена сортировка списка. Под каждое есть индекс
+    (поле, id), а вместе с одним из фильтров status, assigned_to, user_id -
+    индекс (фильтр, поле, id). При нескольких фильтрах сразу используется
+    индекс одного из них.
+    """
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    SCHEDULED_AT = "scheduled_at"
+    STATUS = "status"
+
+
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Навигация по курсору: (колонка сортировки, id). Отдельные индексы по
+        # user_id, status и assigned_to не нужны: их покрывают составные ниже
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_updated_at_id", "updated_at", "id"),
+        Index("ix_applications_status_id", "status", "id"),
+        Index("ix_applications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_applications_scheduled_at_id", "scheduled_at", "id"),
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_applications_status_updated_at_id", "status", "updated_at", "id"),
+        Index("ix_applications_status_scheduled_at_id", "status", "scheduled_at", "id"),
+        Index("ix_applications_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_applications_assigned_to_updated_at_id", "assigned_to", "updated_at", "id"),
+        Index("ix_applications_assigned_to_scheduled_at_id", "assigned_to", "scheduled_at", "id"),
+        Index("ix_applications_assigned_to_status_id", "assigned_to", "status", "id"),
+        Index("ix_applications_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_applications_user_id_scheduled_at_id", "user_id", "scheduled_at", "id"),
+        Index("ix_applications_user_id_status_id", "user_id", "status", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     problem_description = Column(Text, nullable=False)
     preferred_campus = Column(String(128), nullable=True)
     university_status = Column(String(50), nullable=False)
 
-    status = Column(String(50), default=ApplicationStatus.NEW.value, nullable=False, index=True)
-    assigned_to = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    status = Column(String(50), default=ApplicationStatus.NEW.value, nullable=False)
+    assigned_to = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     psychologist_id = Column(UUID(as_uuid=True), ForeignKey("psychologists.id", ondelete="SET NULL"), nullable=True)
     meeting_type = Column(String(20), nullable=True)
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     location_address = Column(Text, nullable=True)
     meeting_url = Column(String(512), nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # NOT NULL: по ним листаются страницы курсором, строки с NULL выпали бы из выдачи
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
     processing_started_at = Column(DateTime(timezone=True), nullable=True)
     confirmation_requested_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
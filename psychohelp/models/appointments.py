@@ -1,9 +1,11 @@
-from psychohelp.config.config import Base
+from psychohelp.config.config import Base, config
 
-from sqlalchemy import Column, String, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, ForeignKey, Enum, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
+from datetime import timedelta
+
 import enum
 import uuid
 
@@ -19,8 +21,25 @@ class AppointmentStatus(enum.Enum):
     cancelled = "cancelled"
 
 
+def _default_end_time(context) -> object:
+    scheduled_time = context.get_current_parameters()["scheduled_time"]
+    return scheduled_time + timedelta(minutes=config.APPOINTMENT_DURATION_MINUTES)
+
+
 class Appointment(Base):
     __tablename__ = "appointments"
+    # Пересечение ожидающих встреч одного психолога запрещено exclusion-ограничением
+    # ex_appointments_psychologist_time (только в миграции, нужен btree_gist)
+    __table_args__ = (
+        Index("ix_appointments_patient_id_scheduled_time", "patient_id", "scheduled_time"),
+        Index("ix_appointments_psychologist_id_scheduled_time", "psychologist_id", "scheduled_time"),
+        # Только неотправленные напоминания ожидающих встреч
+        Index(
+            "ix_appointments_pending_reminders",
+            "remind_time",
+            postgresql_where=text("status = 'awaiting' AND reminder_sent_at IS NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
     patient_id = Column(
@@ -49,7 +68,14 @@ class Appointment(Base):
     cancel_reason = Column(String(512), nullable=True, comment="Причина отмены")
     conclusion = Column(String(2048), nullable=True, comment="Заключение психолога")
     scheduled_time = Column(DateTime(timezone=True), nullable=False, comment="Время назначенной встречи")
+    scheduled_end_time = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=_default_end_time,
+        comment="Время окончания встречи",
+    )
     remind_time = Column(DateTime(timezone=True), nullable=True, comment="Время напоминания")
+    reminder_sent_at = Column(DateTime(timezone=True), nullable=True, comment="Когда отправлено напоминание")
     last_change_time = Column(DateTime(timezone=True), nullable=False, comment="Время последнего изменения")
     venue = Column(String(128), nullable=False, comment="Место проведения встречи")
     comment = Column(String(512), nullable=True, comment="Комментарий к записи")
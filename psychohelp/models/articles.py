@@ -1,14 +1,50 @@
 import uuid
 
-from sqlalchemy import Column, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, Text, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred
 
 from psychohelp.config.config import Base
 
 
+# Заголовок весомее текста (вес A против B в ts_rank); то же выражение в миграции 2c5e7a9b1d46
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(text, '')), 'B')"
+)
+
+
+def search_vector_column():
+    """
+    GENERATED ALWAYS AS ... STORED: заполняет Postgres, ORM колонку не пишет
+    (ни в INSERT, ни в UPDATE) и по умолчанию не читает.
+    """
+    return deferred(Column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        Computed(SEARCH_VECTOR, persisted=True),
+        nullable=True,
+    ))
+
+
+@compiles(Computed, "sqlite")
+def _compile_computed_for_sqlite(element, compiler, **kw):
+    # В SQLite (тесты) нет to_tsvector: колонка остается обычной и пустой
+    if "to_tsvector" in str(element.sqltext):
+        return ""
+    return compiler.visit_computed_column(element, **kw)
+
+
 class Article(Base):
     __tablename__ = "articles"
+    # Иначе INSERT вернет search_vector через RETURNING, хотя он не нужен
+    __mapper_args__ = {"eager_defaults": False}
+    __table_args__ = (
+        Index("ix_articles_title_id", "title", "id"),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(255), nullable=False)
     text = Column(Text, nullable=False)
+    search_vector = search_vector_column()
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from psychohelp.config.config import Base
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class EmailOutbox(Base):
+    """Письмо к отправке; пишется в одной транзакции с породившими его данными"""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Диспетчер выбирает только ожидающие письма, отправленные в индекс не попадают
+        Index(
+            "ix_email_outbox_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    text = Column(Text, nullable=False)
+    html = Column(Text, nullable=False)
+    sender_alias = Column(String(255), nullable=True)
+    # Письмо со ссылкой восстановления пароля: после отправки текст стирается,
+    # при уходе в dead letter токен аннулируется
+    password_reset_token_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("password_reset_tokens.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    status = Column(String(16), default=EmailOutboxStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False, comment="Сколько раз письмо забирали на отправку")
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    last_error = Column(String(1024), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    sent_at = Column(DateTime(timezone=True), nullable=True)
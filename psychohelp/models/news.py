@@ -1,14 +1,21 @@
 import uuid
 
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
 from psychohelp.config.config import Base
+from psychohelp.models.articles import search_vector_column
 
 
 class News(Base):
     __tablename__ = "news"
+    # Иначе INSERT вернет search_vector через RETURNING, хотя он не нужен
+    __mapper_args__ = {"eager_defaults": False}
+    __table_args__ = (
+        Index("ix_news_created_at_id", "created_at", "id"),
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(255), nullable=False, comment="Заголовок новости")
@@ -20,4 +27,5 @@ class News(Base):
         server_default=func.now(),
         nullable=False,
         comment="Дата и время создания"
-    )
\ No newline at end of file
+    )
+    search_vector = search_vector_column()
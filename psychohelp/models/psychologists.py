@@ -1,14 +1,46 @@
 from psychohelp.config.config import Base
 
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 import uuid
 
 
+psychologists_consult_areas = Table(
+    "psychologists_consult_areas",
+    Base.metadata,
+    Column("psychologist_id", UUID(as_uuid=True), ForeignKey("psychologists.id", ondelete="CASCADE"), primary_key=True),
+    Column("consult_area_id", UUID(as_uuid=True), ForeignKey("consult_areas.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_psychologists_consult_areas_consult_area_id", "consult_area_id", "psychologist_id"),
+)
+
+
+class ConsultArea(Base):
+    """Направление консультирования; Psychologist.consult_areas разбит на такие теги"""
+
+    __tablename__ = "consult_areas"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(128), unique=True, nullable=False)
+
+    psychologists = relationship(
+        "Psychologist", secondary=psychologists_consult_areas, back_populates="consult_area_tags"
+    )
+
+
+def parse_consult_areas(consult_areas: str) -> list[str]:
+    """'Тревожность,  учеба и стресс' -> ['Тревожность', 'учеба и стресс'], без повторов"""
+    names = (" ".join(part.split()) for part in consult_areas.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
 class Psychologist(Base):
     __tablename__ = "psychologists"
+    __table_args__ = (
+        Index("ix_psychologists_office", "office"),
+        Index("ix_psychologists_qualification", "qualification"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(
@@ -29,4 +61,13 @@ class Psychologist(Base):
 
     user = relationship("User", back_populates="psychologist_info")
     appointments = relationship("Appointment", back_populates="psychologist")
-
+    working_hours = relationship(
+        "WorkingHours", back_populates="psychologist", cascade="all, delete-orphan"
+    )
+    # Строки связи удаляет ON DELETE CASCADE
+    consult_area_tags = relationship(
+        "ConsultArea",
+        secondary=psychologists_consult_areas,
+        back_populates="psychologists",
+        passive_deletes=True,
+    )
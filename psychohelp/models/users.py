@@ -1,8 +1,9 @@
 from psychohelp.config.config import Base
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
 
 import uuid
 
@@ -25,3 +26,32 @@ class User(Base):
         "Appointment", foreign_keys="[Appointment.patient_id]", back_populates="patient"
     )
     psychologist_info = relationship("Psychologist", back_populates="user", uselist=False)
+
+
+# "Имя Отчество Фамилия" для поиска по ILIKE. Запрос должен использовать это же
+# выражение (литералы, а не параметры), иначе триграммный индекс не подойдет.
+USER_FULL_NAME = (
+    User.first_name
+    + literal_column("' '")
+    + func.coalesce(User.middle_name, literal_column("''"))
+    + literal_column("' '")
+    + User.last_name
+)
+
+# "Фамилия Имя" для сортировки списков по имени
+USER_SORT_NAME = (User.last_name + literal_column("' '") + User.first_name).label("sort_name")
+
+
+def user_sort_name(user: User) -> str:
+    """Значение USER_SORT_NAME для уже загруженного пользователя (курсор страницы)"""
+    return f"{user.last_name} {user.first_name}"
+
+
+Index(
+    "ix_users_full_name_trgm",
+    USER_FULL_NAME.label("full_name"),
+    postgresql_using="gin",
+    postgresql_ops={"full_name": "gin_trgm_ops"},
+)
+# Порядок каталога психологов (PSYCHOLOGISTS_KEYSET)
+Index("ix_users_sort_name_id", USER_SORT_NAME, User.id)
@@ -0,0 +1,32 @@
+from psychohelp.config.config import Base
+
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer, SmallInteger, Time
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+
+import uuid
+
+
+class WorkingHours(Base):
+    """Шаблон рабочих часов психолога на день недели (время в SCHEDULE_TIMEZONE)"""
+
+    __tablename__ = "psychologist_working_hours"
+    __table_args__ = (
+        CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_working_hours_weekday"),
+        CheckConstraint("start_time < end_time", name="ck_working_hours_time_range"),
+        CheckConstraint("slot_minutes > 0", name="ck_working_hours_slot_minutes"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    psychologist_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("psychologists.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    weekday = Column(SmallInteger, nullable=False, comment="День недели, 0 - понедельник")
+    start_time = Column(Time, nullable=False, comment="Начало рабочего времени")
+    end_time = Column(Time, nullable=False, comment="Конец рабочего времени")
+    slot_minutes = Column(Integer, nullable=False, comment="Длительность одного слота")
+
+    psychologist = relationship("Psychologist", back_populates="working_hours")
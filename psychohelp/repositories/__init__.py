@@ -1,5 +1,6 @@
 from psychohelp.config.config import config
 from datetime import datetime, timedelta, timezone
+from typing import Iterable
 
 from uuid import UUID
 
@@ -7,11 +8,18 @@ import bcrypt
 import jwt
 
 
-def create_access_token(sub: str) -> str:
+def create_access_token(sub: str, roles: Iterable[str] | None = None) -> str:
+    """
+    Access-токен. Если переданы коды ролей, они кладутся в claim "roles",
+    и проверки ролей/прав обходятся без загрузки пользователя из БД.
+    """
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {"sub": str(sub), "exp": expire, "iat": now}
+    if roles is not None:
+        payload["roles"] = sorted(set(roles))
     encoded = jwt.encode(
-        {"sub": str(sub), "exp": expire, "iat": now},
+        payload,
         config.SECRET_KEY,
         algorithm=config.ALGORITHM,
     )
@@ -37,14 +45,17 @@ def refresh_access_token(refresh_token: str) -> str:
     sub = decoded["sub"]
     return create_access_token(sub)
 
-def get_user_id_from_token(token: str) -> UUID:
-    decoded = jwt.decode(
+def decode_access_token(token: str) -> dict:
+    return jwt.decode(
         token,
         config.SECRET_KEY,
         algorithms=[config.ALGORITHM],
         options={"verify_iat": True, "verify_exp": True, "verify_signature": True},
     )
 
+
+def get_user_id_from_token(token: str) -> UUID:
+    decoded = decode_access_token(token)
     return UUID(decoded["sub"])
 
 
@@ -62,5 +73,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(
         password.encode("utf-8"),
-        bcrypt.gensalt(rounds=12),
+        bcrypt.gensalt(rounds=config.PASSWORD_HASH_ROUNDS),
     ).decode("utf-8")
+
+
+def password_hash_rounds(hashed_password: str) -> int | None:
+    """Стоимость bcrypt-хеша ($2b$12$... -> 12)"""
+    parts = (hashed_password or "").strip().split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
@@ -1,17 +1,44 @@
+from datetime import datetime
 from uuid import UUID
-from sqlalchemy import select, update, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased, selectinload
 from psychohelp.config.config import get_async_db
-from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.application_audit_log import ApplicationAuditLog
+from psychohelp.models.applications import Application, ApplicationSortField, ApplicationStatus
 from psychohelp.models.psychologists import Psychologist
 from psychohelp.models.appointments import Appointment
+from psychohelp.models.users import User
+from psychohelp.repositories.pagination import InvalidCursorError, Keyset
+
+
+SORT_COLUMNS = {
+    ApplicationSortField.CREATED_AT: Application.created_at,
+    ApplicationSortField.UPDATED_AT: Application.updated_at,
+    ApplicationSortField.SCHEDULED_AT: Application.scheduled_at,
+    ApplicationSortField.STATUS: Application.status,
+}
+
+# scheduled_at бывает NULL, по нему листаем только смещением
+KEYSET_SORT_FIELDS = frozenset({
+    ApplicationSortField.CREATED_AT,
+    ApplicationSortField.UPDATED_AT,
+    ApplicationSortField.STATUS,
+})
+
+
+def applications_keyset(sort_by: str, sort_desc: bool) -> Keyset:
+    column = SORT_COLUMNS.get(sort_by)
+    if column is None:
+        raise ValueError(f"Сортировка по полю '{sort_by}' не поддерживается")
+    return Keyset(column, Application.id, descending=sort_desc)
 
 
 async def create_application(application_data: dict) -> Application:
     async with get_async_db() as session:
         application = Application(**application_data)
         session.add(application)
-        await session.commit()
+        await session.flush()
         await session.refresh(application)
         return application
 
@@ -29,6 +56,7 @@ async def get_application_by_id(application_id: UUID) -> Application | None:
                 selectinload(Application.psychologist).selectinload(Psychologist.user)
             )
             .where(Application.id == application_id)
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
@@ -39,39 +67,110 @@ async def get_applications(
     status: ApplicationStatus | None = None,
     assigned_to: UUID | None = None,
     user_id: UUID | None = None,
-    sort_by: str = "created_at",
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
     sort_desc: bool = True,
+    cursor: str | None = None,
 ) -> list[Application]:
+    query = select(Application).options(
+        selectinload(Application.user),
+        selectinload(Application.assigned_to_user),
+        # Глубокая подгрузка пациента внутри встречи
+        selectinload(Application.appointment).selectinload(Appointment.patient),
+        # Глубокая подгрузка профиля психолога
+        selectinload(Application.psychologist).selectinload(Psychologist.user)
+    )
+    query = _apply_list_params(
+        query, skip, limit, status, assigned_to, user_id, sort_by, sort_desc, cursor
+    )
     async with get_async_db() as session:
-        query = select(Application).options(
-            selectinload(Application.user),
-            selectinload(Application.assigned_to_user),
-            # Глубокая подгрузка пациента внутри встречи
-            selectinload(Application.appointment).selectinload(Appointment.patient),
-            # Глубокая подгрузка профиля психолога
-            selectinload(Application.psychologist).selectinload(Psychologist.user)
-        )
-        
-        filters = []
-        if status:
-            filters.append(Application.status == status.value)
-        if assigned_to:
-            filters.append(Application.assigned_to == assigned_to)
-        if user_id:
-            filters.append(Application.user_id == user_id)
-            
-        if filters:
-            query = query.where(and_(*filters))
-            
-        if sort_by:
-            order = getattr(Application, sort_by).desc() if sort_desc else getattr(Application, sort_by).asc()
-            query = query.order_by(order)
-            
-        query = query.offset(skip).limit(limit)
         result = await session.execute(query)
         return list(result.scalars().all())
 
 
+async def get_application_summaries(
+    skip: int = 0,
+    limit: int = 100,
+    status: ApplicationStatus | None = None,
+    assigned_to: UUID | None = None,
+    user_id: UUID | None = None,
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
+    sort_desc: bool = True,
+    cursor: str | None = None,
+) -> list[Row]:
+    """
+    Краткий список заявок одним запросом: только нужные колонки и имена
+    связанных пользователей, без загрузки ORM-объектов.
+    """
+    applicant = aliased(User)
+    assignee = aliased(User)
+    psychologist_user = aliased(User)
+
+    query = (
+        select(
+            Application.id,
+            Application.status,
+            Application.university_status,
+            Application.preferred_campus,
+            Application.meeting_type,
+            Application.scheduled_at,
+            Application.created_at,
+            Application.updated_at,
+            Application.version,
+            Application.user_id,
+            applicant.first_name.label("user_first_name"),
+            applicant.last_name.label("user_last_name"),
+            Application.assigned_to,
+            assignee.first_name.label("assigned_to_first_name"),
+            assignee.last_name.label("assigned_to_last_name"),
+            Application.psychologist_id,
+            psychologist_user.first_name.label("psychologist_first_name"),
+            psychologist_user.last_name.label("psychologist_last_name"),
+            Application.appointment_id,
+        )
+        .outerjoin(applicant, applicant.id == Application.user_id)
+        .outerjoin(assignee, assignee.id == Application.assigned_to)
+        .outerjoin(Psychologist, Psychologist.id == Application.psychologist_id)
+        .outerjoin(psychologist_user, psychologist_user.id == Psychologist.user_id)
+    )
+    query = _apply_list_params(
+        query, skip, limit, status, assigned_to, user_id, sort_by, sort_desc, cursor
+    )
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.all())
+
+
+def _apply_list_params(
+    query,
+    skip: int,
+    limit: int,
+    status: ApplicationStatus | None,
+    assigned_to: UUID | None,
+    user_id: UUID | None,
+    sort_by: ApplicationSortField,
+    sort_desc: bool,
+    cursor: str | None,
+):
+    filters = []
+    if status:
+        filters.append(Application.status == status.value)
+    if assigned_to:
+        filters.append(Application.assigned_to == assigned_to)
+    if user_id:
+        filters.append(Application.user_id == user_id)
+
+    if filters:
+        query = query.where(and_(*filters))
+
+    if cursor is not None and sort_by not in KEYSET_SORT_FIELDS:
+        raise InvalidCursorError("Сортировка не поддерживает навигацию по курсору")
+    query = applications_keyset(sort_by, sort_desc).apply(query, cursor)
+
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
 async def update_application_with_version(
     application_id: UUID,
     expected_version: int,
@@ -86,10 +185,92 @@ async def update_application_with_version(
             .returning(Application)
         )
         result = await session.execute(stmt)
-        await session.commit()
         return result.scalar_one_or_none()
 
 
+def _stale_condition(cutoffs: dict[ApplicationStatus, datetime]):
+    return or_(*(
+        and_(Application.status == status.value, Application.updated_at < cutoff)
+        for status, cutoff in cutoffs.items()
+    ))
+
+
+async def count_stale_applications(cutoffs: dict[ApplicationStatus, datetime]) -> dict[str, int]:
+    """Сколько заявок просрочено по каждому статусу (без изменений)"""
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(Application.status, func.count())
+            .where(_stale_condition(cutoffs))
+            .group_by(Application.status)
+        )
+        return {status: count for status, count in result.all()}
+
+
+async def lock_stale_applications(
+    cutoffs: dict[ApplicationStatus, datetime], limit: int
+) -> list[Row]:
+    """
+    Заблокировать пачку просроченных заявок до конца транзакции.
+
+    SKIP LOCKED: заявки, которые сейчас меняет пользователь или другой
+    воркер, пропускаются и попадут в следующий запуск.
+    """
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(Application.id, Application.status)
+            .where(_stale_condition(cutoffs))
+            .order_by(Application.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.all())
+
+
+async def expire_applications(application_ids: list[UUID], now: datetime) -> list[UUID]:
+    """
+    Перевести заявки в EXPIRED одним UPDATE.
+
+    version увеличивается, поэтому параллельные изменения с оптимистичной
+    блокировкой по старой версии получат конфликт.
+    """
+    async with get_async_db() as session:
+        result = await session.execute(
+            update(Application)
+            .where(Application.id.in_(application_ids))
+            .values(
+                status=ApplicationStatus.EXPIRED.value,
+                expired_at=now,
+                updated_at=now,
+                version=Application.version + 1,
+            )
+            .returning(Application.id),
+            execution_options={"synchronize_session": False},
+        )
+        return list(result.scalars().all())
+
+
+async def get_application_owner(application_id: UUID) -> Row | None:
+    """Только владелец заявки (для проверки доступа без подгрузки связей)"""
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(Application.user_id).where(Application.id == application_id)
+        )
+        return result.first()
+
+
+async def get_application_history(application_id: UUID, skip: int, limit: int) -> list[ApplicationAuditLog]:
+    """Журнал изменений статуса по индексу (application_id, timestamp)"""
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(ApplicationAuditLog)
+            .where(ApplicationAuditLog.application_id == application_id)
+            .order_by(ApplicationAuditLog.timestamp, ApplicationAuditLog.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
 async def update_application(application_id: UUID, update_data: dict) -> Application | None:
     """Простое обновление без проверки версии (использовать с осторожностью)."""
     async with get_async_db() as session:
@@ -100,7 +281,6 @@ async def update_application(application_id: UUID, update_data: dict) -> Applica
             .returning(Application)
         )
         result = await session.execute(stmt)
-        await session.commit()
         return result.scalar_one_or_none()
 
 
@@ -109,6 +289,6 @@ async def delete_application(application_id: UUID) -> bool:
         application = await session.get(Application, application_id)
         if application:
             await session.delete(application)
-            await session.commit()
+            await session.flush()
             return True
         return False
\ No newline at end of file
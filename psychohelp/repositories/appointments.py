@@ -9,8 +9,9 @@ from psychohelp.models.psychologists import Psychologist
 from psychohelp.models.users import User
 from psychohelp.config.config import get_async_db
 
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
+from sqlalchemy import exists, union_all, update
+from sqlalchemy.engine import Row
 
 from uuid import UUID
 from datetime import datetime, timezone
@@ -30,7 +31,9 @@ async def get_appointment_by_id(appointment_id: UUID, user_id: UUID) -> Appointm
             )
         )
         
-        result = await session.execute(query)
+        result = await session.execute(
+            query.execution_options(populate_existing=True)
+        )
         return result.scalar_one_or_none()
 
 
@@ -41,6 +44,7 @@ async def create_appointment(
     reason: str | None,
     status: AppointmentStatus,
     scheduled_time: datetime,
+    scheduled_end_time: datetime,
     remind_time: datetime | None,
     last_change_time: datetime,
     venue: str,
@@ -57,23 +61,107 @@ async def create_appointment(
             reason=reason,
             status=status,
             scheduled_time=scheduled_time,
+            scheduled_end_time=scheduled_end_time,
             remind_time=remind_time,
             last_change_time=last_change_time,
             venue=venue,
             comment=comment,
         )
 
-        try:
-            session.add(new_appointment)
-            await session.commit()
-            await session.refresh(new_appointment)
-        except IntegrityError:
-            await session.rollback()
-            raise
+        session.add(new_appointment)
+        await session.flush()
+        await session.refresh(new_appointment)
 
         return new_appointment
 
 
+async def get_busy_intervals(
+    start: datetime, end: datetime, psychologist_id: UUID | None = None
+) -> list[Row]:
+    """Ожидающие встречи, пересекающиеся с [start, end): психолог, начало и конец"""
+    query = select(
+        Appointment.psychologist_id,
+        Appointment.scheduled_time,
+        Appointment.scheduled_end_time,
+    ).where(
+        Appointment.status == AppointmentStatus.awaiting,
+        Appointment.scheduled_time < end,
+        Appointment.scheduled_end_time > start,
+    )
+    if psychologist_id is not None:
+        query = query.where(Appointment.psychologist_id == psychologist_id)
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.all())
+
+
+async def has_overlapping_appointment(psychologist_id: UUID, start: datetime, end: datetime) -> bool:
+    query = select(
+        exists().where(
+            Appointment.psychologist_id == psychologist_id,
+            Appointment.status == AppointmentStatus.awaiting,
+            Appointment.scheduled_time < end,
+            Appointment.scheduled_end_time > start,
+        )
+    )
+    async with get_async_db() as session:
+        return bool(await session.scalar(query))
+
+
+async def get_upcoming_reminders(until: datetime, limit: int) -> list[Row]:
+    """Неотправленные напоминания ожидающих встреч до until (по частичному индексу)"""
+    query = (
+        select(Appointment.id, Appointment.remind_time)
+        .where(
+            Appointment.status == AppointmentStatus.awaiting,
+            Appointment.reminder_sent_at.is_(None),
+            Appointment.remind_time <= until,
+        )
+        .order_by(Appointment.remind_time)
+        .limit(limit)
+    )
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.all())
+
+
+async def claim_due_reminders(appointment_ids: list[UUID], now: datetime) -> list[Row]:
+    """
+    Отметить напоминания отправленными и вернуть данные для писем.
+
+    SKIP LOCKED: строки, которые уже забрал другой воркер, пропускаются,
+    повторно отмеченные не вернутся из-за условия reminder_sent_at IS NULL.
+    """
+    claimable = (
+        select(Appointment.id)
+        .where(
+            Appointment.id.in_(appointment_ids),
+            Appointment.status == AppointmentStatus.awaiting,
+            Appointment.reminder_sent_at.is_(None),
+            Appointment.remind_time <= now,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    def patient_column(column):
+        return select(column).where(User.id == Appointment.patient_id).scalar_subquery()
+
+    async with get_async_db() as session:
+        result = await session.execute(
+            update(Appointment)
+            .where(Appointment.id.in_(claimable))
+            .values(reminder_sent_at=now)
+            .returning(
+                Appointment.id,
+                Appointment.scheduled_time,
+                Appointment.venue,
+                patient_column(User.email).label("email"),
+                patient_column(User.first_name).label("first_name"),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        return list(result.all())
+
+
 async def cancel_appointment_by_id(appointment_id: UUID, current_user_id: UUID, cancel_reason: str) -> Appointment:
     async with get_async_db() as session:
         # Благодаря selectinload(Appointment.psychologist) у нас есть доступ к объекту психолога
@@ -97,31 +185,64 @@ async def cancel_appointment_by_id(appointment_id: UUID, current_user_id: UUID,
         appointment.status = AppointmentStatus.cancelled
         appointment.cancel_reason = cancel_reason
         appointment.last_change_time = datetime.now(timezone.utc)
-
-        try:
-            await session.commit()
-        except IntegrityError:
-            await session.rollback()
-            raise
+        await session.flush()
 
         return appointment
 
 
-async def get_appointments_by_user_id(user_id: UUID) -> list[Appointment]:
-    async with get_async_db() as session:
-        query = (
-            select(Appointment)
-            .options( # Добавили selectinload
-                selectinload(Appointment.patient),
-                selectinload(Appointment.psychologist).selectinload(Psychologist.user)
-            )
-            .outerjoin(Psychologist, Appointment.psychologist_id == Psychologist.id)
-            .filter(
-                (Appointment.patient_id == user_id) | 
-                (Psychologist.user_id == user_id)
-            )
+async def get_appointments_by_user_id(
+    user_id: UUID,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: AppointmentStatus | None = None,
+    skip: int = 0,
+    take: int | None = None,
+) -> list[Appointment]:
+    """
+    Записи, где пользователь пациент или психолог, от новых к старым.
+
+    Вместо OR по двум таблицам - UNION ALL двух веток, каждая идет по своему
+    индексу (patient_id, scheduled_time) / (psychologist_id, scheduled_time).
+    """
+    def branch(condition):
+        query = select(Appointment.id, Appointment.scheduled_time).where(condition)
+        if date_from is not None:
+            query = query.where(Appointment.scheduled_time >= date_from)
+        if date_to is not None:
+            query = query.where(Appointment.scheduled_time < date_to)
+        if status is not None:
+            query = query.where(Appointment.status == status)
+        if take is not None:
+            # Каждой ветке достаточно первых skip + take строк; порядок как у внешнего
+            # запроса, иначе при равном времени ветка может отрезать не те строки
+            query = query.order_by(
+                Appointment.scheduled_time.desc(), Appointment.id.desc()
+            ).limit(skip + take)
+        return select(query.subquery())
+
+    psychologist_id = (
+        select(Psychologist.id).where(Psychologist.user_id == user_id).scalar_subquery()
+    )
+    matched = union_all(
+        branch(Appointment.patient_id == user_id),
+        # Пациент и психолог в одной записи - один человек: не дублируем строку
+        branch((Appointment.psychologist_id == psychologist_id) & (Appointment.patient_id != user_id)),
+    ).subquery()
+
+    query = (
+        select(Appointment)
+        .options(
+            selectinload(Appointment.patient),
+            selectinload(Appointment.psychologist).selectinload(Psychologist.user)
         )
-        
+        .join(matched, matched.c.id == Appointment.id)
+        .order_by(matched.c.scheduled_time.desc(), matched.c.id.desc())
+        .offset(skip)
+    )
+    if take is not None:
+        query = query.limit(take)
+
+    async with get_async_db() as session:
         result = await session.execute(query)
         return list(result.scalars().all())
 
@@ -150,11 +271,6 @@ async def complete_appointment_by_psychologist(
         appointment.status = AppointmentStatus.done
         appointment.conclusion = conclusion
         appointment.last_change_time = datetime.now(timezone.utc)
-
-        try:
-            await session.commit()
-        except IntegrityError:
-            await session.rollback()
-            raise
+        await session.flush()
 
         return appointment
\ No newline at end of file
@@ -1,22 +1,33 @@
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import Row, select, update
 
 from psychohelp.config.config import get_async_db
 from psychohelp.models.articles import Article
+from psychohelp.repositories.pagination import Keyset
+from psychohelp.repositories.search import FullTextSearch
 
 
-async def get_articles(skip: int = 0, take: int = 100) -> list[Article]:
+ARTICLES_KEYSET = Keyset(Article.title, Article.id)
+ARTICLES_SEARCH = FullTextSearch(Article, Article.text, (Article.id, Article.title))
+
+
+async def get_articles(skip: int = 0, take: int = 100, cursor: str | None = None) -> list[Article]:
+    query = ARTICLES_KEYSET.apply(select(Article), cursor)
+    if cursor is None:
+        query = query.offset(skip)
     async with get_async_db() as session:
-        result = await session.execute(
-            select(Article)
-            .order_by(Article.title.asc())
-            .offset(skip)
-            .limit(take)
-        )
+        result = await session.execute(query.limit(take))
         return list(result.scalars().all())
 
 
+async def search_articles(query: str, take: int = 20, cursor: str | None = None) -> list[Row]:
+    """Строки (id, title, rank, snippet) по убыванию релевантности"""
+    async with get_async_db() as session:
+        result = await session.execute(ARTICLES_SEARCH.statement(take, cursor), {"query": query})
+        return list(result.all())
+
+
 async def get_article_by_id(article_id: UUID) -> Article | None:
     async with get_async_db() as session:
         result = await session.execute(
@@ -29,7 +40,7 @@ async def create_article(article_data: dict) -> Article:
     async with get_async_db() as session:
         article = Article(**article_data)
         session.add(article)
-        await session.commit()
+        await session.flush()
         await session.refresh(article)
         return article
 
@@ -43,7 +54,6 @@ async def update_article(article_id: UUID, article_data: dict) -> Article | None
             .returning(Article)
         )
         result = await session.execute(stmt)
-        await session.commit()
         return result.scalar_one_or_none()
 
 
@@ -54,5 +64,5 @@ async def delete_article(article_id: UUID) -> bool:
             return False
 
         await session.delete(article)
-        await session.commit()
+        await session.flush()
         return True
@@ -0,0 +1,129 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import case, delete, select, update
+
+from psychohelp.config.config import get_async_db
+from psychohelp.models.email_outbox import EmailOutbox, EmailOutboxStatus
+
+
+async def create_outbox_email(
+    recipient: str,
+    subject: str,
+    text: str,
+    html: str,
+    sender_alias: str | None = None,
+    password_reset_token_id: UUID | None = None,
+) -> EmailOutbox:
+    async with get_async_db() as session:
+        email = EmailOutbox(
+            recipient=recipient,
+            subject=subject,
+            text=text,
+            html=html,
+            sender_alias=sender_alias,
+            password_reset_token_id=password_reset_token_id,
+        )
+        session.add(email)
+        await session.flush()
+        return email
+
+
+async def claim_pending_emails(now: datetime, limit: int, lease_until: datetime) -> list[EmailOutbox]:
+    """
+    Забрать пачку писем, которым пора уходить.
+
+    Письма сразу откладываются до lease_until: если процесс упадет во время
+    отправки, письмо вернется в очередь. SKIP LOCKED позволяет нескольким
+    воркерам разбирать очередь без пересечений.
+    """
+    claimable = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status == EmailOutboxStatus.PENDING.value,
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with get_async_db() as session:
+        result = await session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(claimable))
+            .values(attempts=EmailOutbox.attempts + 1, next_attempt_at=lease_until)
+            .returning(EmailOutbox),
+            execution_options={"synchronize_session": False},
+        )
+        return list(result.scalars().all())
+
+
+def _redacted(column):
+    """Текст писем с токеном восстановления пароля не храним дольше, чем нужно для отправки"""
+    return case((EmailOutbox.password_reset_token_id.is_(None), column), else_="")
+
+
+async def mark_emails_sent(email_ids: list[UUID], now: datetime) -> None:
+    if not email_ids:
+        return
+    async with get_async_db() as session:
+        await session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(email_ids))
+            .values(
+                status=EmailOutboxStatus.SENT.value,
+                sent_at=now,
+                last_error=None,
+                text=_redacted(EmailOutbox.text),
+                html=_redacted(EmailOutbox.html),
+            )
+        )
+
+
+async def release_emails(email_ids: list[UUID], next_attempt_at: datetime) -> None:
+    """Вернуть забранные письма в очередь, не засчитывая попытку"""
+    if not email_ids:
+        return
+    async with get_async_db() as session:
+        await session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(email_ids))
+            .values(attempts=EmailOutbox.attempts - 1, next_attempt_at=next_attempt_at)
+        )
+
+
+async def mark_email_failed(
+    email_id: UUID,
+    error: str,
+    next_attempt_at: datetime | None,
+) -> None:
+    """Перенести письмо на next_attempt_at или, если None, отправить в dead letter"""
+    values = {"last_error": error[:1024]}
+    if next_attempt_at is None:
+        values["status"] = EmailOutboxStatus.DEAD.value
+        values["text"] = _redacted(EmailOutbox.text)
+        values["html"] = _redacted(EmailOutbox.html)
+    else:
+        values["next_attempt_at"] = next_attempt_at
+    async with get_async_db() as session:
+        await session.execute(
+            update(EmailOutbox).where(EmailOutbox.id == email_id).values(**values)
+        )
+
+
+async def purge_finished_emails(before: datetime, limit: int) -> int:
+    """Удалить до limit отправленных и dead писем, созданных раньше before"""
+    purgeable = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status.in_([EmailOutboxStatus.SENT.value, EmailOutboxStatus.DEAD.value]),
+            EmailOutbox.created_at < before,
+        )
+        .limit(limit)
+    )
+    async with get_async_db() as session:
+        result = await session.execute(
+            delete(EmailOutbox).where(EmailOutbox.id.in_(purgeable)),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
@@ -1,22 +1,33 @@
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import Row, select, update
 
 from psychohelp.config.config import get_async_db
 from psychohelp.models.news import News
+from psychohelp.repositories.pagination import Keyset
+from psychohelp.repositories.search import FullTextSearch
 
 
-async def get_news_list(skip: int = 0, take: int = 100) -> list[News]:
+NEWS_KEYSET = Keyset(News.created_at, News.id, descending=True)
+NEWS_SEARCH = FullTextSearch(News, News.text, (News.id, News.title, News.created_at))
+
+
+async def get_news_list(skip: int = 0, take: int = 100, cursor: str | None = None) -> list[News]:
+    query = NEWS_KEYSET.apply(select(News), cursor)
+    if cursor is None:
+        query = query.offset(skip)
     async with get_async_db() as session:
-        result = await session.execute(
-            select(News)
-            .order_by(News.created_at.desc())
-            .offset(skip)
-            .limit(take)
-        )
+        result = await session.execute(query.limit(take))
         return list(result.scalars().all())
 
 
+async def search_news(query: str, take: int = 20, cursor: str | None = None) -> list[Row]:
+    """Строки (id, title, created_at, rank, snippet) по убыванию релевантности"""
+    async with get_async_db() as session:
+        result = await session.execute(NEWS_SEARCH.statement(take, cursor), {"query": query})
+        return list(result.all())
+
+
 async def get_news_by_id(news_id: UUID) -> News | None:
     async with get_async_db() as session:
         result = await session.execute(
@@ -29,7 +40,7 @@ async def create_news(news_data: dict) -> News:
     async with get_async_db() as session:
         news_item = News(**news_data)
         session.add(news_item)
-        await session.commit()
+        await session.flush()
         await session.refresh(news_item)
         return news_item
 
@@ -43,7 +54,6 @@ async def update_news(news_id: UUID, news_data: dict) -> News | None:
             .returning(News)
         )
         result = await session.execute(stmt)
-        await session.commit()
         return result.scalar_one_or_none()
 
 
@@ -54,5 +64,5 @@ async def delete_news(news_id: UUID) -> bool:
             return False
 
         await session.delete(news_item)
-        await session.commit()
+        await session.flush()
         return True
\ No newline at end of file
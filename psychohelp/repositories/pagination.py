@@ -0,0 +1,115 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(key: str, values: Sequence[Any]) -> str:
+    payload = json.dumps({"k": key, "v": [_dump_value(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _has_type(value: Any, expected: type) -> bool:
+    # bool - подкласс int, но в числовой колонке не значение
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, key: str, types: Sequence[type] | None = None) -> list[Any]:
+    """types - ожидаемые типы значений по колонкам ключа; иначе значения не проверяются"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_load_value(value) for value in payload["v"]]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Некорректный курсор") from e
+    # Курсор от другой сортировки не подходит
+    if payload.get("k") != key:
+        raise InvalidCursorError("Курсор не соответствует сортировке")
+    # Подделанный курсор иначе дошел бы до запроса и упал с 500
+    if types is not None and (
+        len(values) != len(types) or not all(map(_has_type, values, types))
+    ):
+        raise InvalidCursorError("Некорректный курсор")
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Keyset:
+    """
+    Порядок выдачи для постраничной навигации по курсору:
+    колонка сортировки + id для однозначности. Колонки не должны быть NULL:
+    такие строки не проходят сравнение с курсором и выпадают из выдачи.
+
+    cursor_values нужен, если значения ключа не атрибуты строки с теми же
+    именами, например при сортировке модели по колонке связанной таблицы.
+    """
+
+    column: InstrumentedAttribute
+    id_column: InstrumentedAttribute
+    descending: bool = False
+    cursor_values: Callable[[Any], Sequence[Any]] | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.column.key}.{'desc' if self.descending else 'asc'}"
+
+    @property
+    def _columns(self) -> tuple[InstrumentedAttribute, ...]:
+        if self.column is self.id_column:
+            return (self.id_column,)
+        return (self.column, self.id_column)
+
+    def apply(self, query: Select, cursor: str | None) -> Select:
+        columns = self._columns
+        query = query.order_by(
+            *(column.desc() if self.descending else column.asc() for column in columns)
+        )
+        if cursor is None:
+            return query
+
+        values = decode_cursor(cursor, self.key, [column.type.python_type for column in columns])
+        row_key = tuple_(*columns) if len(columns) > 1 else columns[0]
+        after = tuple_(*values) if len(values) > 1 else values[0]
+        return query.where(row_key < after if self.descending else row_key > after)
+
+    def next_cursor(self, rows: Sequence[Any], limit: int) -> str | None:
+        """Курсор следующей страницы; None, если страница неполная"""
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        if self.cursor_values is not None:
+            return encode_cursor(self.key, list(self.cursor_values(last)))
+        return encode_cursor(self.key, [getattr(last, column.key) for column in self._columns])
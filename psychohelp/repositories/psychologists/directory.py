@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+from sqlalchemy import Select, literal, select, union_all
+from sqlalchemy.orm import contains_eager, selectinload
+from sqlalchemy.sql import func
+
+from psychohelp.config.config import get_async_db
+from psychohelp.models.psychologists import ConsultArea, Psychologist, psychologists_consult_areas
+from psychohelp.models.users import USER_FULL_NAME, User
+from psychohelp.repositories.psychologists.psychologists import PSYCHOLOGISTS_KEYSET
+
+
+FACETS = ("consult_areas", "offices", "qualifications")
+
+
+@dataclass(frozen=True, slots=True)
+class DirectoryFilters:
+    """Внутри фасета значения объединяются через ИЛИ, между фасетами - через И"""
+
+    consult_areas: tuple[str, ...] = ()
+    offices: tuple[str, ...] = ()
+    qualifications: tuple[str, ...] = ()
+    # Каждое слово должно встречаться в "Имя Отчество Фамилия"
+    name: str | None = None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _filtered(query: Select, filters: DirectoryFilters, skip_facet: str | None = None) -> Select:
+    """
+    Условия фильтров; skip_facet не применяется, чтобы счетчики фасета
+    показывали, сколько будет при выборе другого его значения.
+    """
+    query = query.join(User, User.id == Psychologist.user_id)
+    if filters.consult_areas and skip_facet != "consult_areas":
+        query = query.where(Psychologist.id.in_(
+            select(psychologists_consult_areas.c.psychologist_id)
+            .join(ConsultArea, ConsultArea.id == psychologists_consult_areas.c.consult_area_id)
+            .where(ConsultArea.name.in_(filters.consult_areas))
+        ))
+    if filters.offices and skip_facet != "offices":
+        query = query.where(Psychologist.office.in_(filters.offices))
+    if filters.qualifications and skip_facet != "qualifications":
+        query = query.where(Psychologist.qualification.in_(filters.qualifications))
+    for word in (filters.name or "").split():
+        query = query.where(USER_FULL_NAME.ilike(f"%{_escape_like(word)}%", escape="\\"))
+    return query
+
+
+async def search_psychologists(
+    filters: DirectoryFilters, take: int = 20, cursor: str | None = None
+) -> list[Psychologist]:
+    query = _filtered(select(Psychologist), filters).options(
+        contains_eager(Psychologist.user), selectinload(Psychologist.consult_area_tags)
+    )
+    query = PSYCHOLOGISTS_KEYSET.apply(query, cursor).limit(take)
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+
+def facet_counts_query(filters: DirectoryFilters) -> Select:
+    """Счетчики всех фасетов одним запросом: (facet, value, count)"""
+    count = func.count().label("count")
+    consult_areas = _filtered(
+        select(literal("consult_areas").label("facet"), ConsultArea.name.label("value"), count)
+        .select_from(Psychologist)
+        .join(psychologists_consult_areas, psychologists_consult_areas.c.psychologist_id == Psychologist.id)
+        .join(ConsultArea, ConsultArea.id == psychologists_consult_areas.c.consult_area_id),
+        filters,
+        "consult_areas",
+    ).group_by(ConsultArea.name)
+    offices = _filtered(
+        select(literal("offices").label("facet"), Psychologist.office.label("value"), count),
+        filters,
+        "offices",
+    ).group_by(Psychologist.office)
+    qualifications = _filtered(
+        select(literal("qualifications").label("facet"), Psychologist.qualification.label("value"), count),
+        filters,
+        "qualifications",
+    ).group_by(Psychologist.qualification)
+    return union_all(consult_areas, offices, qualifications)
+
+
+async def get_facet_counts(filters: DirectoryFilters) -> dict[str, list[tuple[str, int]]]:
+    """Значения фасетов по убыванию числа психологов"""
+    async with get_async_db() as session:
+        result = await session.execute(facet_counts_query(filters))
+        rows = result.all()
+
+    facets: dict[str, list[tuple[str, int]]] = {facet: [] for facet in FACETS}
+    for facet, value, count in sorted(rows, key=lambda row: (-row.count, row.value)):
+        facets[facet].append((value, count))
+    return facets
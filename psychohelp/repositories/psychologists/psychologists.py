@@ -2,12 +2,14 @@ from uuid import UUID
 
 from psychohelp.constants.rbac import RoleCode
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, selectinload
 
 from psychohelp.config.config import get_async_db
-from psychohelp.models.psychologists import Psychologist
-from psychohelp.models.users import User
+from psychohelp.models.psychologists import ConsultArea, Psychologist, parse_consult_areas
+from psychohelp.models.users import USER_SORT_NAME, User, user_sort_name
 from psychohelp.models.roles import Role
+from psychohelp.repositories.pagination import Keyset
 from psychohelp.repositories.psychologists.exceptions import (
     UserNotFoundForPsychologistException,
     PsychologistRoleNotFoundException,
@@ -39,67 +41,90 @@ async def get_psychologist_by_user_id(user_id: UUID) -> Psychologist | None:
     return psychologist
 
 
-async def get_psychologists(skip: int = 0, take: int = 10) -> list[Psychologist]:
+# По фамилии и имени; запрос должен быть соединен с users. Для однозначности
+# users.id (psychologists.user_id уникален), чтобы порядок шел по ix_users_sort_name_id
+PSYCHOLOGISTS_KEYSET = Keyset(
+    USER_SORT_NAME,
+    User.id,
+    cursor_values=lambda psychologist: (user_sort_name(psychologist.user), psychologist.user_id),
+)
+
+
+async def get_psychologists(
+    skip: int = 0, take: int = 10, cursor: str | None = None
+) -> list[Psychologist]:
     """
-    Получить список психологов с пагинацией
+    Получить список психологов с пагинацией (по смещению или по курсору)
     """
+    query = PSYCHOLOGISTS_KEYSET.apply(
+        select(Psychologist).join(Psychologist.user).options(contains_eager(Psychologist.user)), cursor
+    )
+    if cursor is None:
+        query = query.offset(skip)
     async with get_async_db() as session:
-        query = await session.execute(
-            select(Psychologist)
-            .options(joinedload(Psychologist.user))
-            .offset(skip)
-            .limit(take)
-        )
+        query = await session.execute(query.limit(take))
 
     result = query.scalars().all()
     return result
 
 
+async def get_or_create_consult_areas(session: AsyncSession, names: list[str]) -> list[ConsultArea]:
+    if not names:
+        return []
+    result = await session.execute(select(ConsultArea).where(ConsultArea.name.in_(names)))
+    areas = {area.name: area for area in result.scalars()}
+    for name in names:
+        if name not in areas:
+            areas[name] = ConsultArea(name=name)
+            session.add(areas[name])
+    return [areas[name] for name in names]
+
+
 async def create_psychologist(user_id: UUID, psychologist_data: dict) -> Psychologist:
     async with get_async_db() as session:
-        async with session.begin():
-            user_result = await session.execute(
-                select(User)
-                .options(selectinload(User.roles))
-                .where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            
-            if user is None:
-                raise UserNotFoundForPsychologistException(user_id)
-            
-            existing_psychologist_result = await session.execute(
-                select(Psychologist).where(Psychologist.user_id == user_id)
-            )
-            if existing_psychologist_result.scalar_one_or_none() is not None:
-                raise PsychologistAlreadyExistsException(user_id)
-            
-            psychologist = Psychologist(user_id=user_id, **psychologist_data)
-            session.add(psychologist)
-            
-            psychologist_role_result = await session.execute(
-                select(Role).where(Role.code == RoleCode.PSYCHOLOGIST.value)
-            )
-            psychologist_role = psychologist_role_result.scalar_one_or_none()
-            
-            if not psychologist_role:
-                raise PsychologistRoleNotFoundException()
-            
-            user_role_codes = {role.code for role in user.roles}
-            
-            if RoleCode.PSYCHOLOGIST.value not in user_role_codes:
-                user.roles.append(psychologist_role)
-            
-            await session.flush()
-
-            result = await session.execute(
-                select(Psychologist)
-                .options(selectinload(Psychologist.user))
-                .where(Psychologist.id == psychologist.id)
-            )
-            psychologist = result.scalar_one()
-            
-            await session.commit()
+        user_result = await session.execute(
+            select(User)
+            .options(selectinload(User.roles))
+            .where(User.id == user_id)
+        )
+        user = user_result.scalar_one_or_none()
+        
+        if user is None:
+            raise UserNotFoundForPsychologistException(user_id)
+        
+        existing_psychologist_result = await session.execute(
+            select(Psychologist).where(Psychologist.user_id == user_id)
+        )
+        if existing_psychologist_result.scalar_one_or_none() is not None:
+            raise PsychologistAlreadyExistsException(user_id)
+        
+        psychologist = Psychologist(user_id=user_id, **psychologist_data)
+        psychologist.consult_area_tags = await get_or_create_consult_areas(
+            session, parse_consult_areas(psychologist.consult_areas)
+        )
+        session.add(psychologist)
+        
+        psychologist_role_result = await session.execute(
+            select(Role).where(Role.code == RoleCode.PSYCHOLOGIST.value)
+        )
+        psychologist_role = psychologist_role_result.scalar_one_or_none()
+        
+        if not psychologist_role:
+            raise PsychologistRoleNotFoundException()
+        
+        user_role_codes = {role.code for role in user.roles}
+        
+        if RoleCode.PSYCHOLOGIST.value not in user_role_codes:
+            user.roles.append(psychologist_role)
+        
+        await session.flush()
+
+        result = await session.execute(
+            select(Psychologist)
+            .options(selectinload(Psychologist.user))
+            .where(Psychologist.id == psychologist.id)
+        )
+        psychologist = result.scalar_one()
     
     return psychologist
 
@@ -115,28 +140,27 @@ async def delete_psychologist(psychologist_id: UUID) -> bool:
         bool: True если удалено, False если не найдено
     """
     async with get_async_db() as session:
-        async with session.begin():
-            result = await session.execute(
-                select(Psychologist)
-                .options(selectinload(Psychologist.user).selectinload(User.roles))
-                .where(Psychologist.id == psychologist_id)
-            )
-            psychologist = result.scalar_one_or_none()
-            
-            if psychologist is None:
-                return False
-            
-            user = psychologist.user
-            
-            psychologist_role = next(
-                (role for role in user.roles if role.code == RoleCode.PSYCHOLOGIST.value),
-                None
-            )
-            if psychologist_role:
-                user.roles.remove(psychologist_role)
-            
-            await session.delete(psychologist)
-            await session.commit()
+        result = await session.execute(
+            select(Psychologist)
+            .options(selectinload(Psychologist.user).selectinload(User.roles))
+            .where(Psychologist.id == psychologist_id)
+        )
+        psychologist = result.scalar_one_or_none()
+        
+        if psychologist is None:
+            return False
+        
+        user = psychologist.user
+        
+        psychologist_role = next(
+            (role for role in user.roles if role.code == RoleCode.PSYCHOLOGIST.value),
+            None
+        )
+        if psychologist_role:
+            user.roles.remove(psychologist_role)
+        
+        await session.delete(psychologist)
+        await session.flush()
     
     return True
 
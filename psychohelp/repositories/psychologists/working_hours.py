@@ -0,0 +1,30 @@
+from uuid import UUID
+
+from sqlalchemy import delete, select
+
+from psychohelp.config.config import get_async_db
+from psychohelp.models.working_hours import WorkingHours
+
+
+async def get_working_hours(psychologist_id: UUID | None = None) -> list[WorkingHours]:
+    """Шаблоны рабочих часов одного психолога или всех сразу"""
+    query = select(WorkingHours).order_by(
+        WorkingHours.psychologist_id, WorkingHours.weekday, WorkingHours.start_time
+    )
+    if psychologist_id is not None:
+        query = query.where(WorkingHours.psychologist_id == psychologist_id)
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+
+async def replace_working_hours(psychologist_id: UUID, rows: list[dict]) -> list[WorkingHours]:
+    """Заменить шаблон рабочих часов психолога целиком"""
+    async with get_async_db() as session:
+        await session.execute(
+            delete(WorkingHours).where(WorkingHours.psychologist_id == psychologist_id)
+        )
+        working_hours = [WorkingHours(psychologist_id=psychologist_id, **row) for row in rows]
+        session.add_all(working_hours)
+        await session.flush()
+        return working_hours
@@ -5,7 +5,8 @@ from sqlalchemy.orm import selectinload
 
 from psychohelp.config.config import get_async_db
 from psychohelp.models.users import User
-from psychohelp.models.roles import Role
+from psychohelp.models.roles import Role, roles_permissions, users_roles
+from psychohelp.models.permissions import Permission
 from psychohelp.repositories.rbac.exceptions import (
     UserNotFoundException,
     RoleNotFoundException,
@@ -35,57 +36,78 @@ async def get_user_permissions(user_id: UUID) -> list[str]:
         return list(permissions)
 
 
+async def get_role_permission_codes() -> list[tuple[UUID, str, str | None]]:
+    """Строки (role_id, код роли, код права) из roles_permissions одним запросом."""
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(Role.id, Role.code, Permission.code)
+            .select_from(Role)
+            .outerjoin(roles_permissions, roles_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == roles_permissions.c.permission_id)
+        )
+        return [
+            (role_id, role_code.value, permission_code.value if permission_code else None)
+            for role_id, role_code, permission_code in result.all()
+        ]
+
+
+async def get_user_role_ids(user_id: UUID) -> list[UUID]:
+    async with get_async_db() as session:
+        result = await session.execute(
+            select(users_roles.c.role_id).where(users_roles.c.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+
 async def assign_role_to_user(user_id: UUID, role_code: RoleCode) -> bool:
     async with get_async_db() as session:
-        async with session.begin():
-            user_result = await session.execute(
-                select(User)
-                .options(selectinload(User.roles))
-                .where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            
-            if user is None:
-                raise UserNotFoundException(user_id)
-            
-            role_result = await session.execute(
-                select(Role).where(Role.code == role_code)
-            )
-            role = role_result.scalar_one_or_none()
-            
-            if role is None:
-                raise RoleNotFoundException(role_code)
-            
-            if role in user.roles:
-                return False
-            
-            user.roles.append(role)
-            await session.commit()
-            
-            return True
+        user_result = await session.execute(
+            select(User)
+            .options(selectinload(User.roles))
+            .where(User.id == user_id)
+        )
+        user = user_result.scalar_one_or_none()
+        
+        if user is None:
+            raise UserNotFoundException(user_id)
+        
+        role_result = await session.execute(
+            select(Role).where(Role.code == role_code)
+        )
+        role = role_result.scalar_one_or_none()
+        
+        if role is None:
+            raise RoleNotFoundException(role_code)
+        
+        if role in user.roles:
+            return False
+        
+        user.roles.append(role)
+        await session.flush()
+        
+        return True
 
 
 async def remove_role_from_user(user_id: UUID, role_code: RoleCode) -> bool:
     async with get_async_db() as session:
-        async with session.begin():
-            user_result = await session.execute(
-                select(User)
-                .options(selectinload(User.roles))
-                .where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            
-            if user is None:
-                raise UserNotFoundException(user_id)
-            
-            role = next((r for r in user.roles if r.code == role_code), None)
-            
-            if role is None:
-                return False
-            
-            user.roles.remove(role)
-            await session.commit()
-            
-            return True
+        user_result = await session.execute(
+            select(User)
+            .options(selectinload(User.roles))
+            .where(User.id == user_id)
+        )
+        user = user_result.scalar_one_or_none()
+        
+        if user is None:
+            raise UserNotFoundException(user_id)
+        
+        role = next((r for r in user.roles if r.code == role_code), None)
+        
+        if role is None:
+            return False
+        
+        user.roles.remove(role)
+        await session.flush()
+        
+        return True
 
 
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Float, Select, bindparam, select
+from sqlalchemy.dialects.postgresql import ts_headline, websearch_to_tsquery
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import func
+
+from psychohelp.repositories.pagination import Keyset
+
+
+SEARCH_CONFIG = "russian"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+
+
+@dataclass(frozen=True, slots=True)
+class FullTextSearch:
+    """
+    Поиск по генерируемой колонке search_vector (GIN-индекс).
+
+    Выдача по убыванию ts_rank, затем id; курсор - ранг и id последней строки.
+    Текст запроса передается параметром query при выполнении (синтаксис
+    websearch_to_tsquery: слова, "фраза", -исключение, or).
+    """
+
+    model: Any
+    snippet_column: InstrumentedAttribute
+    columns: tuple[InstrumentedAttribute, ...]
+
+    @property
+    def keyset(self) -> Keyset:
+        tsquery = websearch_to_tsquery(SEARCH_CONFIG, bindparam("query"))
+        return Keyset(func.ts_rank(self.model.search_vector, tsquery, type_=Float).label("rank"), self.model.id, descending=True)
+
+    def statement(self, take: int, cursor: str | None = None) -> Select:
+        tsquery = websearch_to_tsquery(SEARCH_CONFIG, bindparam("query"))
+        keyset = self.keyset
+        # Сниппет строится только для строк страницы, а не для всех совпадений
+        page = (
+            keyset.apply(select(self.model.id, keyset.column), cursor)
+            .where(self.model.search_vector.op("@@")(tsquery))
+            .limit(take)
+            .subquery()
+        )
+        snippet = ts_headline(SEARCH_CONFIG, self.snippet_column, tsquery, HEADLINE_OPTIONS)
+        return (
+            select(*self.columns, page.c.rank, snippet.label("snippet"))
+            .join(page, page.c.id == self.model.id)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+
+    def next_cursor(self, rows, take: int) -> str | None:
+        return self.keyset.next_cursor(rows, take)
@@ -0,0 +1,92 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, MetaData, Row, String, Table, func, select, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from psychohelp.config.config import get_async_db
+
+
+# Материализованные представления из миграции 4e9a1c3d5f68. Отдельные метаданные:
+# create_all и autogenerate не должны считать их таблицами.
+statistics_metadata = MetaData()
+
+application_counts = Table(
+    "statistics_application_counts",
+    statistics_metadata,
+    Column("status", String(50)),
+    Column("university_status", String(50)),
+    Column("applications", Integer),
+)
+
+application_durations = Table(
+    "statistics_application_durations",
+    statistics_metadata,
+    Column("id", Integer),
+    Column("median_seconds_to_in_progress", Float),
+    Column("median_seconds_to_completed", Float),
+    Column("started", Integer),
+    Column("completed", Integer),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
+
+psychologist_weekly_load = Table(
+    "statistics_psychologist_weekly_load",
+    statistics_metadata,
+    Column("psychologist_id", PG_UUID(as_uuid=True)),
+    Column("week", Date),
+    Column("appointments", Integer),
+    Column("done", Integer),
+    Column("cancelled", Integer),
+)
+
+STATISTICS_VIEWS = (application_counts, application_durations, psychologist_weekly_load)
+
+# Недели в statistics_psychologist_weekly_load считаются в этом поясе, он зашит в миграции
+WEEKLY_LOAD_TIMEZONE = "Europe/Moscow"
+
+# Ключ advisory-блокировки: при нескольких воркерах обновляет только один
+REFRESH_LOCK_KEY = 4_901_368_573
+
+
+async def refresh_statistics_views() -> bool:
+    """
+    CONCURRENTLY: чтение представлений во время обновления не блокируется.
+    False, если обновление уже идет в другом процессе.
+    """
+    async with get_async_db() as session:
+        # Блокировка снимается вместе с концом транзакции
+        locked = await session.scalar(select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_KEY)))
+        if not locked:
+            return False
+        for view in STATISTICS_VIEWS:
+            await session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+    return True
+
+
+async def get_application_counts() -> list[Row]:
+    async with get_async_db() as session:
+        result = await session.execute(select(application_counts))
+        return list(result.all())
+
+
+async def get_application_durations() -> Row | None:
+    async with get_async_db() as session:
+        result = await session.execute(select(application_durations))
+        return result.first()
+
+
+async def get_psychologist_weekly_load(
+    date_from: date, date_to: date, psychologist_id: UUID | None = None
+) -> list[Row]:
+    """Недели, начавшиеся в [date_from, date_to]"""
+    query = (
+        select(psychologist_weekly_load)
+        .where(psychologist_weekly_load.c.week.between(date_from, date_to))
+        .order_by(psychologist_weekly_load.c.week, psychologist_weekly_load.c.psychologist_id)
+    )
+    if psychologist_id is not None:
+        query = query.where(psychologist_weekly_load.c.psychologist_id == psychologist_id)
+    async with get_async_db() as session:
+        result = await session.execute(query)
+        return list(result.all())
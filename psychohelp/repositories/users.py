@@ -5,7 +5,6 @@ from psychohelp.config.config import get_async_db
 from psychohelp.repositories import get_user_id_from_token, UUID
 
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from sqlalchemy import update 
 
@@ -15,6 +14,7 @@ async def get_user_by_id(user_id: UUID) -> User | None:
             select(User)
             .options(selectinload(User.roles))        
             .filter(User.id == user_id)
+            .execution_options(populate_existing=True)
         )
     return result.scalar_one_or_none()
 
@@ -45,67 +45,58 @@ async def create_user(
     study_group: str | None = None,
 ) -> User:
     async with get_async_db() as session:
-        try:
-            existing_user = await session.execute(
-                select(User).filter(User.email == email)
-            )
-            if existing_user.scalar_one_or_none():
-                raise ValueError("Пользователь с таким email уже существует")
+        existing_user = await session.execute(
+            select(User).filter(User.email == email)
+        )
+        if existing_user.scalar_one_or_none():
+            raise ValueError("Пользователь с таким email уже существует")
 
-            new_user = User(
-                first_name=first_name,
-                middle_name=middle_name,
-                last_name=last_name,
-                phone_number=phone_number,
-                email=email,
-                social_media=social_media,
-                password=hashed_password,
-                study_group=study_group,
-            )
+        new_user = User(
+            first_name=first_name,
+            middle_name=middle_name,
+            last_name=last_name,
+            phone_number=phone_number,
+            email=email,
+            social_media=social_media,
+            password=hashed_password,
+            study_group=study_group,
+        )
 
-            session.add(new_user)
-            await session.flush()
-            
-            user_role_result = await session.execute(
-                select(Role).where(Role.code == RoleCode.USER.value)
+        session.add(new_user)
+        await session.flush()
+        
+        user_role_result = await session.execute(
+            select(Role).where(Role.code == RoleCode.USER.value)
+        )
+        user_role = user_role_result.scalar_one_or_none()
+        
+        if user_role:
+            await session.execute(
+                select(User)
+                .options(selectinload(User.roles))
+                .where(User.id == new_user.id)
             )
-            user_role = user_role_result.scalar_one_or_none()
-            
-            if user_role:
-                await session.execute(
-                    select(User)
-                    .options(selectinload(User.roles))
-                    .where(User.id == new_user.id)
-                )
-                new_user.roles.append(user_role)
-            
-            await session.commit()
-            await session.refresh(new_user, ['roles']) 
-            return new_user
-
-        except IntegrityError:
-            await session.rollback()
-            raise
+            new_user.roles.append(user_role)
+        
+        await session.flush()
+        await session.refresh(new_user, ['roles']) 
+        return new_user
 
 async def update_user(user_id: UUID, update_data: dict) -> User | None:
     """Обновить данные пользователя"""
     async with get_async_db() as session:
-        try:
-            stmt = (
-                update(User)
-                .where(User.id == user_id)
-                .values(**update_data)
-            )
-            await session.execute(stmt)
-            await session.commit()
-            
-            # Перезагружаем пользователя с отношениями после обновления
-            result = await session.execute(
-                select(User)
-                .options(selectinload(User.roles))
-                .filter(User.id == user_id)
-            )
-            return result.scalar_one_or_none()
-        except IntegrityError:
-            await session.rollback()
-            raise
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+        )
+        await session.execute(stmt)
+        
+        # Перезагружаем пользователя с отношениями после обновления
+        result = await session.execute(
+            select(User)
+            .options(selectinload(User.roles))
+            .filter(User.id == user_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
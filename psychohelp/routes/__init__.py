@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from psychohelp.config.config import config
+from psychohelp.dependencies.database import get_db_session
 from .controllers import users
 from .controllers import appointments
 from .controllers import therapists
@@ -8,9 +11,11 @@ from .controllers import images
 from .controllers import applications
 from .controllers import articles
 from .controllers import news
+from .controllers import metrics
+from .controllers import statistics
 
 
-api_router = APIRouter()
+api_router = APIRouter(dependencies=[Depends(get_db_session)])
 api_router.include_router(users.router)
 api_router.include_router(appointments.router)
 api_router.include_router(reviews.router)
@@ -20,3 +25,6 @@ api_router.include_router(images.router)
 api_router.include_router(applications.router)
 api_router.include_router(articles.router)
 api_router.include_router(news.router)
+api_router.include_router(statistics.router)
+if config.METRICS_ENABLED:
+    api_router.include_router(metrics.router)
@@ -1,5 +1,5 @@
 from uuid import UUID
-from fastapi import APIRouter, Query, Request, HTTPException, Depends
+from fastapi import APIRouter, Query, Request, Response, HTTPException, Depends
 from starlette.status import (
     HTTP_201_CREATED, HTTP_200_OK, HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
@@ -10,21 +10,29 @@ from psychohelp.config.logging import get_logger
 from psychohelp.services.applications.applications import (
     create_application,
     get_application_for_user,
+    get_application_history,
     accept_to_processing,
     offer_consultation,
     confirm_application,
     reject_application,
     cancel_application,
-    get_applications_list
+    get_applications_list,
+    get_application_summaries,
+    get_next_cursor as get_applications_next_cursor,
 )
 from psychohelp.services.applications.exceptions import (
     ApplicationNotFoundError, InvalidStatusTransitionError, AccessDeniedError,
     ConflictError, ValidationError
 )
 from psychohelp.repositories.applications import get_applications as repo_get_applications
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from psychohelp.schemas.applications import (
     ApplicationCreateRequest,
     ApplicationResponse,
+    ApplicationSummaryResponse,
+    ApplicationExpiryResponse,
+    ApplicationHistoryEntryResponse,
+    ApplicationSortField,
     ApplicationStatus,
     AcceptToProcessingRequest,
     OfferConsultationRequest,
@@ -32,11 +40,11 @@ from psychohelp.schemas.applications import (
     CancelRequest, UniversityStatus,
 )
 from psychohelp.services.rbac.permissions import require_permission
-from psychohelp.constants.rbac import PermissionCode
+from psychohelp.constants.rbac import PermissionCode, RoleCode
+from psychohelp.services.applications.expiry import application_expiry_job
 from psychohelp.repositories import get_user_id_from_token
-from psychohelp.dependencies.auth import get_current_user
-from psychohelp.models.users import User
-from psychohelp.repositories.users import get_user_by_id
+from psychohelp.dependencies.auth import get_current_principal
+from psychohelp.services.users.models import CurrentPrincipal
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/applications", tags=["applications"])
@@ -51,21 +59,13 @@ async def get_university_statuses() -> list[str]:
     return [status.value for status in UniversityStatus]
 
 
-# Вспомогательные функции проверки прав (можно вынести в отдельный модуль)
-async def _is_manager_or_psychologist(user_id: UUID) -> bool:
-    user = await get_user_by_id(user_id)
-    if not user:
-        return False
-    roles = [role.code.value for role in user.roles]
-    return "manager" in roles or "psychologist" in roles  # зависит от ваших кодов ролей
+# Вспомогательные функции проверки прав (роли берутся из access-токена)
+def _is_manager_or_psychologist(principal: CurrentPrincipal) -> bool:
+    return principal.has_any_role("manager", "psychologist")  # зависит от ваших кодов ролей
 
 
-async def _is_psychologist(user_id: UUID) -> bool:
-    user = await get_user_by_id(user_id)
-    if not user:
-        return False
-    roles = [role.code.value for role in user.roles]
-    return "psychologist" in roles
+def _is_psychologist(principal: CurrentPrincipal) -> bool:
+    return principal.has_role("psychologist")
 
 
 
@@ -79,7 +79,7 @@ async def create_application_endpoint(
     if token:
         user_id = get_user_id_from_token(token)
         application = await create_application(user_id, data)
-        logger.info(f"Application created: {application.id}")
+        logger.info("Application created: %s", application.id)
         return ApplicationResponse.from_orm(application)
     else:
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Недостаточно прав")
@@ -89,54 +89,128 @@ async def create_application_endpoint(
 @router.get("/", response_model=list[ApplicationResponse])
 async def get_applications(
     request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: Optional[ApplicationStatus] = None,
     assigned_to: Optional[UUID] = None,
-    sort_by: str = "created_at",
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
     sort_desc: bool = True,
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> list[ApplicationResponse]:
     
-    is_staff = await _is_manager_or_psychologist(current_user.id)
+    is_staff = _is_manager_or_psychologist(principal)
     
-    applications = await get_applications_list(
-        skip=skip, 
-        limit=limit, 
-        status=status,
-        assigned_to=assigned_to,
-        current_user_id=current_user.id,
-        is_manager_or_psychologist=is_staff,
-        sort_by=sort_by, 
-        sort_desc=sort_desc
-    )
+    try:
+        applications = await get_applications_list(
+            skip=skip, 
+            limit=limit, 
+            status=status,
+            assigned_to=assigned_to,
+            current_user_id=principal.user_id,
+            is_manager_or_psychologist=is_staff,
+            sort_by=sort_by, 
+            sort_desc=sort_desc,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = get_applications_next_cursor(applications, limit, sort_by, sort_desc)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [ApplicationResponse.from_orm(app) for app in applications]
 
 
+# 2.1. Краткий список заявок (одним запросом, без вложенных объектов)
+@router.get("/summary", response_model=list[ApplicationSummaryResponse])
+async def get_applications_summary(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[ApplicationStatus] = None,
+    assigned_to: Optional[UUID] = None,
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
+    sort_desc: bool = True,
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    principal: CurrentPrincipal = Depends(get_current_principal)
+) -> list[ApplicationSummaryResponse]:
+    try:
+        summaries = await get_application_summaries(
+            skip=skip,
+            limit=limit,
+            status=status,
+            assigned_to=assigned_to,
+            current_user_id=principal.user_id,
+            is_manager_or_psychologist=_is_manager_or_psychologist(principal),
+            sort_by=sort_by,
+            sort_desc=sort_desc,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = get_applications_next_cursor(summaries, limit, sort_by, sort_desc)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return [ApplicationSummaryResponse.model_validate(summary) for summary in summaries]
+
+
+# 2.2. Истечение просроченных заявок вручную (администратор), dry_run - только подсчет.
+# За запрос - одна пачка: сессия запроса общая для всех пачек, и их блокировки
+# держались бы до ответа; остальное доделает фоновая задача или повторный вызов (has_more)
+@router.post("/expire-stale", response_model=ApplicationExpiryResponse)
+async def expire_stale_applications_endpoint(
+    dry_run: bool = Query(True, description="Только посчитать, ничего не меняя"),
+    principal: CurrentPrincipal = Depends(get_current_principal)
+) -> ApplicationExpiryResponse:
+    if not principal.has_role(RoleCode.ADMIN):
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Только для администраторов")
+
+    result = await application_expiry_job.run_once(dry_run=dry_run, max_batches=1)
+    logger.info("Stale applications expiry by %s: dry_run=%s, %s", principal.user_id, dry_run, result.expired)
+    return ApplicationExpiryResponse.model_validate(result)
+
+
 # 3. Получение конкретной заявки (с проверкой прав)
 @router.get("/{application_id}", response_model=ApplicationResponse)
 async def get_application(
     request: Request,
     application_id: UUID,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
-    is_manager = await _is_manager_or_psychologist(current_user.id)
-    application = await get_application_for_user(application_id, current_user.id, is_manager)
+    is_manager = _is_manager_or_psychologist(principal)
+    application = await get_application_for_user(application_id, principal.user_id, is_manager)
     return ApplicationResponse.from_orm(application)
 
 
+# 3.1. История изменений статуса заявки (в буферном режиме аудита - с задержкой до сброса)
+@router.get("/{application_id}/history", response_model=list[ApplicationHistoryEntryResponse])
+async def get_application_history_endpoint(
+    application_id: UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    principal: CurrentPrincipal = Depends(get_current_principal)
+) -> list[ApplicationHistoryEntryResponse]:
+    is_manager = _is_manager_or_psychologist(principal)
+    history = await get_application_history(application_id, principal.user_id, is_manager, skip, limit)
+    return [ApplicationHistoryEntryResponse.model_validate(entry) for entry in history]
+
+
 # 4. Принять в обработку
 @router.post("/{application_id}/accept", response_model=ApplicationResponse)
 async def accept_application(
     application_id: UUID,
     data: AcceptToProcessingRequest,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
-    is_allowed = await _is_manager_or_psychologist(current_user.id)
+    is_allowed = _is_manager_or_psychologist(principal)
     try:
         updated = await accept_to_processing(
-            application_id, data.assigned_to, current_user.id, is_allowed
+            application_id, data.assigned_to, principal.user_id, is_allowed
         )
         return ApplicationResponse.from_orm(updated)
     except ApplicationNotFoundError:
@@ -156,11 +230,11 @@ async def accept_application(
 async def offer_consultation_endpoint(
     application_id: UUID,
     data: OfferConsultationRequest,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
-    is_psych = await _is_psychologist(current_user.id)
+    is_psych = _is_psychologist(principal)
     try:
-        updated = await offer_consultation(application_id, data, current_user.id, is_psych)
+        updated = await offer_consultation(application_id, data, principal.user_id, is_psych)
         return ApplicationResponse.from_orm(updated)
     except ApplicationNotFoundError:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Заявка не найдена")
@@ -179,19 +253,19 @@ async def offer_consultation_endpoint(
 async def confirm_application_endpoint(
     application_id: UUID,
     appointment_id: UUID | None = None, # Оставляем как опциональный Query-параметр
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
     
-    application = await get_application_for_user(application_id, current_user.id, False)
+    application = await get_application_for_user(application_id, principal.user_id, False)
     
-    if not application or application.user_id != current_user.id:
+    if not application or application.user_id != principal.user_id:
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Вы можете подтверждать только свои заявки")
         
     resolved_appointment_id = appointment_id or application.appointment_id
     
     try:
         updated = await confirm_application(
-            application_id, resolved_appointment_id, current_user.id, is_owner=True
+            application_id, resolved_appointment_id, principal.user_id, is_owner=True
         )
         return ApplicationResponse.from_orm(updated)
         
@@ -211,11 +285,11 @@ async def confirm_application_endpoint(
 async def reject_application_endpoint(
     application_id: UUID,
     data: RejectRequest,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
-    is_allowed = await _is_manager_or_psychologist(current_user.id)
+    is_allowed = _is_manager_or_psychologist(principal)
     try:
-        updated = await reject_application(application_id, data.reject_reason, current_user.id, is_allowed)
+        updated = await reject_application(application_id, data.reject_reason, principal.user_id, is_allowed)
         return ApplicationResponse.from_orm(updated)
     except ApplicationNotFoundError:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Заявка не найдена")
@@ -235,25 +309,25 @@ async def cancel_application_endpoint(
     application_id: UUID,
     data: CancelRequest,
     request: Request,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> ApplicationResponse:
     # Определяем тип актора и права
     actor_type = "user"
     is_allowed = False
-    if current_user.id:
-        is_owner = (await get_application_for_user(application_id, current_user.id, False)).user_id == current_user.id
+    if principal.user_id:
+        is_owner = (await get_application_for_user(application_id, principal.user_id, False)).user_id == principal.user_id
         if is_owner:
             is_allowed = True
             actor_type = "user"
-        elif await _is_manager_or_psychologist(current_user.id):
+        elif _is_manager_or_psychologist(principal):
             is_allowed = True
-            actor_type = "psychologist" if await _is_psychologist(current_user.id) else "manager"
+            actor_type = "psychologist" if _is_psychologist(principal) else "manager"
     if not is_allowed:
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Недостаточно прав для отмены")
     try:
         updated = await cancel_application(
             application_id, data.cancel_reason, data.cancel_initiator,
-            current_user.id, actor_type, is_allowed
+            principal.user_id, actor_type, is_allowed
         )
         return ApplicationResponse.from_orm(updated)
     except ApplicationNotFoundError:
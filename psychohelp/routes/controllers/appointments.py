@@ -1,14 +1,16 @@
-from fastapi import HTTPException, APIRouter, Response, Request, Depends
+from fastapi import HTTPException, APIRouter, Response, Request, Depends, Query
 from starlette.status import (
     HTTP_200_OK,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
     HTTP_422_UNPROCESSABLE_ENTITY,
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 
+from datetime import datetime
 from uuid import UUID
 from psychohelp.config.logging import get_logger
 from psychohelp.services.appointments.appointments import (
@@ -22,8 +24,9 @@ from psychohelp.schemas.appointments import AppointmentBase, AppointmentCreateRe
     AppointmentDoneRequest
 from psychohelp.services.rbac.permissions import require_permission
 from psychohelp.constants.rbac import PermissionCode
-from psychohelp.dependencies.auth import get_current_user, get_optional_user
-from psychohelp.models.users import User
+from psychohelp.dependencies.auth import get_current_principal, get_optional_principal
+from psychohelp.services.users.models import CurrentPrincipal
+from psychohelp.models.appointments import AppointmentStatus
 from psychohelp.services.appointments.appointments import complete_appointment
 
 logger = get_logger(__name__)
@@ -33,94 +36,107 @@ router = APIRouter(prefix="/appointments", tags=["appointments"])
 @router.get("/", response_model=list[AppointmentBase])
 async def get_appointments(
     user_id: UUID | None = None,
-    current_user: User = Depends(get_optional_user)
+    date_from: datetime | None = Query(None, description="Начало периода (включительно)"),
+    date_to: datetime | None = Query(None, description="Конец периода (не включительно)"),
+    status: AppointmentStatus | None = Query(None, description="Фильтр по статусу"),
+    skip: int = Query(0, ge=0),
+    take: int | None = Query(None, ge=1, le=500, description="Размер страницы; без take - все записи"),
+    principal: CurrentPrincipal | None = Depends(get_optional_principal)
 ) -> list[AppointmentBase]:
     """Получить список записей на прием"""
+    filters = dict(date_from=date_from, date_to=date_to, status=status, skip=skip, take=take)
     if user_id is None:
-        if current_user is None:
+        if principal is None:
             logger.warning("Unauthorized appointments access attempt")
             raise HTTPException(
                 HTTP_401_UNAUTHORIZED, detail="Пользователь не авторизован"
             )
-        logger.info(f"Fetching appointments for current user: {current_user.id}")
-        return await get_appointments_by_user_id(current_user.id)
+        logger.info("Fetching appointments for current user: %s", principal.user_id)
+        return await get_appointments_by_user_id(principal.user_id, **filters)
 
-    if current_user is None:
-        logger.warning(f"Unauthorized access attempt to user {user_id} appointments")
+    if principal is None:
+        logger.warning("Unauthorized access attempt to user %s appointments", user_id)
         raise HTTPException(
             HTTP_401_UNAUTHORIZED, detail="Пользователь не авторизован"
         )
     
-    if current_user.id != user_id and not getattr(current_user, 'is_admin', False):
-        logger.warning(f"Access denied to user {user_id} appointments by user {current_user.id}")
+    if principal.user_id != user_id and not getattr(principal, 'is_admin', False):
+        logger.warning("Access denied to user %s appointments by user %s", user_id, principal.user_id)
         raise HTTPException(
             HTTP_403_FORBIDDEN, detail="Недостаточно прав для просмотра записей другого пользователя"
         )
 
-    logger.info(f"Fetching appointments for user: {user_id}")
-    return await get_appointments_by_user_id(user_id)
+    logger.info("Fetching appointments for user: %s", user_id)
+    return await get_appointments_by_user_id(user_id, **filters)
 
 
 @router.post("/create", response_model=AppointmentBase)
 @require_permission(PermissionCode.APPOINTMENTS_CREATE_OWN)
 async def create_appointment(
     appointment: AppointmentCreateRequest,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> AppointmentBase:
     """Создать новую запись на прием к психологу"""
     try:
-        if appointment.patient_id != current_user.id:
+        if appointment.patient_id != principal.user_id:
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
                 detail="Вы можете создавать записи только для себя"
             )
 
         created_appointment = await srv_create_appointment(**appointment.model_dump())
-        logger.info(f"Appointment created: {created_appointment.id} by user: {current_user.id}")
+        logger.info("Appointment created: %s by user: %s", created_appointment.id, principal.user_id)
         return created_appointment
     
     except exc.InvalidScheduledTimeException as e:
-        logger.error(f"Invalid scheduled time: {e.scheduled_time}")
+        logger.error("Invalid scheduled time: %s", e.scheduled_time)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
             detail="Время записи не может быть в прошлом"
         )
     
     except exc.InvalidRemindTimeException as e:
-        logger.error(f"Invalid remind time: {e.remind_time}, reason: {e.reason}")
+        logger.error("Invalid remind time: %s, reason: %s", e.remind_time, e.reason)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
             detail=f"Некорректное время напоминания: {e.reason}"
         )
     
     except exc.PatientNotFoundException as e:
-        logger.error(f"Patient not found: {e.patient_id}")
+        logger.error("Patient not found: %s", e.patient_id)
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail="Пациент не найден"
         )
 
     except exc.ApplicationNotFoundException as e:
-        logger.error(f"Application not found: {e.application_id}")
+        logger.error("Application not found: %s", e.application_id)
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail="Заявка не найдена"
         )
 
     except exc.PsychologistNotFoundException as e:
-        logger.error(f"Psychologist not found: {e.psychologist_id}")
+        logger.error("Psychologist not found: %s", e.psychologist_id)
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail="Психолог не найден"
         )
     
     except exc.PsychologistNotFoundException as e:
-        logger.error(f"User does not have psychologist role: {e.user_id}")
+        logger.error("User does not have psychologist role: %s", e.user_id)
         raise HTTPException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Указанный пользователь не является психологом"
         )
     
+    except exc.AppointmentSlotTakenException as e:
+        logger.warning("Appointment slot already taken: %s", e.scheduled_time)
+        raise HTTPException(
+            status_code=HTTP_409_CONFLICT,
+            detail="Это время у психолога уже занято"
+        )
+
     except exc.VenueRequiredException:
         logger.error("Venue required for online appointment")
         raise HTTPException(
@@ -140,15 +156,15 @@ async def create_appointment(
 @require_permission(PermissionCode.APPOINTMENTS_VIEW_OWN)
 async def get_appointment(
     id: UUID,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> AppointmentBase:
     """Получить информацию о конкретной записи"""
-    appointment = await get_appointment_by_id(id, current_user.id)
+    appointment = await get_appointment_by_id(id, principal.user_id)
     if appointment is None:
-        logger.warning(f"Appointment not found or access denied: {id} for user: {current_user.id}")
+        logger.warning("Appointment not found or access denied: %s for user: %s", id, principal.user_id)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Встреча не найдена")
     
-    logger.info(f"Appointment retrieved: {id} by user: {current_user.id}")
+    logger.info("Appointment retrieved: %s by user: %s", id, principal.user_id)
     return appointment
 
 
@@ -157,22 +173,22 @@ async def get_appointment(
 async def cancel_appointment(
     id: UUID,
     request: AppointmentCancelRequest,
-    current_user: User = Depends(get_current_user)
+    principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> Response:
     """Отменить запись на прием (для пациента)"""
     try:
-        await cancel_appointment_by_member(id, current_user.id, request.cancel_reason)
-        logger.info(f"Appointment cancelled: {id} by user: {current_user.id}. Reason: {request.cancel_reason}")
+        await cancel_appointment_by_member(id, principal.user_id, request.cancel_reason)
+        logger.info("Appointment cancelled: %s by user: %s. Reason: %s", id, principal.user_id, request.cancel_reason)
         return Response(None, status_code=HTTP_200_OK)
     except ValueError as e:
-        logger.error(f"Appointment cancellation failed: {str(e)}")
+        logger.error("Appointment cancellation failed: %s", e)
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.put("/{id}/done", summary="Завершить прием и написать заключение")
 async def complete_appointment_endpoint(
         id: UUID,
         request: AppointmentDoneRequest,
-        current_user: User = Depends(get_current_user)
+        principal: CurrentPrincipal = Depends(get_current_principal)
 ) -> Response:
     """
      Завершает запись на прием (переводит в статус Done).
@@ -180,15 +196,15 @@ async def complete_appointment_endpoint(
      Требует обязательного заключения (conclusion).
      """
     try:
-        await complete_appointment(id, current_user.id, request.conclusion)
-        logger.info(f"Appointment completed: {id} by psychologist: {current_user.id}")
+        await complete_appointment(id, principal.user_id, request.conclusion)
+        logger.info("Appointment completed: %s by psychologist: %s", id, principal.user_id)
         return Response(None, status_code=HTTP_200_OK)
 
     except PermissionError as e:
         # Ловим попытку чужого психолога закрыть заявку
-        logger.warning(f"Security warning: User {current_user.id} tried to complete appointment {id}")
+        logger.warning("Security warning: User %s tried to complete appointment %s", principal.user_id, id)
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=str(e))
 
     except ValueError as e:
-        logger.error(f"Appointment completion failed: {str(e)}")
+        logger.error("Appointment completion failed: %s", e)
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
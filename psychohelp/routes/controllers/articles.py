@@ -1,15 +1,17 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from starlette.status import HTTP_201_CREATED, HTTP_404_NOT_FOUND
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 
 from psychohelp.config.logging import get_logger
 from psychohelp.constants.rbac import PermissionCode
 from psychohelp.dependencies.auth import get_current_user
 from psychohelp.models.users import User
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from psychohelp.schemas.articles import (
     ArticleCreateRequest,
     ArticleResponse,
+    ArticleSearchResult,
     ArticleUpdateRequest,
 )
 from psychohelp.services import articles as articles_service
@@ -22,13 +24,40 @@ router = APIRouter(prefix="/articles", tags=["articles"])
 
 @router.get("/", response_model=list[ArticleResponse])
 async def get_articles(
+    response: Response,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     take: int = Query(100, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
 ) -> list[ArticleResponse]:
-    articles = await articles_service.get_articles(skip=skip, take=take)
+    try:
+        articles = await articles_service.get_articles(skip=skip, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = articles_service.get_next_cursor(articles, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return articles
 
 
+@router.get("/search", response_model=list[ArticleSearchResult])
+async def search_articles(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Поисковый запрос"),
+    take: int = Query(20, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+) -> list[ArticleSearchResult]:
+    try:
+        rows = await articles_service.search_articles(q, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = articles_service.get_search_next_cursor(rows, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(article_id: UUID) -> ArticleResponse:
     article = await articles_service.get_article_by_id(article_id)
@@ -44,7 +73,7 @@ async def create_article(
     current_user: User = Depends(get_current_user),
 ) -> ArticleResponse:
     article = await articles_service.create_article(data.model_dump())
-    logger.info(f"Article created: {article.id}")
+    logger.info("Article created: %s", article.id)
     return article
 
 
@@ -58,7 +87,7 @@ async def update_article(
     article = await articles_service.update_article(article_id, data.model_dump())
     if article is None:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Статья не найдена")
-    logger.info(f"Article updated: {article_id}")
+    logger.info("Article updated: %s", article_id)
     return article
 
 
@@ -71,5 +100,5 @@ async def delete_article(
     deleted = await articles_service.delete_article(article_id)
     if not deleted:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Статья не найдена")
-    logger.info(f"Article deleted: {article_id}")
+    logger.info("Article deleted: %s", article_id)
     return {"message": "Статья успешно удалена"}
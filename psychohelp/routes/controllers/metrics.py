@@ -0,0 +1,83 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from psychohelp.config.config import async_engine, pool_metrics
+from psychohelp.services.applications.expiry import application_expiry_job
+from psychohelp.services.appointments.reminders import reminder_scheduler
+from psychohelp.services.audit import audit_writer
+from psychohelp.services.cache import get_response_cache
+from psychohelp.services.email_outbox import email_outbox_dispatcher
+from psychohelp.services.metrics import CollectedMetric, registry
+from psychohelp.services.statistics import statistics_refresher
+from psychohelp.services.users.passwords import password_hasher
+
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _gauge(name: str, help: str, value: float, **labels: str) -> CollectedMetric:
+    return CollectedMetric(name, "gauge", help, [(labels, value)])
+
+
+def _counter(name: str, help: str, value: float, **labels: str) -> CollectedMetric:
+    return CollectedMetric(name, "counter", help, [(labels, value)])
+
+
+@registry.collector
+def _collect_pool():
+    pool = pool_metrics.snapshot(async_engine)
+    return [
+        _gauge("db_pool_size", "Постоянный размер пула соединений", pool["pool_size"]),
+        _gauge("db_pool_checked_out", "Выданные соединения", pool["checked_out"]),
+        _gauge("db_pool_overflow", "Соединения сверх pool_size (отрицательное - еще не открыты)", pool["overflow"]),
+        _counter("db_pool_checkouts_total", "Выдачи соединений из пула", pool["checkouts"]),
+        _counter("db_pool_timeouts_total", "Таймауты ожидания соединения", pool["timeouts"]),
+        _counter("db_pool_invalidations_total", "Инвалидированные соединения", pool["invalidations"]),
+        _counter("db_pool_wait_seconds_total", "Суммарное ожидание соединения", pool["wait_seconds_total"]),
+        _gauge("db_pool_wait_seconds_max", "Максимальное ожидание соединения", pool["wait_seconds_max"]),
+    ]
+
+
+@registry.collector
+def _collect_background():
+    hasher = password_hasher.snapshot()
+    expiry = application_expiry_job.snapshot()
+    audit = audit_writer.snapshot()
+    statistics = statistics_refresher.snapshot()
+    collected = [
+        _gauge("password_hash_in_flight", "Хеширования паролей в работе", hasher["in_flight"]),
+        _gauge("password_hash_queue_depth", "Хеширования паролей в очереди", hasher["queue_depth"]),
+        _counter("password_hash_rejected_total", "Отклоненные из-за перегрузки хеширования", hasher["rejected"]),
+        _counter("password_hash_failed_total", "Хеширования паролей, завершившиеся ошибкой", hasher["failed"]),
+        _counter(
+            "password_hash_wait_seconds_total", "Ожидание свободного воркера хеширования", hasher["wait_seconds_total"]
+        ),
+        CollectedMetric("email_outbox_emails_total", "counter", "Исход отправки писем из outbox", [
+            ({"result": "sent"}, email_outbox_dispatcher.sent),
+            ({"result": "failed"}, email_outbox_dispatcher.failed),
+            ({"result": "dead"}, email_outbox_dispatcher.dead),
+        ]),
+        _counter("email_outbox_purged_total", "Удаленные по сроку хранения письма outbox", email_outbox_dispatcher.purged),
+        _gauge("reminders_loaded", "Напоминания, загруженные в планировщик", len(reminder_scheduler)),
+        _counter("reminders_sent_total", "Отправленные напоминания", reminder_scheduler.sent),
+        CollectedMetric("applications_expired_total", "counter", "Истекшие заявки по прежнему статусу", [
+            ({"status": status}, count) for status, count in expiry["expired_total"].items()
+        ]),
+        _counter("application_expiry_failures_total", "Сбои задачи истечения заявок", expiry["failures"]),
+        _gauge("audit_buffer_pending", "Записи аудита, ожидающие записи в БД", audit["pending"]),
+        _counter("audit_entries_dropped_total", "Отброшенные при переполнении записи аудита", audit["dropped"]),
+        _counter("statistics_refreshes_total", "Пересчеты представлений статистики", statistics["refreshes"]),
+        _counter("statistics_refresh_failures_total", "Сбои пересчета статистики", statistics["failures"]),
+    ]
+    cache = get_response_cache()
+    # Внешний бэкенд кэша может не знать своего размера
+    if hasattr(cache, "__len__"):
+        collected.append(_gauge("http_cache_entries", "Записи в кэше HTTP-ответов", len(cache)))
+    return collected
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
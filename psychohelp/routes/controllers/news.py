@@ -1,30 +1,28 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from starlette.status import HTTP_201_CREATED, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
 
 from psychohelp.config.logging import get_logger
 from psychohelp.constants.rbac import RoleCode
-from psychohelp.dependencies.auth import get_current_user
-from psychohelp.models.users import User
+from psychohelp.dependencies.auth import get_current_principal
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from psychohelp.schemas.news import (
     NewsCreateRequest,
     NewsResponse,
+    NewsSearchResult,
     NewsUpdateRequest,
 )
 from psychohelp.services import news as news_service
+from psychohelp.services.users.models import CurrentPrincipal
 
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/news", tags=["news"])
 
 
-def _ensure_admin(user: User) -> None:
-    role_codes = {
-        getattr(getattr(role, "code", role), "value", getattr(role, "code", role))
-        for role in (user.roles or [])
-    }
-    if RoleCode.ADMIN.value not in role_codes:
+def _ensure_admin(principal: CurrentPrincipal) -> None:
+    if not principal.has_role(RoleCode.ADMIN):
         raise HTTPException(
             status_code=HTTP_403_FORBIDDEN,
             detail="Доступ запрещен. Только для администраторов.",
@@ -33,13 +31,40 @@ def _ensure_admin(user: User) -> None:
 
 @router.get("/", response_model=list[NewsResponse])
 async def get_news_list(
+    response: Response,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     take: int = Query(100, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
 ) -> list[NewsResponse]:
-    news_list = await news_service.get_news_list(skip=skip, take=take)
+    try:
+        news_list = await news_service.get_news_list(skip=skip, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = news_service.get_next_cursor(news_list, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return news_list
 
 
+@router.get("/search", response_model=list[NewsSearchResult])
+async def search_news(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Поисковый запрос"),
+    take: int = Query(20, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+) -> list[NewsSearchResult]:
+    try:
+        rows = await news_service.search_news(q, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = news_service.get_search_next_cursor(rows, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
 @router.get("/{news_id}", response_model=NewsResponse)
 async def get_news(news_id: UUID) -> NewsResponse:
     news_item = await news_service.get_news_by_id(news_id)
@@ -51,11 +76,11 @@ async def get_news(news_id: UUID) -> NewsResponse:
 @router.post("/", response_model=NewsResponse, status_code=HTTP_201_CREATED)
 async def create_news(
     data: NewsCreateRequest,
-    current_user: User = Depends(get_current_user),
+    principal: CurrentPrincipal = Depends(get_current_principal),
 ) -> NewsResponse:
-    _ensure_admin(current_user)
+    _ensure_admin(principal)
     news_item = await news_service.create_news(data.model_dump())
-    logger.info(f"News created: {news_item.id}")
+    logger.info("News created: %s", news_item.id)
     return news_item
 
 
@@ -63,24 +88,24 @@ async def create_news(
 async def update_news(
     news_id: UUID,
     data: NewsUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    principal: CurrentPrincipal = Depends(get_current_principal),
 ) -> NewsResponse:
-    _ensure_admin(current_user)
+    _ensure_admin(principal)
     news_item = await news_service.update_news(news_id, data.model_dump())
     if news_item is None:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Новость не найдена")
-    logger.info(f"News updated: {news_id}")
+    logger.info("News updated: %s", news_id)
     return news_item
 
 
 @router.delete("/{news_id}")
 async def delete_news(
     news_id: UUID,
-    current_user: User = Depends(get_current_user),
+    principal: CurrentPrincipal = Depends(get_current_principal),
 ) -> dict[str, str]:
-    _ensure_admin(current_user)
+    _ensure_admin(principal)
     deleted = await news_service.delete_news(news_id)
     if not deleted:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Новость не найдена")
-    logger.info(f"News deleted: {news_id}")
+    logger.info("News deleted: %s", news_id)
     return {"message": "Новость успешно удалена"}
\ No newline at end of file
@@ -10,7 +10,7 @@ from starlette.status import (
 )
 
 from psychohelp.config.logging import get_logger
-from psychohelp.repositories.rbac.rbac import (
+from psychohelp.services.rbac.roles import (
     assign_role_to_user,
     remove_role_from_user,
 )
@@ -21,48 +21,45 @@ from psychohelp.repositories.rbac.exceptions import (
 from psychohelp.schemas.roles import RoleAssignRequest, RoleRemoveRequest
 
 from psychohelp.constants.rbac import RoleCode
-from psychohelp.repositories import get_user_id_from_token
-from psychohelp.services.users import users
+from psychohelp.dependencies.auth import get_request_identity
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/roles", tags=["roles"])
 
 
-def _has_role(user, role_code: RoleCode) -> bool:
-    return any(role.code == role_code for role in (user.roles or []))
-
-
-@router.post("/{user_id}/assign")
-async def assign_role(request: Request, user_id: UUID, role_request: RoleAssignRequest) -> dict[str, str]:
-    """Назначить роль пользователю"""
+async def _ensure_admin(request: Request) -> None:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Не авторизован")
 
-    try:
-        current_user_id = get_user_id_from_token(token)
-    except Exception:
+    identity = await get_request_identity(request)
+    if identity is None:
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Недействительный токен")
 
-    current_user = await users.get_user_by_id(current_user_id)
-    if not current_user or not _has_role(current_user, RoleCode.ADMIN):
+    if not identity.principal.has_role(RoleCode.ADMIN):
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Только для администраторов")
 
+
+@router.post("/{user_id}/assign")
+async def assign_role(request: Request, user_id: UUID, role_request: RoleAssignRequest) -> dict[str, str]:
+    """Назначить роль пользователю"""
+    await _ensure_admin(request)
+
     try:
         assigned = await assign_role_to_user(user_id, role_request.role_code)
         if not assigned:
-            logger.info(f"Role '{role_request.role_code.value}' already assigned to user {user_id}")
+            logger.info("Role '%s' already assigned to user %s", role_request.role_code.value, user_id)
             return {"message": f"Роль '{role_request.role_code.value}' уже назначена пользователю"}
-        logger.info(f"Role '{role_request.role_code.value}' successfully assigned to user {user_id}")
+        logger.info("Role '%s' successfully assigned to user %s", role_request.role_code.value, user_id)
         return {"message": f"Роль '{role_request.role_code.value}' успешно назначена"}
 
     except (UserNotFoundException, RoleNotFoundException) as e:
-        logger.warning(f"Failed to assign role: {str(e)}")
+        logger.warning("Failed to assign role: %s", e)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
 
     except Exception as e:
         logger.exception(
-            f"Unexpected error assigning role '{role_request.role_code.value}' to user {user_id}: {str(e)}")
+            "Unexpected error assigning role '%s' to user %s: %s", role_request.role_code.value, user_id, e)
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Не удалось назначить роль"
@@ -72,35 +69,23 @@ async def assign_role(request: Request, user_id: UUID, role_request: RoleAssignR
 @router.post("/{user_id}/remove")
 async def remove_role(request: Request, user_id: UUID, role_request: RoleRemoveRequest) -> dict[str, str]:
     """Убрать роль у пользователя"""
-
-    token = request.cookies.get("access_token")
-    if not token:
-        raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Не авторизован")
-
-    try:
-        current_user_id = get_user_id_from_token(token)
-    except Exception:
-        raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Недействительный токен")
-
-    current_user = await users.get_user_by_id(current_user_id)
-    if not current_user or not _has_role(current_user, RoleCode.ADMIN):
-        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Только для администраторов")
+    await _ensure_admin(request)
 
     try:
         removed = await remove_role_from_user(user_id, role_request.role_code)
         if not removed:
-            logger.info(f"Role '{role_request.role_code.value}' was not assigned to user {user_id}")
+            logger.info("Role '%s' was not assigned to user %s", role_request.role_code.value, user_id)
             return {"message": f"Роль '{role_request.role_code.value}' не была назначена пользователю"}
-        logger.info(f"Role '{role_request.role_code.value}' successfully removed from user {user_id}")
+        logger.info("Role '%s' successfully removed from user %s", role_request.role_code.value, user_id)
         return {"message": f"Роль '{role_request.role_code.value}' успешно удалена"}
 
     except UserNotFoundException as e:
-        logger.warning(f"Failed to remove role: {str(e)}")
+        logger.warning("Failed to remove role: %s", e)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
 
     except Exception as e:
         logger.exception(
-            f"Unexpected error removing role '{role_request.role_code.value}' from user {user_id}: {str(e)}")
+            "Unexpected error removing role '%s' from user %s: %s", role_request.role_code.value, user_id, e)
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Не удалось удалить роль"
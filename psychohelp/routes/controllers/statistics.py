@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from psychohelp.constants.rbac import PermissionCode
+from psychohelp.dependencies.auth import get_current_principal
+from psychohelp.schemas.statistics import ApplicationStatisticsResponse, PsychologistLoadResponse
+from psychohelp.services import statistics as statistics_service
+from psychohelp.services.rbac.permissions import require_permission
+from psychohelp.services.users.models import CurrentPrincipal
+
+
+router = APIRouter(prefix="/statistics", tags=["statistics"])
+
+MAX_LOAD_RANGE = timedelta(days=366)
+DEFAULT_LOAD_RANGE = timedelta(weeks=12)
+
+
+@router.get("/applications", response_model=ApplicationStatisticsResponse)
+@require_permission(PermissionCode.STATISTICS_VIEW)
+async def get_application_statistics(
+    request: Request,
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> ApplicationStatisticsResponse:
+    """Заявки по статусам, доля отмен и медианы сроков обработки"""
+    return await statistics_service.get_application_statistics()
+
+
+@router.get("/psychologists/load", response_model=PsychologistLoadResponse)
+@require_permission(PermissionCode.STATISTICS_VIEW)
+async def get_psychologist_load(
+    request: Request,
+    date_from: date | None = Query(None, alias="from", description="Начало периода (по умолчанию 12 недель назад)"),
+    date_to: date | None = Query(None, alias="to", description="Конец периода (по умолчанию сегодня)"),
+    psychologist_id: UUID | None = Query(None),
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> PsychologistLoadResponse:
+    """Встречи психологов по неделям и доля отмененных"""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - DEFAULT_LOAD_RANGE
+    if date_from > date_to or date_to - date_from > MAX_LOAD_RANGE:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"Период должен быть непустым и не длиннее {MAX_LOAD_RANGE.days} дней",
+        )
+    return await statistics_service.get_psychologist_load(date_from, date_to, psychologist_id)
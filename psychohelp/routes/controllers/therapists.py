@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import HTTPException, APIRouter, Query, Request, Depends
+from fastapi import HTTPException, APIRouter, Query, Request, Response, Depends
 from starlette.status import (
     HTTP_201_CREATED,
     HTTP_400_BAD_REQUEST,
@@ -13,6 +14,8 @@ from psychohelp.config.logging import get_logger
 from psychohelp.services.psychologists import (
     get_psychologist_by_id,
     get_psychologists as srv_get_psychologists,
+    get_next_cursor as srv_get_next_cursor,
+    get_directory as srv_get_directory,
     create_psychologist,
     delete_psychologist,
 )
@@ -21,38 +24,163 @@ from psychohelp.repositories.psychologists.exceptions import (
     PsychologistRoleNotFoundException,
     PsychologistAlreadyExistsException,
 )
-from psychohelp.schemas.psychologists import PsychologistResponse, PsychologistCreateRequest
-from psychohelp.services.rbac.permissions import require_permission, user_has_permission
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from psychohelp.repositories.psychologists.directory import DirectoryFilters
+from psychohelp.schemas.psychologists import (
+    FacetValue,
+    PsychologistCreateRequest,
+    PsychologistDirectoryFacets,
+    PsychologistDirectoryItem,
+    PsychologistDirectoryResponse,
+    PsychologistResponse,
+)
+from psychohelp.schemas.schedule import (
+    PsychologistSlotsResponse,
+    SlotResponse,
+    WorkingHoursItem,
+    WorkingHoursRequest,
+)
+from psychohelp.services.schedule.exceptions import InvalidSlotRangeException
+from psychohelp.services.schedule.schedule import get_free_slots, get_working_hours, set_working_hours
+from psychohelp.services.rbac.permissions import require_permission
 from psychohelp.constants.rbac import PermissionCode, RoleCode
-from psychohelp.dependencies.auth import get_current_user
-from psychohelp.models.users import User
+from psychohelp.dependencies.auth import get_current_principal
+from psychohelp.services.users.models import CurrentPrincipal
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/therapists", tags=["therapists"])
 
 
+@router.get("/slots", response_model=list[PsychologistSlotsResponse])
+async def get_all_slots(
+    date_from: datetime = Query(alias="from", description="Начало периода"),
+    date_to: datetime = Query(alias="to", description="Конец периода"),
+) -> list[PsychologistSlotsResponse]:
+    """Свободные слоты всех психологов с заданным расписанием"""
+    try:
+        slots = await get_free_slots(date_from, date_to)
+    except InvalidSlotRangeException as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return [
+        PsychologistSlotsResponse(
+            psychologist_id=psychologist_id,
+            slots=[SlotResponse.model_validate(slot) for slot in psychologist_slots],
+        )
+        for psychologist_id, psychologist_slots in slots.items()
+    ]
+
+
+@router.get("/directory", response_model=PsychologistDirectoryResponse)
+async def get_psychologist_directory(
+    response: Response,
+    area: list[str] = Query([], description="Направления консультирования (любое из)"),
+    office: list[str] = Query([], description="Кабинеты/кампусы (любой из)"),
+    qualification: list[str] = Query([], description="Квалификации (любая из)"),
+    q: str | None = Query(None, min_length=2, max_length=100, description="Поиск по ФИО"),
+    take: int = Query(20, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+) -> PsychologistDirectoryResponse:
+    """Каталог психологов с фильтрами и счетчиками по фасетам"""
+    filters = DirectoryFilters(
+        consult_areas=tuple(area), offices=tuple(office), qualifications=tuple(qualification), name=q
+    )
+    try:
+        psychologists, facets = await srv_get_directory(filters, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = srv_get_next_cursor(psychologists, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return PsychologistDirectoryResponse(
+        items=[PsychologistDirectoryItem.from_orm_psychologist(p) for p in psychologists],
+        facets=PsychologistDirectoryFacets(**{
+            facet: [FacetValue(value=value, count=count) for value, count in values]
+            for facet, values in facets.items()
+        }),
+    )
+
+
 @router.get("/{psychologist_id}", response_model=PsychologistResponse)
 async def get_psychologist(psychologist_id: UUID) -> PsychologistResponse:
     """Получить информацию о конкретном психологе по ID"""
     psychologist = await get_psychologist_by_id(psychologist_id)
     if psychologist is None:
-        logger.warning(f"Psychologist not found: {psychologist_id}")
+        logger.warning("Psychologist not found: %s", psychologist_id)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Psychologist not found")
     
-    logger.info(f"Psychologist retrieved: {psychologist_id}")
+    logger.info("Psychologist retrieved: %s", psychologist_id)
     return PsychologistResponse.from_orm_psychologist(psychologist)
 
 
+@router.get("/{psychologist_id}/slots", response_model=list[SlotResponse])
+async def get_psychologist_slots(
+    psychologist_id: UUID,
+    date_from: datetime = Query(alias="from", description="Начало периода"),
+    date_to: datetime = Query(alias="to", description="Конец периода"),
+) -> list[SlotResponse]:
+    """Свободные слоты психолога в периоде [from, to)"""
+    try:
+        slots = await get_free_slots(date_from, date_to, psychologist_id)
+    except InvalidSlotRangeException as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return [SlotResponse.model_validate(slot) for slot in slots.get(psychologist_id, [])]
+
+
+@router.get("/{psychologist_id}/working-hours", response_model=list[WorkingHoursItem])
+async def get_psychologist_working_hours(psychologist_id: UUID) -> list[WorkingHoursItem]:
+    """Шаблон рабочих часов психолога"""
+    return await get_working_hours(psychologist_id)
+
+
+@router.put("/{psychologist_id}/working-hours", response_model=list[WorkingHoursItem])
+async def set_psychologist_working_hours(
+    psychologist_id: UUID,
+    data: WorkingHoursRequest,
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> list[WorkingHoursItem]:
+    """Заменить шаблон рабочих часов (сам психолог или администратор)"""
+    psychologist = await get_psychologist_by_id(psychologist_id)
+    if psychologist is None:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Psychologist not found")
+
+    if psychologist.user_id != principal.user_id and not await principal.has_permission(
+        PermissionCode.PSYCHOLOGISTS_MANAGE
+    ):
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN,
+            detail=f"Недостаточно прав: требуется {PermissionCode.PSYCHOLOGISTS_MANAGE.value}",
+        )
+
+    working_hours = await set_working_hours(
+        psychologist_id, [item.model_dump() for item in data.items]
+    )
+    logger.info("Working hours updated for psychologist: %s", psychologist_id)
+    return working_hours
+
+
 @router.get("/", response_model=list[PsychologistResponse])
 async def get_psychologists(
+    response: Response,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
-    take: int = Query(10, gt=0, le=100, description="Количество записей для получения")
+    take: int = Query(10, gt=0, le=100, description="Количество записей для получения"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
 ) -> list[PsychologistResponse]:
     """Получить список всех психологов с пагинацией"""
-    logger.info(f"Fetching psychologists: skip={skip}, take={take}")
-    psychologists = await srv_get_psychologists(skip=skip, take=take)
+    logger.info("Fetching psychologists: skip=%s, take=%s", skip, take)
+    try:
+        psychologists = await srv_get_psychologists(skip=skip, take=take, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = srv_get_next_cursor(psychologists, take)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    logger.info(f"Retrieved {len(psychologists)} psychologists")
+    logger.info("Retrieved %s psychologists", len(psychologists))
     return [PsychologistResponse.from_orm_psychologist(p) for p in psychologists]
 
 
@@ -60,17 +188,14 @@ async def get_psychologists(
 async def create_psychologist_endpoint(
     request: Request,
     data: PsychologistCreateRequest,
-    current_user: User = Depends(get_current_user),
+    principal: CurrentPrincipal = Depends(get_current_principal),
 ) -> PsychologistResponse:
     try:
-        role_codes = {role.code for role in current_user.roles}
-        is_manage_allowed = await user_has_permission(
-            current_user.id, PermissionCode.PSYCHOLOGISTS_MANAGE
-        )
-        is_psychologist = RoleCode.PSYCHOLOGIST in role_codes
+        is_manage_allowed = await principal.has_permission(PermissionCode.PSYCHOLOGISTS_MANAGE)
+        is_psychologist = principal.has_role(RoleCode.PSYCHOLOGIST)
 
         if not is_manage_allowed:
-            if not is_psychologist or data.user_id != current_user.id:
+            if not is_psychologist or data.user_id != principal.user_id:
                 raise HTTPException(
                     status_code=HTTP_403_FORBIDDEN,
                     detail=f"Недостаточно прав: требуется {PermissionCode.PSYCHOLOGISTS_MANAGE.value}",
@@ -78,11 +203,11 @@ async def create_psychologist_endpoint(
 
         psychologist_data = data.model_dump(exclude={"user_id"})
         psychologist = await create_psychologist(data.user_id, psychologist_data)
-        logger.info(f"Psychologist created: {psychologist.id} for user {data.user_id}")
+        logger.info("Psychologist created: %s for user %s", psychologist.id, data.user_id)
         return PsychologistResponse.from_orm_psychologist(psychologist)
     
     except UserNotFoundForPsychologistException as e:
-        logger.error(f"User not found: {data.user_id}")
+        logger.error("User not found: %s", data.user_id)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
     
     except PsychologistRoleNotFoundException as e:
@@ -90,7 +215,7 @@ async def create_psychologist_endpoint(
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     
     except PsychologistAlreadyExistsException as e:
-        logger.warning(f"Psychologist already exists for user: {data.user_id}")
+        logger.warning("Psychologist already exists for user: %s", data.user_id)
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
 
 
@@ -99,9 +224,9 @@ async def create_psychologist_endpoint(
 async def delete_psychologist_endpoint(request: Request, psychologist_id: UUID) -> dict[str, str]:
     deleted = await delete_psychologist(psychologist_id)
     if not deleted:
-        logger.warning(f"Psychologist not found for deletion: {psychologist_id}")
+        logger.warning("Psychologist not found for deletion: %s", psychologist_id)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Psychologist not found")
     
-    logger.info(f"Psychologist deleted: {psychologist_id}")
+    logger.info("Psychologist deleted: %s", psychologist_id)
     return {"message": "Psychologist successfully deleted"}
 
@@ -26,7 +26,6 @@ from . import set_token_in_cookie, set_refresh_token_in_cookie
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_409_CONFLICT
 from uuid import UUID
 from psychohelp.schemas.users import UserUpdateRequest, PasswordChangeRequest
-from psychohelp.services.email import EmailDeliveryError
 from psychohelp.services.users.password_reset import (
     InvalidPasswordResetToken,
     request_password_reset,
@@ -126,8 +125,7 @@ async def refresh_token(request: Request, response: Response) -> UserResponse:
             status_code=HTTP_401_UNAUTHORIZED, detail="Пользователь не авторизован"
         )
     try:
-        new_access_token = users.refresh_access_token(refresh_token)
-        user = await users.get_user_by_token(new_access_token)
+        user, new_access_token = await users.refresh_user_token(refresh_token)
         if user is None:
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail="Пользователь не найден"
@@ -147,13 +145,7 @@ async def request_password_reset_email(
     request: Request,
     data: PasswordResetRequest,
 ) -> dict[str, str]:
-    try:
-        message = await request_password_reset(data.email)
-    except EmailDeliveryError:
-        raise HTTPException(
-            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Не удалось отправить письмо для восстановления пароля",
-        )
+    message = await request_password_reset(data.email)
     return {"message": message}
 
 
@@ -189,7 +181,7 @@ async def update_my_profile(
     try:
         user_id = get_user_id_from_token(token)
     except Exception as e:
-        logger.error(f"Ошибка при декодировании токена: {e}")
+        logger.error("Ошибка при декодировании токена: %s", e)
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
             detail="Недействительный токен"
@@ -221,7 +213,7 @@ async def update_my_profile(
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Неожиданная ошибка при обновлении профиля: {e}", exc_info=True)
+        logger.error("Неожиданная ошибка при обновлении профиля: %s", e, exc_info=True)
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Внутренняя ошибка сервера"
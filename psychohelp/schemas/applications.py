@@ -4,6 +4,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from psychohelp.models.applications import ApplicationSortField
+
 class UserFullResponse(BaseModel):
     id: UUID
     first_name: str
@@ -120,6 +122,57 @@ class CancelRequest(BaseModel):
     cancel_initiator: CancelInitiator
 
 
+class ApplicationSummaryResponse(BaseModel):
+    """Строка краткого списка заявок: только поля для таблицы"""
+    id: UUID
+    status: ApplicationStatus
+    university_status: UniversityStatus
+    preferred_campus: Optional[str]
+    meeting_type: Optional[MeetingType]
+    scheduled_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    user_id: Optional[UUID]
+    user_name: Optional[str]
+    assigned_to: Optional[UUID]
+    assigned_to_name: Optional[str]
+    psychologist_id: Optional[UUID]
+    psychologist_name: Optional[str]
+    appointment_id: Optional[UUID]
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class ApplicationExpiryResponse(BaseModel):
+    """Результат запуска истечения просроченных заявок"""
+    dry_run: bool
+    expired: dict[str, int]
+    total: int
+    duration_seconds: float
+    has_more: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class ApplicationHistoryEntryResponse(BaseModel):
+    """Запись журнала изменений статуса заявки"""
+    id: UUID
+    previous_status: Optional[str] = None
+    new_status: str
+    actor_type: str
+    actor_id: Optional[UUID] = None
+    timestamp: datetime
+    comment: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 class ApplicationResponse(BaseModel):
     id: UUID
     
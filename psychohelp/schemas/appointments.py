@@ -57,6 +57,7 @@ class AppointmentBase(BaseModel):
     reason: Optional[str] = None
     status: AppointmentStatus
     scheduled_time: datetime
+    scheduled_end_time: Optional[datetime] = None
     remind_time: Optional[datetime] = None
     last_change_time: datetime
     venue: str
@@ -13,6 +13,16 @@ class ArticleUpdateRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
 
+class ArticleSearchResult(BaseModel):
+    id: UUID
+    title: str
+    snippet: str = Field(..., description="Фрагменты текста, совпадения выделены <mark>")
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+
 class ArticleResponse(BaseModel):
     id: UUID
     title: str
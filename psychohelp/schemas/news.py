@@ -14,6 +14,17 @@ class NewsUpdateRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
 
+class NewsSearchResult(BaseModel):
+    id: UUID
+    title: str
+    created_at: datetime
+    snippet: str = Field(..., description="Фрагменты текста, совпадения выделены <mark>")
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+
 class NewsResponse(BaseModel):
     id: UUID
     title: str
@@ -66,3 +66,31 @@ class PsychologistResponse(BaseModel):
             phone_number=psychologist.user.phone_number,
         )
 
+
+class PsychologistDirectoryItem(PsychologistResponse):
+    areas: list[str]
+
+    @classmethod
+    def from_orm_psychologist(cls, psychologist):
+        response = PsychologistResponse.from_orm_psychologist(psychologist)
+        return cls(
+            **response.model_dump(),
+            areas=sorted(area.name for area in psychologist.consult_area_tags),
+        )
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class PsychologistDirectoryFacets(BaseModel):
+    consult_areas: list[FacetValue]
+    offices: list[FacetValue]
+    qualifications: list[FacetValue]
+
+
+class PsychologistDirectoryResponse(BaseModel):
+    items: list[PsychologistDirectoryItem]
+    facets: PsychologistDirectoryFacets
+
@@ -0,0 +1,46 @@
+from datetime import datetime, time
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class WorkingHoursItem(BaseModel):
+    weekday: int = Field(ge=0, le=6, description="День недели, 0 - понедельник")
+    start_time: time
+    end_time: time
+    # Шаг между началами слотов; длина слота - APPOINTMENT_DURATION_MINUTES
+    slot_minutes: int = Field(60, gt=0, le=480)
+
+    class Config:
+        from_attributes = True
+
+    @model_validator(mode="after")
+    def check_time_range(self):
+        if self.start_time >= self.end_time:
+            raise ValueError("Начало рабочего времени должно быть раньше конца")
+        return self
+
+
+class WorkingHoursRequest(BaseModel):
+    items: list[WorkingHoursItem] = Field(max_length=100)
+
+    @model_validator(mode="after")
+    def check_no_overlaps(self):
+        items = sorted(self.items, key=lambda item: (item.weekday, item.start_time))
+        for prev, item in zip(items, items[1:]):
+            if item.weekday == prev.weekday and item.start_time < prev.end_time:
+                raise ValueError("Интервалы рабочего времени в один день не должны пересекаться")
+        return self
+
+
+class SlotResponse(BaseModel):
+    start: datetime
+    end: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PsychologistSlotsResponse(BaseModel):
+    psychologist_id: UUID
+    slots: list[SlotResponse]
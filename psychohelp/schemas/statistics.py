@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class CountItem(BaseModel):
+    value: str
+    count: int
+
+
+class ApplicationStatisticsResponse(BaseModel):
+    total: int
+    by_status: list[CountItem]
+    by_university_status: list[CountItem]
+    cancellation_rate: float | None = Field(..., description="Доля отмененных среди всех заявок")
+    median_hours_to_in_progress: float | None = Field(..., description="Медиана от создания до взятия в работу")
+    median_hours_to_completed: float | None = Field(..., description="Медиана от создания до завершения")
+    refreshed_at: datetime | None = Field(..., description="Когда статистика пересчитана")
+
+
+class WeeklyLoadItem(BaseModel):
+    psychologist_id: UUID
+    week: date = Field(..., description="Понедельник недели")
+    appointments: int
+    done: int
+    cancelled: int
+
+    class Config:
+        from_attributes = True
+
+
+class PsychologistLoadResponse(BaseModel):
+    weeks: list[WeeklyLoadItem]
+    appointments: int
+    cancelled: int
+    cancellation_rate: float | None = Field(..., description="Доля отмененных встреч за период")
@@ -0,0 +1,105 @@
+"""
+Загрузка синтетического набора данных для стенда и нагрузочных прогонов.
+
+    psychohelp-seed --users 100000 --psychologists 2000 --appointments 2000000 --applications 1000000
+
+База берется из переменных POSTGRES_*, схема должна быть создана
+(alembic upgrade head). Повторный запуск на уже заполненной базе ничего
+не делает. Пароль всех пользователей - password123.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+
+from psychohelp.config.config import async_engine, config, get_async_db
+from psychohelp.models.users import User
+from psychohelp.repositories import hash_password, password_hash_rounds
+from psychohelp.seeding.generator import (
+    SEED_PASSWORD,
+    SEED_PASSWORD_HASH,
+    DatasetGenerator,
+    DatasetSize,
+    seed_email,
+)
+from psychohelp.seeding.loader import load_dataset
+
+
+def seed_password_hash() -> str:
+    """Готовый хеш, если стоимость совпадает с PASSWORD_HASH_ROUNDS (иначе вход его перехеширует)"""
+    if password_hash_rounds(SEED_PASSWORD_HASH) == config.PASSWORD_HASH_ROUNDS:
+        return SEED_PASSWORD_HASH
+    return hash_password(SEED_PASSWORD)
+
+
+async def seed(size: DatasetSize, random_seed: int, batch_size: int = 10_000) -> dict[str, int] | None:
+    """Загрузить набор в пустую базу; None, если он уже загружен"""
+    async with get_async_db() as session:
+        seeded = await session.scalar(select(User.id).where(User.email == seed_email(0)))
+    if seeded is not None:
+        return None
+
+    generator = DatasetGenerator(size, seed=random_seed, password_hash=seed_password_hash())
+    return await load_dataset(generator, batch_size=batch_size)
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSize()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--psychologists", type=int, default=defaults.psychologists)
+    parser.add_argument("--admins", type=int, default=defaults.admins)
+    parser.add_argument("--appointments", type=int, default=defaults.appointments)
+    parser.add_argument("--applications", type=int, default=defaults.applications)
+    parser.add_argument("--review-share", type=float, default=defaults.review_share,
+                        help="доля завершенных встреч с отзывом")
+
+
+def size_from_args(args: argparse.Namespace) -> DatasetSize:
+    return DatasetSize(
+        users=args.users,
+        psychologists=args.psychologists,
+        appointments=args.appointments,
+        applications=args.applications,
+        admins=args.admins,
+        review_share=args.review_share,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_size_arguments(parser)
+    parser.add_argument("--random-seed", type=int, default=1, help="одинаковый seed дает одинаковые данные")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="строк на COPY и транзакцию")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> dict[str, int] | None:
+    try:
+        return await seed(size_from_args(args), args.random_seed, args.batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    try:
+        size_from_args(args)
+    except ValueError as error:
+        sys.exit(str(error))
+
+    started = time.perf_counter()
+    loaded = asyncio.run(_run(args))
+    if loaded is None:
+        print("Набор данных уже загружен")
+        return
+    elapsed = time.perf_counter() - started
+    total = sum(loaded.values())
+    for table, count in loaded.items():
+        print(f"{table:<15} {count:>10}")
+    print(f"Всего {total} строк за {elapsed:.1f}s ({total / elapsed:.0f} строк/с)")
+
+
+if __name__ == "__main__":
+    main()
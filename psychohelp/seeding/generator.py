@@ -0,0 +1,261 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Iterator
+
+from psychohelp.config.config import config
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.models.applications import ApplicationStatus, CancelInitiator, MeetingType, UniversityStatus
+from psychohelp.models.appointments import AppointmentStatus, AppointmentType
+from psychohelp.models.psychologists import parse_consult_areas
+
+
+# Пароль всех синтетических пользователей и его bcrypt-хеш со стоимостью 12:
+# на миллионы строк bcrypt не считается вовсе
+SEED_PASSWORD = "password123"
+SEED_PASSWORD_HASH = "$2b$12$WW0/HruvKtVa1iTVQ0fRlugC3zmhZ39x0qc3VgnS1JCg0jNKuRKJG"
+
+FIRST_NAMES = ("Анна", "Мария", "Елена", "Ольга", "Иван", "Петр", "Алексей", "Дмитрий", "Софья", "Артем")
+LAST_NAMES = ("Смирнов", "Иванов", "Кузнецов", "Попов", "Васильев", "Соколов", "Морозов", "Новиков")
+QUALIFICATIONS = ("Гештальт-терапевт", "КПТ-терапевт", "Психоаналитик", "Семейный психолог")
+CONSULT_AREAS = ("Тревожность", "Отношения", "Учеба и стресс", "Личностный рост", "Самооценка")
+REVIEWS = ("Спасибо, стало легче", "Помогли разобраться в ситуации", "Приду еще", "Было полезно")
+CAMPUSES = ("Большая Семеновская", "Автозаводская", "Павла Корчагина", "Прянишникова")
+
+# Доли статусов заявок: примерно как в рабочей базе, где большинство закрыто
+APPLICATION_STATUS_WEIGHTS = {
+    ApplicationStatus.NEW: 10,
+    ApplicationStatus.IN_PROGRESS: 10,
+    ApplicationStatus.AWAITING_USER_CONFIRMATION: 5,
+    ApplicationStatus.COMPLETED: 45,
+    ApplicationStatus.REJECTED: 10,
+    ApplicationStatus.CANCELLED: 12,
+    ApplicationStatus.EXPIRED: 8,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSize:
+    users: int = 10_000
+    psychologists: int = 500
+    appointments: int = 200_000
+    applications: int = 100_000
+    admins: int = 5
+    # Доля завершенных встреч с отзывом
+    review_share: float = 0.3
+
+    def __post_init__(self) -> None:
+        if not 0 < self.psychologists < self.users:
+            raise ValueError("Психологов должно быть больше нуля и меньше, чем пользователей")
+        if not 0 <= self.admins < self.users - self.psychologists:
+            raise ValueError("Администраторов должно быть меньше, чем пациентов")
+
+
+def seed_email(index: int) -> str:
+    return f"user{index}@seed.example.com"
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+class DatasetGenerator:
+    """
+    Детерминированный синтетический набор данных.
+
+    Одинаковые seed, size и now дают одни и те же строки. У каждой таблицы
+    свой генератор случайных чисел, поэтому порядок обхода таблиц не важен.
+    Первые size.psychologists пользователей - психологи, остальные - пациенты;
+    первые size.admins пациентов еще и администраторы.
+    Строки - словари по именам колонок.
+    """
+
+    def __init__(self, size: DatasetSize, seed: int, password_hash: str, now: datetime | None = None) -> None:
+        self.size = size
+        self.seed = seed
+        self.password_hash = password_hash
+        self.now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+
+        rng = self._rng("ids")
+        self.user_ids = [_uuid(rng) for _ in range(size.users)]
+        self.psychologist_ids = [_uuid(rng) for _ in range(size.psychologists)]
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    @property
+    def psychologist_user_ids(self) -> list[uuid.UUID]:
+        return self.user_ids[:self.size.psychologists]
+
+    @property
+    def patient_ids(self) -> list[uuid.UUID]:
+        return self.user_ids[self.size.psychologists:]
+
+    def users(self) -> Iterator[dict]:
+        rng = self._rng("users")
+        for index, user_id in enumerate(self.user_ids):
+            yield {
+                "id": user_id,
+                "first_name": rng.choice(FIRST_NAMES),
+                "middle_name": None,
+                "last_name": rng.choice(LAST_NAMES),
+                "phone_number": f"+7999{index:07d}",
+                "email": seed_email(index),
+                "social_media": None,
+                "password": self.password_hash,
+                "study_group": f"{rng.randint(191, 251)}-{rng.randint(311, 399)}",
+            }
+
+    def user_roles(self, role_ids: dict[RoleCode, uuid.UUID]) -> Iterator[dict]:
+        for index, user_id in enumerate(self.user_ids):
+            yield {"user_id": user_id, "role_id": role_ids[RoleCode.USER], "assigned_at": self.now}
+            if index < self.size.psychologists:
+                yield {"user_id": user_id, "role_id": role_ids[RoleCode.PSYCHOLOGIST], "assigned_at": self.now}
+            elif index < self.size.psychologists + self.size.admins:
+                yield {"user_id": user_id, "role_id": role_ids[RoleCode.ADMIN], "assigned_at": self.now}
+
+    def psychologist_consult_areas(self, area_ids: dict[str, uuid.UUID]) -> Iterator[dict]:
+        for psychologist in self.psychologists():
+            for name in parse_consult_areas(psychologist["consult_areas"]):
+                yield {"psychologist_id": psychologist["id"], "consult_area_id": area_ids[name]}
+
+    def psychologists(self) -> Iterator[dict]:
+        rng = self._rng("psychologists")
+        for psychologist_id, user_id in zip(self.psychologist_ids, self.psychologist_user_ids):
+            qualification = rng.choice(QUALIFICATIONS)
+            yield {
+                "id": psychologist_id,
+                "user_id": user_id,
+                "experience": f"{rng.randint(1, 25)} лет",
+                "qualification": qualification,
+                "consult_areas": ", ".join(rng.sample(CONSULT_AREAS, 2)),
+                "description": f"{qualification}, работаю со студентами и сотрудниками.",
+                "office": rng.choice(CAMPUSES),
+                "education": "МГУ, факультет психологии",
+                "short_description": "Бережно и конфиденциально",
+                "photo": None,
+            }
+
+    def appointments(self) -> Iterator[dict]:
+        """
+        Встречи на год вокруг now: прошедшие завершены или отменены, будущие
+        в основном ожидают. У психолога встречи идут по сетке без пересечений.
+        """
+        rng = self._rng("appointments")
+        duration = timedelta(minutes=config.APPOINTMENT_DURATION_MINUTES)
+        per_psychologist = -(-self.size.appointments // self.size.psychologists)
+        span_hours = 365 * 24
+        step = max(timedelta(hours=max(span_hours // per_psychologist, 1)), duration)
+        start = datetime.combine((self.now - timedelta(days=182)).date(), time(9), tzinfo=timezone.utc)
+        patients = self.patient_ids
+
+        for index in range(self.size.appointments):
+            slot, psychologist_index = divmod(index, self.size.psychologists)
+            scheduled = start + slot * step + timedelta(hours=psychologist_index % 8)
+            if scheduled < self.now:
+                status = AppointmentStatus.done if rng.random() < 0.8 else AppointmentStatus.cancelled
+            else:
+                status = AppointmentStatus.awaiting if rng.random() < 0.85 else AppointmentStatus.cancelled
+            remind_time = scheduled - timedelta(days=1)
+            online = rng.random() < 0.4
+            yield {
+                "id": _uuid(rng),
+                "patient_id": rng.choice(patients),
+                "application_id": None,
+                "psychologist_id": self.psychologist_ids[psychologist_index],
+                "type": AppointmentType.Online if online else AppointmentType.Offline,
+                "reason": rng.choice(CONSULT_AREAS),
+                "status": status,
+                "cancel_reason": "Не смогу прийти" if status == AppointmentStatus.cancelled else None,
+                "conclusion": "Консультация проведена" if status == AppointmentStatus.done else None,
+                "scheduled_time": scheduled,
+                "scheduled_end_time": scheduled + duration,
+                "remind_time": remind_time,
+                "reminder_sent_at": remind_time if remind_time < self.now else None,
+                "last_change_time": min(scheduled, self.now),
+                "venue": "https://meet.example.com/room" if online else rng.choice(CAMPUSES),
+                "comment": None,
+            }
+
+    def reviews(self) -> Iterator[dict]:
+        """Отзывы на часть завершенных встреч; reviews.time хранится без часового пояса"""
+        rng = self._rng("reviews")
+        for appointment in self.appointments():
+            if appointment["status"] != AppointmentStatus.done or rng.random() >= self.size.review_share:
+                continue
+            written = appointment["scheduled_end_time"] + timedelta(hours=rng.randint(1, 72))
+            yield {
+                "appointment_id": appointment["id"],
+                "time": min(written, self.now).replace(tzinfo=None),
+                "content": rng.choice(REVIEWS),
+            }
+
+    def applications(self) -> Iterator[dict]:
+        rng = self._rng("applications")
+        statuses = list(APPLICATION_STATUS_WEIGHTS)
+        weights = list(APPLICATION_STATUS_WEIGHTS.values())
+        patients = self.patient_ids
+
+        for _ in range(self.size.applications):
+            status = rng.choices(statuses, weights)[0]
+            created_at = self.now - timedelta(minutes=rng.randint(60, 180 * 24 * 60))
+            updated_at = created_at + timedelta(minutes=rng.randint(0, 14 * 24 * 60))
+            updated_at = min(updated_at, self.now)
+            psychologist_index = rng.randrange(self.size.psychologists)
+            row = {
+                "id": _uuid(rng),
+                "user_id": rng.choice(patients),
+                "problem_description": f"Нужна консультация: {rng.choice(CONSULT_AREAS).lower()}",
+                "preferred_campus": rng.choice(CAMPUSES),
+                "university_status": rng.choice(list(UniversityStatus)).value,
+                "status": status.value,
+                "assigned_to": None,
+                "psychologist_id": None,
+                "meeting_type": None,
+                "scheduled_at": None,
+                "location_address": None,
+                "meeting_url": None,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "processing_started_at": None,
+                "confirmation_requested_at": None,
+                "completed_at": None,
+                "rejected_at": None,
+                "cancelled_at": None,
+                "expired_at": None,
+                "reject_reason": None,
+                "cancel_reason": None,
+                "cancel_initiator": None,
+                "internal_comment": None,
+                "appointment_id": None,
+                "version": 1,
+            }
+            if status != ApplicationStatus.NEW:
+                row["assigned_to"] = self.psychologist_user_ids[psychologist_index]
+                row["processing_started_at"] = created_at
+                row["version"] += 1
+            if status in (ApplicationStatus.AWAITING_USER_CONFIRMATION, ApplicationStatus.COMPLETED):
+                online = rng.random() < 0.4
+                row.update(
+                    psychologist_id=self.psychologist_ids[psychologist_index],
+                    meeting_type=(MeetingType.ONLINE if online else MeetingType.OFFLINE).value,
+                    scheduled_at=updated_at + timedelta(days=rng.randint(1, 14)),
+                    meeting_url="https://meet.example.com/room" if online else None,
+                    location_address=None if online else rng.choice(CAMPUSES),
+                    confirmation_requested_at=updated_at,
+                    version=row["version"] + 1,
+                )
+            if status == ApplicationStatus.COMPLETED:
+                row["completed_at"] = updated_at
+            elif status == ApplicationStatus.REJECTED:
+                row.update(rejected_at=updated_at, reject_reason="Обратитесь в поликлинику")
+            elif status == ApplicationStatus.CANCELLED:
+                row.update(
+                    cancelled_at=updated_at,
+                    cancel_reason="Вопрос решился",
+                    cancel_initiator=CancelInitiator.USER.value,
+                )
+            elif status == ApplicationStatus.EXPIRED:
+                row["expired_at"] = updated_at
+            yield row
@@ -0,0 +1,125 @@
+import time
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from psychohelp.config.config import get_async_db
+from psychohelp.config.logging import get_logger
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.models.applications import Application
+from psychohelp.models.appointments import Appointment
+from psychohelp.models.psychologists import ConsultArea, Psychologist, psychologists_consult_areas
+from psychohelp.models.reviews import Review
+from psychohelp.models.roles import Role, users_roles
+from psychohelp.models.users import User
+from psychohelp.seeding.generator import CONSULT_AREAS, DatasetGenerator
+
+
+logger = get_logger(__name__)
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def ensure_roles() -> dict[RoleCode, object]:
+    """id ролей по коду; недостающие роли (чистая БД без миграций) создаются"""
+    async with get_async_db() as session:
+        role_ids = dict((await session.execute(select(Role.code, Role.id))).all())
+        missing = [code for code in RoleCode if code not in role_ids]
+        if missing:
+            roles = [Role(code=code, name=code.value) for code in missing]
+            session.add_all(roles)
+            await session.flush()
+            role_ids.update((role.code, role.id) for role in roles)
+    return role_ids
+
+
+async def ensure_consult_areas() -> dict[str, object]:
+    """id направлений консультирования по названию; недостающие создаются"""
+    async with get_async_db() as session:
+        area_ids = dict((await session.execute(
+            select(ConsultArea.name, ConsultArea.id).where(ConsultArea.name.in_(CONSULT_AREAS))
+        )).all())
+        missing = [ConsultArea(name=name) for name in CONSULT_AREAS if name not in area_ids]
+        if missing:
+            session.add_all(missing)
+            await session.flush()
+            area_ids.update((area.name, area.id) for area in missing)
+    return area_ids
+
+
+def dataset_tables(
+    generator: DatasetGenerator, role_ids: dict, area_ids: dict
+) -> list[tuple[Table, Iterable[dict]]]:
+    """Таблицы в порядке внешних ключей и их строки"""
+    return [
+        (User.__table__, generator.users()),
+        (users_roles, generator.user_roles(role_ids)),
+        (Psychologist.__table__, generator.psychologists()),
+        (psychologists_consult_areas, generator.psychologist_consult_areas(area_ids)),
+        (Appointment.__table__, generator.appointments()),
+        (Review.__table__, generator.reviews()),
+        (Application.__table__, generator.applications()),
+    ]
+
+
+async def _copy_rows(session: AsyncSession, table: Table, rows: list[dict]) -> None:
+    """
+    Вставка пачки через COPY asyncpg в транзакции сессии.
+
+    Значения проходят через bind-обработчики типов колонок, как при обычном
+    INSERT (например, Enum -> имя члена).
+    """
+    connection = await session.connection()
+    dialect = connection.dialect
+    columns = list(rows[0])
+    processors = []
+    for name in columns:
+        column_type = table.c[name].type
+        processors.append(column_type.dialect_impl(dialect).bind_processor(dialect))
+    records = [
+        tuple(
+            process(row[name]) if process and row[name] is not None else row[name]
+            for name, process in zip(columns, processors)
+        )
+        for row in rows
+    ]
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns
+    )
+
+
+async def insert_rows(session: AsyncSession, table: Table, rows: list[dict]) -> None:
+    """COPY на Postgres (asyncpg), многострочный INSERT на остальных драйверах"""
+    connection = await session.connection()
+    if connection.dialect.driver == "asyncpg":
+        await _copy_rows(session, table, rows)
+    else:
+        await session.execute(insert(table), rows)
+
+
+async def load_dataset(generator: DatasetGenerator, batch_size: int = 5000) -> dict[str, int]:
+    """
+    Загрузить набор пачками (COPY на Postgres), по транзакции на пачку.
+
+    Возвращает число строк по таблицам.
+    """
+    role_ids = await ensure_roles()
+    area_ids = await ensure_consult_areas()
+    loaded: dict[str, int] = {}
+    for table, rows in dataset_tables(generator, role_ids, area_ids):
+        started = time.perf_counter()
+        count = 0
+        for batch in batched(rows, batch_size):
+            async with get_async_db() as session:
+                await insert_rows(session, table, batch)
+            count += len(batch)
+        loaded[table.name] = count
+        logger.info("Loaded %s rows into %s in %.1fs", count, table.name, time.perf_counter() - started)
+    return loaded
@@ -5,13 +5,15 @@ from fastapi import HTTPException
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_403_FORBIDDEN, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
 
 from psychohelp.repositories import applications as repo
+from psychohelp.services.applications.models import ApplicationSummary
 from psychohelp.services.applications.state_machine import ApplicationStateMachine
 from psychohelp.services.applications.exceptions import (
     ApplicationNotFoundError, InvalidStatusTransitionError, AccessDeniedError,
     ConflictError, ValidationError
 )
 from psychohelp.schemas.applications import ApplicationCreateRequest, OfferConsultationRequest
-from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.application_audit_log import ApplicationAuditLog
+from psychohelp.models.applications import Application, ApplicationSortField, ApplicationStatus
 from psychohelp.repositories.users import get_user_by_id
 from psychohelp.repositories.psychologists.psychologists import (
     get_psychologist_by_id,
@@ -42,6 +44,21 @@ async def get_application_for_user(application_id: UUID, user_id: UUID | None, i
     return application
 
 
+async def get_application_history(
+    application_id: UUID,
+    user_id: UUID | None,
+    is_manager_or_psychologist: bool,
+    skip: int = 0,
+    limit: int = 100,
+) -> list[ApplicationAuditLog]:
+    owner = await repo.get_application_owner(application_id)
+    if owner is None:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Application not found")
+    if not is_manager_or_psychologist and owner.user_id != user_id:
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Access denied")
+    return await repo.get_application_history(application_id, skip, limit)
+
+
 async def get_applications_list(
     skip: int,
     limit: int,
@@ -49,16 +66,14 @@ async def get_applications_list(
     assigned_to: UUID | None,
     current_user_id: UUID,
     is_manager_or_psychologist: bool,
-    sort_by: str = "created_at",
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
     sort_desc: bool = True,
+    cursor: str | None = None,
 ) -> list[Application]:
     
-    query_user_id = None
-    query_assigned_to = assigned_to
-
-    if not is_manager_or_psychologist:
-        query_user_id = current_user_id
-        query_assigned_to = None
+    query_user_id, query_assigned_to = _list_scope(
+        current_user_id, assigned_to, is_manager_or_psychologist
+    )
 
     return await repo.get_applications(
         skip=skip,
@@ -67,10 +82,55 @@ async def get_applications_list(
         assigned_to=query_assigned_to,
         user_id=query_user_id,
         sort_by=sort_by,
-        sort_desc=sort_desc
+        sort_desc=sort_desc,
+        cursor=cursor,
     )
 
 
+async def get_application_summaries(
+    skip: int,
+    limit: int,
+    status: ApplicationStatus | None,
+    assigned_to: UUID | None,
+    current_user_id: UUID,
+    is_manager_or_psychologist: bool,
+    sort_by: ApplicationSortField = ApplicationSortField.CREATED_AT,
+    sort_desc: bool = True,
+    cursor: str | None = None,
+) -> list[ApplicationSummary]:
+    query_user_id, query_assigned_to = _list_scope(
+        current_user_id, assigned_to, is_manager_or_psychologist
+    )
+    rows = await repo.get_application_summaries(
+        skip=skip,
+        limit=limit,
+        status=status,
+        assigned_to=query_assigned_to,
+        user_id=query_user_id,
+        sort_by=sort_by,
+        sort_desc=sort_desc,
+        cursor=cursor,
+    )
+    return [ApplicationSummary.from_row(row) for row in rows]
+
+
+def _list_scope(
+    current_user_id: UUID, assigned_to: UUID | None, is_manager_or_psychologist: bool
+) -> tuple[UUID | None, UUID | None]:
+    """Обычный пользователь видит только свои заявки"""
+    if not is_manager_or_psychologist:
+        return current_user_id, None
+    return None, assigned_to
+
+
+def get_next_cursor(
+    applications: list[Application] | list[ApplicationSummary], limit: int, sort_by: ApplicationSortField, sort_desc: bool
+) -> str | None:
+    if sort_by not in repo.KEYSET_SORT_FIELDS:
+        return None
+    return repo.applications_keyset(sort_by, sort_desc).next_cursor(applications, limit)
+
+
 async def accept_to_processing(
     application_id: UUID,
     assigned_to: UUID,
@@ -0,0 +1,141 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from psychohelp.config.config import config, get_async_db
+from psychohelp.config.logging import get_logger
+from psychohelp.models.applications import ApplicationStatus
+from psychohelp.repositories import applications as repo
+from psychohelp.services.applications.state_machine import ApplicationStateMachine
+from psychohelp.services.audit import log_application_status_changes
+from psychohelp.services.background import PeriodicTask
+
+
+logger = get_logger(__name__)
+
+
+def default_sla() -> dict[ApplicationStatus, timedelta]:
+    """Через сколько без изменений заявка в статусе считается просроченной"""
+    return {
+        ApplicationStatus.NEW: timedelta(hours=config.APPLICATION_EXPIRY_NEW_HOURS),
+        ApplicationStatus.IN_PROGRESS: timedelta(hours=config.APPLICATION_EXPIRY_IN_PROGRESS_HOURS),
+        ApplicationStatus.AWAITING_USER_CONFIRMATION: timedelta(
+            hours=config.APPLICATION_EXPIRY_AWAITING_CONFIRMATION_HOURS
+        ),
+    }
+
+
+@dataclass(slots=True)
+class ExpiryResult:
+    dry_run: bool
+    # Статус до истечения -> количество заявок
+    expired: dict[str, int] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+    # Остановились на max_batches, а просроченные заявки, возможно, еще есть
+    has_more: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.expired.values())
+
+
+class ApplicationExpiryJob(PeriodicTask):
+    """
+    Периодически переводит просроченные заявки в EXPIRED пачками.
+
+    На пачку три запроса независимо от размера: блокировка строк (SKIP LOCKED),
+    один UPDATE ... RETURNING id и один INSERT в журнал аудита.
+    """
+
+    def __init__(
+        self,
+        sla: dict[ApplicationStatus, timedelta] | None = None,
+        interval_seconds: float = config.APPLICATION_EXPIRY_INTERVAL_SECONDS,
+        batch_size: int = config.APPLICATION_EXPIRY_BATCH_SIZE,
+        dry_run: bool = config.APPLICATION_EXPIRY_DRY_RUN,
+    ) -> None:
+        sla = sla if sla is not None else default_sla()
+        unknown = set(sla) - set(ApplicationStateMachine.EXPIRABLE_STATUSES)
+        if unknown:
+            raise ValueError(f"Заявки не могут истекать из статусов: {sorted(unknown)}")
+        super().__init__("application-expiry", interval_seconds)
+        self.sla = sla
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+        self.runs = 0
+        self.expired_total: dict[str, int] = {}
+        self.last_run_at: datetime | None = None
+        self.last_result: ExpiryResult | None = None
+
+    def cutoffs(self, now: datetime) -> dict[ApplicationStatus, datetime]:
+        return {status: now - delay for status, delay in self.sla.items()}
+
+    async def run_once(
+        self, now: datetime | None = None, dry_run: bool | None = None, max_batches: int | None = None
+    ) -> ExpiryResult:
+        """max_batches ограничивает работу одного вызова, например ручного запуска из запроса"""
+        now = now or datetime.now(timezone.utc)
+        dry_run = self.dry_run if dry_run is None else dry_run
+        started = time.perf_counter()
+        result = ExpiryResult(dry_run=dry_run)
+        cutoffs = self.cutoffs(now)
+
+        if dry_run:
+            result.expired = await repo.count_stale_applications(cutoffs)
+        else:
+            batches = 0
+            while True:
+                # Каждая пачка в своей транзакции, чтобы не держать блокировки долго
+                async with get_async_db():
+                    locked = await repo.lock_stale_applications(cutoffs, self.batch_size)
+                    if not locked:
+                        break
+                    previous = {row.id: row.status for row in locked}
+                    expired_ids = await repo.expire_applications(list(previous), now)
+                    await log_application_status_changes([
+                        {
+                            "application_id": application_id,
+                            "previous_status": previous[application_id],
+                            "new_status": ApplicationStatus.EXPIRED.value,
+                            "actor_type": "system",
+                            "actor_id": None,
+                            "comment": "Истек срок обработки",
+                        }
+                        for application_id in expired_ids
+                    ])
+                for application_id in expired_ids:
+                    status = previous[application_id]
+                    result.expired[status] = result.expired.get(status, 0) + 1
+                if len(locked) < self.batch_size:
+                    break
+                batches += 1
+                if max_batches is not None and batches >= max_batches:
+                    result.has_more = True
+                    break
+
+        result.duration_seconds = time.perf_counter() - started
+        self.runs += 1
+        self.last_run_at = now
+        self.last_result = result
+        if not dry_run:
+            for status, count in result.expired.items():
+                self.expired_total[status] = self.expired_total.get(status, 0) + count
+        if result.total:
+            logger.info(
+                "Application expiry %s: %s in %.3fs",
+                "dry run" if dry_run else "run", result.expired, result.duration_seconds,
+            )
+        return result
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "expired_total": dict(self.expired_total),
+            "last_run_at": self.last_run_at,
+            "last_duration_seconds": self.last_result.duration_seconds if self.last_result else None,
+        }
+
+
+application_expiry_job = ApplicationExpiryJob()
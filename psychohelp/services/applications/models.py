@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+def _full_name(last_name: str | None, first_name: str | None) -> str | None:
+    name = " ".join(part for part in (last_name, first_name) if part)
+    return name or None
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationSummary:
+    """Строка краткого списка заявок (без ORM-объектов)."""
+
+    id: UUID
+    status: str
+    university_status: str
+    preferred_campus: str | None
+    meeting_type: str | None
+    scheduled_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+    user_id: UUID | None
+    user_name: str | None
+    assigned_to: UUID | None
+    assigned_to_name: str | None
+    psychologist_id: UUID | None
+    psychologist_name: str | None
+    appointment_id: UUID | None
+
+    @classmethod
+    def from_row(cls, row) -> "ApplicationSummary":
+        return cls(
+            id=row.id,
+            status=row.status,
+            university_status=row.university_status,
+            preferred_campus=row.preferred_campus,
+            meeting_type=row.meeting_type,
+            scheduled_at=row.scheduled_at,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            version=row.version,
+            user_id=row.user_id,
+            user_name=_full_name(row.user_last_name, row.user_first_name),
+            assigned_to=row.assigned_to,
+            assigned_to_name=_full_name(row.assigned_to_last_name, row.assigned_to_first_name),
+            psychologist_id=row.psychologist_id,
+            psychologist_name=_full_name(row.psychologist_last_name, row.psychologist_first_name),
+            appointment_id=row.appointment_id,
+        )
@@ -14,6 +14,13 @@ from psychohelp.models.applications import Application, ApplicationStatus, Cance
 
 
 class ApplicationStateMachine:
+    # Статусы, из которых заявка может истечь (используется и пакетной обработкой)
+    EXPIRABLE_STATUSES = (
+        ApplicationStatus.NEW,
+        ApplicationStatus.IN_PROGRESS,
+        ApplicationStatus.AWAITING_USER_CONFIRMATION,
+    )
+
     def __init__(self, application: Application):
         self.application = application
 
@@ -29,6 +36,7 @@ class ApplicationStateMachine:
         
     async def _transition(self, new_status: str, update_data: dict, actor_id: UUID, actor_type: str, comment: str = None):
         self._check_not_final()
+        previous_status = self.application.status
         update_data["status"] = new_status
         update_data["updated_at"] = datetime.now(timezone.utc)
         # optimistic locking
@@ -39,14 +47,15 @@ class ApplicationStateMachine:
         )
         if not updated:
             raise ConflictError("Заявка была изменена другим пользователем, повторите операцию")
-        # await log_application_status_change(
-        #     application_id=self.application.id,
-        #     previous_status=self.application.status,
-        #     new_status=new_status,
-        #     actor_type=actor_type,
-        #     actor_id=actor_id,
-        #     comment=comment
-        # )
+        # Запись журнала в той же транзакции, что и UPDATE заявки
+        await log_application_status_change(
+            application_id=self.application.id,
+            previous_status=previous_status,
+            new_status=new_status,
+            actor_type=actor_type,
+            actor_id=actor_id,
+            comment=comment
+        )
         return updated
 
     async def accept_to_processing(self, assigned_to: UUID, actor_id: UUID, actor_type: str) -> Application:
@@ -106,7 +115,7 @@ class ApplicationStateMachine:
         return await self._transition(ApplicationStatus.CANCELLED, update_data, actor_id, actor_type)
 
     async def expire(self, actor_id: UUID, actor_type: str = "system") -> Application:
-        if self.application.status not in (ApplicationStatus.NEW, ApplicationStatus.IN_PROGRESS, ApplicationStatus.AWAITING_USER_CONFIRMATION):
+        if self.application.status not in self.EXPIRABLE_STATUSES:
             raise InvalidStatusTransitionError(f"Невозможно перевести в expired из статуса {self.application.status}")
         update_data = {"expired_at": datetime.now(timezone.utc)}
         return await self._transition(ApplicationStatus.EXPIRED, update_data, actor_id, actor_type)
\ No newline at end of file
@@ -1,12 +1,18 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
+
+from psychohelp.config.config import call_after_commit, config
+
 from psychohelp.repositories import get_user_id_from_token
 from psychohelp.repositories.appointments import (
     get_appointment_by_id as repo_get_appointment_by_id,
     create_appointment as repo_create_appointment,
     cancel_appointment_by_id as repo_cancel_appointment_by_id,
     get_appointments_by_user_id as repo_get_appointments_by_user_id,
+    has_overlapping_appointment,
 )
 from psychohelp.repositories.applications import get_application_by_id
 from psychohelp.repositories.psychologists.psychologists import (
@@ -17,9 +23,15 @@ from psychohelp.repositories.users import get_user_by_id
 from psychohelp.models.appointments import Appointment, AppointmentType, AppointmentStatus
 from psychohelp.services.appointments import exceptions as exc
 from psychohelp.services.applications.applications import confirm_application
+from psychohelp.services.schedule.schedule import invalidate_slots
+from psychohelp.services.appointments.reminders import reminder_scheduler
 from psychohelp.repositories.appointments import cancel_appointment_by_id as repo_cancel
 
 
+# SQLSTATE нарушения exclusion-ограничения в Postgres
+EXCLUSION_VIOLATION = "23P01"
+
+
 async def get_appointment_by_id(appointment_id: UUID, user_id: UUID) -> Appointment | None:
     return await repo_get_appointment_by_id(appointment_id, user_id)
 
@@ -65,6 +77,10 @@ async def create_appointment(
     if psychologist is None:
         raise exc.PsychologistNotFoundException(psychologist_id)
 
+    scheduled_end_time = scheduled_time_utc + timedelta(minutes=config.APPOINTMENT_DURATION_MINUTES)
+    if await has_overlapping_appointment(psychologist.id, scheduled_time_utc, scheduled_end_time):
+        raise exc.AppointmentSlotTakenException(scheduled_time)
+
     match type:
         case AppointmentType.Offline:
             venue = psychologist.office
@@ -72,19 +88,30 @@ async def create_appointment(
             if venue is None:
                 raise exc.VenueRequiredException()
 
-    appointment = await repo_create_appointment(
-        patient_id=patient_id,
-        psychologist_id=psychologist.id,
-        application_id=application_id,
-        type=type,
-        reason=reason,
-        status=status,
-        scheduled_time=scheduled_time,
-        remind_time=remind_time,
-        last_change_time=now,
-        venue=venue,
-        comment=comment,
-    )
+    try:
+        appointment = await repo_create_appointment(
+            patient_id=patient_id,
+            psychologist_id=psychologist.id,
+            application_id=application_id,
+            type=type,
+            reason=reason,
+            status=status,
+            scheduled_time=scheduled_time,
+            scheduled_end_time=scheduled_end_time,
+            remind_time=remind_time,
+            last_change_time=now,
+            venue=venue,
+            comment=comment,
+        )
+    except IntegrityError as e:
+        # Параллельная запись на то же время: сработало exclusion-ограничение
+        if getattr(e.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+            raise exc.AppointmentSlotTakenException(scheduled_time) from e
+        raise
+    await invalidate_slots(psychologist.id)
+    if remind_time is not None:
+        # Очередь в памяти не откатывается вместе с транзакцией
+        call_after_commit(partial(reminder_scheduler.schedule, appointment.id, remind_time))
 
     if application_id:
         await confirm_application(
@@ -104,8 +131,17 @@ async def cancel_appointment_by_id(appointment_id: UUID) -> Appointment:
     return await repo_cancel_appointment_by_id(appointment_id)
 
 
-async def get_appointments_by_user_id(user_id: UUID) -> list[Appointment]:
-    return await repo_get_appointments_by_user_id(user_id)
+async def get_appointments_by_user_id(
+    user_id: UUID,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: AppointmentStatus | None = None,
+    skip: int = 0,
+    take: int | None = None,
+) -> list[Appointment]:
+    return await repo_get_appointments_by_user_id(
+        user_id, date_from=date_from, date_to=date_to, status=status, skip=skip, take=take
+    )
 
 
 async def get_appointments_by_token(token: str) -> list[Appointment]:
@@ -115,6 +151,8 @@ async def get_appointments_by_token(token: str) -> list[Appointment]:
 
 async def cancel_appointment_by_member(appointment_id: UUID, user_id: UUID, cancel_reason: str) -> Appointment:
     appointment = await repo_cancel(appointment_id, user_id, cancel_reason)
+    await invalidate_slots(appointment.psychologist_id)
+    call_after_commit(partial(reminder_scheduler.discard, appointment.id))
     return appointment
 
 
@@ -130,4 +168,6 @@ async def complete_appointment(
         conclusion: str) -> Appointment:
     from psychohelp.repositories.appointments import complete_appointment_by_psychologist as repo_complete
     appointment = await repo_complete(appointment_id, psychologist_id, conclusion)
+    await invalidate_slots(appointment.psychologist_id)
+    call_after_commit(partial(reminder_scheduler.discard, appointment.id))
     return appointment
\ No newline at end of file
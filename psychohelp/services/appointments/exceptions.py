@@ -44,3 +44,9 @@ class ApplicationNotFoundException(Exception):
     def __init__(self, application_id):
         self.application_id = application_id
         super().__init__(f"Заявка с ID {application_id} не найдена")
+
+
+class AppointmentSlotTakenException(Exception):
+    def __init__(self, scheduled_time):
+        self.scheduled_time = scheduled_time
+        super().__init__(f"Время {scheduled_time} у психолога уже занято")
@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from html import escape
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from psychohelp.config.config import config, get_async_db
+from psychohelp.config.logging import get_logger
+from psychohelp.repositories.appointments import claim_due_reminders, get_upcoming_reminders
+from psychohelp.services.background import BackgroundTask
+from psychohelp.services.email import EmailPayload
+from psychohelp.services.email_outbox import enqueue_email
+
+
+logger = get_logger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _build_reminder_email(reminder) -> EmailPayload:
+    scheduled = _as_utc(reminder.scheduled_time).astimezone(ZoneInfo(config.SCHEDULE_TIMEZONE))
+    when = scheduled.strftime("%d.%m.%Y %H:%M")
+    text = (
+        f"{reminder.first_name}, напоминаем о записи к психологу.\n\n"
+        f"Время: {when}\n"
+        f"Место: {reminder.venue}"
+    )
+    html = (
+        f"<p>{escape(reminder.first_name)}, напоминаем о записи к психологу.</p>"
+        f"<p>Время: {when}<br>Место: {escape(reminder.venue)}</p>"
+    )
+    return EmailPayload(
+        to=reminder.email,
+        subject="Напоминание о записи",
+        text=text,
+        html=html,
+        sender_alias=config.MAIL_FROM_NAME,
+    )
+
+
+class ReminderScheduler(BackgroundTask):
+    """
+    Напоминания о встречах по remind_time.
+
+    Раз в reload_seconds одним запросом по частичному индексу загружаются
+    напоминания на horizon_seconds вперед и складываются в кучу по времени.
+    Между загрузками планировщик спит до ближайшего напоминания. Новые и
+    отмененные записи этого процесса попадают в кучу сразу (schedule/discard),
+    записи других процессов - со следующей загрузкой. Отправку забирает
+    claim_due_reminders (SKIP LOCKED), поэтому воркеров может быть несколько.
+    """
+
+    def __init__(
+        self,
+        horizon_seconds: float = config.REMINDER_HORIZON_SECONDS,
+        reload_seconds: float = config.REMINDER_RELOAD_SECONDS,
+        batch_size: int = config.REMINDER_BATCH_SIZE,
+        max_loaded: int = config.REMINDER_MAX_LOADED,
+    ) -> None:
+        super().__init__("appointment-reminders")
+        self.horizon = timedelta(seconds=horizon_seconds)
+        self.reload_interval = timedelta(seconds=reload_seconds)
+        self.batch_size = batch_size
+        self.max_loaded = max_loaded
+
+        self._heap: list[tuple[datetime, UUID]] = []
+        # Актуальное время напоминания; записи кучи с другим временем устарели
+        self._pending: dict[UUID, datetime] = {}
+        self._loaded_until: datetime | None = None
+        self._reloaded_at: datetime | None = None
+        self._wakeup: asyncio.Event | None = None
+
+        self.sent = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(self, appointment_id: UUID, remind_time: datetime) -> None:
+        remind_time = _as_utc(remind_time)
+        if self._loaded_until is None or remind_time > self._loaded_until:
+            # Вне загруженного окна - подхватит следующая загрузка
+            self._pending.pop(appointment_id, None)
+            return
+        self._pending[appointment_id] = remind_time
+        heapq.heappush(self._heap, (remind_time, appointment_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def discard(self, appointment_id: UUID) -> None:
+        self._pending.pop(appointment_id, None)
+
+    async def reload(self, now: datetime) -> None:
+        self._reloaded_at = now
+        until = now + self.horizon
+        rows = await get_upcoming_reminders(until, self.max_loaded)
+        if len(rows) == self.max_loaded:
+            # Окно обрезано лимитом: дальше последнего загруженного ничего не знаем
+            until = _as_utc(rows[-1].remind_time)
+
+        self._pending = {row.id: _as_utc(row.remind_time) for row in rows}
+        self._heap = [(remind_time, appointment_id) for appointment_id, remind_time in self._pending.items()]
+        heapq.heapify(self._heap)
+        self._loaded_until = until
+
+    def _pop_due(self, now: datetime) -> list[UUID]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            remind_time, appointment_id = heapq.heappop(self._heap)
+            if self._pending.get(appointment_id) == remind_time:
+                del self._pending[appointment_id]
+                due.append(appointment_id)
+        return due
+
+    def _has_due(self, now: datetime) -> bool:
+        return bool(self._heap) and self._heap[0][0] <= now
+
+    async def run_due(self, now: datetime | None = None) -> int:
+        """Поставить в outbox письма для наступивших напоминаний, вернуть их число"""
+        now = now or datetime.now(timezone.utc)
+        sent = 0
+        while self._has_due(now):
+            due = self._pop_due(now)
+            if not due:
+                continue
+            # Отметка и письма в одной транзакции: напоминание не потеряется и не задвоится
+            async with get_async_db():
+                reminders = await claim_due_reminders(due, now)
+                for reminder in reminders:
+                    await enqueue_email(_build_reminder_email(reminder))
+            sent += len(reminders)
+        self.sent += sent
+        return sent
+
+    def _seconds_until_next(self, now: datetime) -> float:
+        wake_at = (self._reloaded_at or now) + self.reload_interval
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        return max((wake_at - now).total_seconds(), 0.0)
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                if self._reloaded_at is None or now >= self._reloaded_at + self.reload_interval:
+                    await self.reload(now)
+                await self.run_due(now)
+            except Exception:
+                logger.exception("Appointment reminders tick failed")
+
+            self._wakeup.clear()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._seconds_until_next(now))
+
+    def start(self) -> None:
+        if not self.running:
+            self._wakeup = asyncio.Event()
+        super().start()
+
+
+reminder_scheduler = ReminderScheduler()
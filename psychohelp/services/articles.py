@@ -1,11 +1,30 @@
 from uuid import UUID
 
+from sqlalchemy import Row
+
 from psychohelp.models.articles import Article
 from psychohelp.repositories import articles as repo
+from psychohelp.services.cache import invalidate_responses
+
+
+# Префикс закэшированных ответов GET /articles
+CACHE_PREFIX = "/articles"
+
+
+async def get_articles(skip: int = 0, take: int = 100, cursor: str | None = None) -> list[Article]:
+    return await repo.get_articles(skip=skip, take=take, cursor=cursor)
+
+
+def get_next_cursor(articles: list[Article], take: int) -> str | None:
+    return repo.ARTICLES_KEYSET.next_cursor(articles, take)
+
+
+async def search_articles(query: str, take: int = 20, cursor: str | None = None) -> list[Row]:
+    return await repo.search_articles(query, take=take, cursor=cursor)
 
 
-async def get_articles(skip: int = 0, take: int = 100) -> list[Article]:
-    return await repo.get_articles(skip=skip, take=take)
+def get_search_next_cursor(rows: list[Row], take: int) -> str | None:
+    return repo.ARTICLES_SEARCH.next_cursor(rows, take)
 
 
 async def get_article_by_id(article_id: UUID) -> Article | None:
@@ -13,12 +32,20 @@ async def get_article_by_id(article_id: UUID) -> Article | None:
 
 
 async def create_article(article_data: dict) -> Article:
-    return await repo.create_article(article_data)
+    article = await repo.create_article(article_data)
+    await invalidate_responses(CACHE_PREFIX)
+    return article
 
 
 async def update_article(article_id: UUID, article_data: dict) -> Article | None:
-    return await repo.update_article(article_id, article_data)
+    article = await repo.update_article(article_id, article_data)
+    if article is not None:
+        await invalidate_responses(CACHE_PREFIX)
+    return article
 
 
 async def delete_article(article_id: UUID) -> bool:
-    return await repo.delete_article(article_id)
+    deleted = await repo.delete_article(article_id)
+    if deleted:
+        await invalidate_responses(CACHE_PREFIX)
+    return deleted
@@ -1,7 +1,20 @@
+import asyncio
+from contextlib import suppress
 from uuid import UUID
 from datetime import datetime, timezone
-from psychohelp.config.config import get_async_db
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from psychohelp.config.config import config, get_async_db
+from psychohelp.config.logging import get_logger
 from psychohelp.models.application_audit_log import ApplicationAuditLog
+from psychohelp.services.background import BackgroundTask
+
+
+logger = get_logger(__name__)
+
+# Записи буферного режима, ожидающие commit своей транзакции
+_PENDING_KEY = "audit_pending_entries"
 
 
 async def log_application_status_change(
@@ -12,14 +25,140 @@ async def log_application_status_change(
     actor_id: UUID | None,
     comment: str | None = None
 ) -> None:
+    """
+    Записать изменение статуса заявки в журнал.
+
+    transactional: строка добавляется в текущую сессию и уходит в БД при
+    ее flush/commit вместе с обновлением заявки, отдельной транзакции нет.
+    buffered: запись попадает в audit_writer только после commit.
+    """
+    entry = {
+        "application_id": application_id,
+        "previous_status": getattr(previous_status, "value", previous_status),
+        "new_status": getattr(new_status, "value", new_status),
+        "actor_type": actor_type,
+        "actor_id": actor_id,
+        "comment": comment,
+        "timestamp": datetime.now(timezone.utc),
+    }
     async with get_async_db() as session:
-        log_entry = ApplicationAuditLog(
-            application_id=application_id,
-            previous_status=previous_status,
-            new_status=new_status,
-            actor_type=actor_type,
-            actor_id=actor_id,
-            comment=comment
+        if config.AUDIT_WRITE_MODE != "buffered":
+            session.add(ApplicationAuditLog(**entry))
+        elif session.in_transaction():
+            session.info.setdefault(_PENDING_KEY, []).append(entry)
+        else:
+            # Вне транзакции ждать нечего
+            audit_writer.add([entry])
+
+
+async def log_application_status_changes(entries: list[dict]) -> None:
+    """Записать пачку изменений статуса одним INSERT (ключи как у log_application_status_change)"""
+    if not entries:
+        return
+    now = datetime.now(timezone.utc)
+    async with get_async_db() as session:
+        await session.execute(
+            insert(ApplicationAuditLog),
+            [{"comment": None, "timestamp": now, **entry} for entry in entries],
         )
-        session.add(log_entry)
-        await session.commit()
\ No newline at end of file
+
+
+@event.listens_for(Session, "after_commit")
+def _release_pending_entries(session: Session) -> None:
+    entries = session.info.pop(_PENDING_KEY, None)
+    if entries:
+        audit_writer.add(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_entries(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class AuditWriter(BackgroundTask):
+    """
+    Буфер журнала аудита: пишет накопленные записи многострочным INSERT
+    раз в flush_interval_ms или сразу, как набралось batch_size.
+
+    Записи теряются при падении процесса до сброса буфера; при переполнении
+    max_buffer новые записи отбрасываются с предупреждением в лог.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int = config.AUDIT_FLUSH_INTERVAL_MS,
+        batch_size: int = config.AUDIT_BATCH_SIZE,
+        max_buffer: int = config.AUDIT_BUFFER_MAX,
+    ) -> None:
+        super().__init__("audit-writer")
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self._buffer: list[dict] = []
+        self._wakeup: asyncio.Event | None = None
+
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def add(self, entries: list[dict]) -> None:
+        free = self.max_buffer - len(self._buffer)
+        if free < len(entries):
+            self.dropped += len(entries) - max(free, 0)
+            logger.warning("Audit buffer is full, dropped %s entries", len(entries) - max(free, 0))
+            entries = entries[:max(free, 0)]
+        self._buffer.extend(entries)
+        if self._wakeup is not None and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Записать все накопленное, возвращает число записанных строк"""
+        written = 0
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            try:
+                async with get_async_db():
+                    await log_application_status_changes(batch)
+            except Exception:
+                self.failures += 1
+                logger.exception("Failed to write %s audit entries", len(batch))
+                # Вернем пачку в начало буфера, повторим на следующем такте
+                self._buffer[:0] = batch[:max(self.max_buffer - len(self._buffer), 0)]
+                break
+            written += len(batch)
+        self.written += written
+        return written
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "pending": self.pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if not self.running:
+            self._wakeup = asyncio.Event()
+        super().start()
+
+    async def stop(self) -> None:
+        await super().stop()
+        self._wakeup = None
+        # Остаток буфера дописываем при остановке
+        await self.flush()
+
+
+audit_writer = AuditWriter()
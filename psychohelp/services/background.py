@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import suppress
+
+from psychohelp.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class BackgroundTask:
+    """
+    Фоновый цикл процесса: start() из on_startup, stop() из on_shutdown.
+    Наследник реализует _run - бесконечный цикл, который снимается отменой.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+class PeriodicTask(BackgroundTask):
+    """run_once раз в interval_seconds; ошибки считаются в failures и пишутся в лог"""
+
+    def __init__(self, name: str, interval_seconds: float) -> None:
+        super().__init__(name)
+        self.interval_seconds = interval_seconds
+        self.failures = 0
+
+    async def run_once(self) -> object:
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Background task %s failed", self.name)
+            await asyncio.sleep(self.interval_seconds)
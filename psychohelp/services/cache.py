@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from psychohelp.config.config import call_after_commit, config
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    last_modified: str
+
+
+class CacheBackend(Protocol):
+    """
+    Хранилище закэшированных ответов. Методы асинхронные, чтобы на место
+    кэша в памяти процесса можно было подставить общий (Redis и т.п.).
+    """
+
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    async def set(self, key: str, value: CachedResponse, ttl_seconds: float) -> None: ...
+
+    async def delete_prefix(self, prefix: str) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryLRUCache:
+    """LRU-кэш в памяти процесса с TTL на каждую запись."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedResponse, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_backend: CacheBackend = MemoryLRUCache(max_entries=config.HTTP_CACHE_MAX_ENTRIES)
+
+
+def get_response_cache() -> CacheBackend:
+    return _backend
+
+
+def set_response_cache(backend: CacheBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+async def invalidate_responses(*path_prefixes: str) -> None:
+    """
+    Сбросить закэшированные ответы для путей с указанными префиксами.
+
+    Внутри транзакции сброс откладывается до commit: иначе запрос, пришедший
+    между сбросом и commit, снова закэширует старые данные.
+    """
+    async def delete_prefixes() -> None:
+        backend = get_response_cache()
+        for prefix in path_prefixes:
+            await backend.delete_prefix(prefix)
+
+    await call_after_commit(delete_prefixes)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -22,9 +24,18 @@ class EmailPayload:
 
 
 class EmailProvider(Protocol):
+    def is_available(self) -> bool:
+        ...
+
+    def needs_probe(self) -> bool:
+        ...
+
     async def send(self, payload: EmailPayload) -> None:
         ...
 
+    async def aclose(self) -> None:
+        ...
+
 
 def _mail_service_error_detail(logs: list[dict]) -> str:
     for entry in logs:
@@ -37,16 +48,100 @@ def _mail_service_error_detail(logs: list[dict]) -> str:
     return "mail service returned success=false"
 
 
+class MailServiceUnavailable(EmailDeliveryError):
+    """Почтовый сервис недоступен, запросы не отправляются до сброса CircuitBreaker"""
+
+
+class CircuitBreaker:
+    """
+    После failure_threshold ошибок подряд размыкается на reset_timeout_seconds
+    и отклоняет вызовы сразу. Затем пропускает один пробный вызов: успех
+    замыкает цепь, ошибка снова размыкает.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        return self._probing or time.monotonic() - self.opened_at < self.reset_timeout_seconds
+
+    @property
+    def is_half_open(self) -> bool:
+        """Таймаут истек, следующий вызов будет пробным"""
+        return self.opened_at is not None and not self.is_open
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
 class MailServiceHttpProvider:
-    def __init__(self, base_url: str, from_user: str, timeout_seconds: float) -> None:
+    """
+    Отправка через HTTP API почтового сервиса.
+
+    Один httpx.AsyncClient на процесс держит keep-alive соединения, семафор
+    ограничивает число одновременных отправок, CircuitBreaker не дает
+    ждать таймаутов, пока сервис лежит.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        from_user: str,
+        timeout_seconds: float,
+        client: httpx.AsyncClient | None = None,
+        max_in_flight: int = config.MAIL_MAX_IN_FLIGHT,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.from_user = from_user
         self.timeout_seconds = timeout_seconds
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+        )
+        self.breaker = breaker or CircuitBreaker(
+            config.MAIL_CIRCUIT_FAILURE_THRESHOLD, config.MAIL_CIRCUIT_RESET_SECONDS
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    def is_available(self) -> bool:
+        return not self.breaker.is_open
+
+    def needs_probe(self) -> bool:
+        return self.breaker.is_half_open
 
     async def send(self, payload: EmailPayload) -> None:
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                response = await client.post(
+        async with self._in_flight:
+            if not self.breaker.allow():
+                raise MailServiceUnavailable("mail service circuit is open")
+            try:
+                response = await self.client.post(
                     f"{self.base_url}/message",
                     params={"from": self.from_user, "to": payload.to},
                     json={
@@ -58,18 +153,66 @@ class MailServiceHttpProvider:
                 )
                 response.raise_for_status()
                 data = response.json()
-        except (httpx.HTTPError, ValueError) as exc:
-            raise EmailDeliveryError("mail service request failed") from exc
+            except (httpx.HTTPError, ValueError) as exc:
+                self.breaker.record_failure()
+                raise EmailDeliveryError("mail service request failed") from exc
+            # Сервис ответил - он жив, даже если письмо не доставлено адресату
+            self.breaker.record_success()
 
         if not data.get("success"):
             raise EmailDeliveryError(
                 _mail_service_error_detail(data.get("logs") or [])
             )
 
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class StubEmailProvider:
+    """Ничего не отправляет, только запоминает письма (тесты и локальный запуск)"""
+
+    def __init__(self) -> None:
+        self.sent: list[EmailPayload] = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def needs_probe(self) -> bool:
+        return False
+
+    async def send(self, payload: EmailPayload) -> None:
+        self.sent.append(payload)
+
+    async def aclose(self) -> None:
+        pass
+
+
+_email_provider: EmailProvider | None = None
+
 
 def get_email_provider() -> EmailProvider:
-    return MailServiceHttpProvider(
-        base_url=config.MAIL_SERVICE_URL,
-        from_user=config.MAIL_SERVICE_FROM_USER,
-        timeout_seconds=config.MAIL_REQUEST_TIMEOUT_SECONDS,
-    )
+    """Почтовый провайдер процесса, создается при первом обращении"""
+    global _email_provider
+    if _email_provider is None:
+        if config.MAIL_PROVIDER == "stub":
+            _email_provider = StubEmailProvider()
+        else:
+            _email_provider = MailServiceHttpProvider(
+                base_url=config.MAIL_SERVICE_URL,
+                from_user=config.MAIL_SERVICE_FROM_USER,
+                timeout_seconds=config.MAIL_REQUEST_TIMEOUT_SECONDS,
+            )
+    return _email_provider
+
+
+def set_email_provider(provider: EmailProvider | None) -> None:
+    global _email_provider
+    _email_provider = provider
+
+
+async def close_email_provider() -> None:
+    """Закрыть соединения провайдера при остановке приложения"""
+    global _email_provider
+    if _email_provider is not None:
+        await _email_provider.aclose()
+        _email_provider = None
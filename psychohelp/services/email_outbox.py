@@ -0,0 +1,194 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import UUID
+
+from psychohelp.config.config import config, get_async_db
+from psychohelp.config.logging import get_logger
+from psychohelp.models.email_outbox import EmailOutbox
+from psychohelp.repositories.email_outbox import (
+    claim_pending_emails,
+    create_outbox_email,
+    mark_email_failed,
+    mark_emails_sent,
+    purge_finished_emails,
+    release_emails,
+)
+from psychohelp.repositories.password_reset_tokens import invalidate_password_reset_token
+from psychohelp.services.background import BackgroundTask
+from psychohelp.services.email import EmailPayload, EmailProvider, MailServiceUnavailable, get_email_provider
+
+
+logger = get_logger(__name__)
+
+
+async def enqueue_email(payload: EmailPayload, password_reset_token_id: UUID | None = None) -> EmailOutbox:
+    """
+    Поставить письмо в очередь на отправку.
+
+    Запись попадает в текущую транзакцию: письмо уйдет только если она
+    зафиксируется, а сам запрос не ждет почтовый сервис.
+    """
+    return await create_outbox_email(
+        recipient=payload.to,
+        subject=payload.subject,
+        text=payload.text,
+        html=payload.html,
+        sender_alias=payload.sender_alias,
+        password_reset_token_id=password_reset_token_id,
+    )
+
+
+class EmailOutboxDispatcher(BackgroundTask):
+    """
+    Фоновая отправка писем из email_outbox.
+
+    Письма забираются пачками, отправляются параллельно; при ошибке письмо
+    откладывается с экспоненциальной задержкой, после max_attempts попыток
+    помечается как dead и больше не отправляется. Отправленные и dead письма
+    старше retention_days раз в purge_interval_seconds удаляются.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[[], EmailProvider] = get_email_provider,
+        batch_size: int = config.EMAIL_OUTBOX_BATCH_SIZE,
+        poll_interval_seconds: float = config.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts: int = config.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_base_seconds: float = config.EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = config.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+        lease_seconds: float = config.EMAIL_OUTBOX_LEASE_SECONDS,
+        retention_days: float = config.EMAIL_OUTBOX_RETENTION_DAYS,
+        purge_interval_seconds: float = config.EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__("email-outbox-dispatcher")
+        self.provider_factory = provider_factory
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.lease_seconds = lease_seconds
+        self.retention_days = retention_days
+        self.purge_interval_seconds = purge_interval_seconds
+        self._purged_monotonic: float | None = None
+
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+        self.purged = 0
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Задержка перед следующей попыткой: base * 2^(n-1) с разбросом, не больше max"""
+        delay = min(self.backoff_base_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def dispatch_batch(self, now: datetime | None = None) -> int:
+        """Отправить одну пачку писем, вернуть их количество"""
+        now = now or datetime.now(timezone.utc)
+        provider = self.provider_factory()
+        if not provider.is_available():
+            # Сервис недоступен - не тратим попытки писем, ждем сброса CircuitBreaker
+            return 0
+
+        # Полуоткрытый CircuitBreaker пропустит только один пробный вызов:
+        # остальные письма пачки отклонились бы без обращения к сервису
+        limit = 1 if provider.needs_probe() else self.batch_size
+        emails = await claim_pending_emails(
+            now, limit, now + timedelta(seconds=self.lease_seconds)
+        )
+        if not emails:
+            return 0
+
+        results = await asyncio.gather(
+            *(provider.send(self._payload(email)) for email in emails),
+            return_exceptions=True,
+        )
+
+        async with get_async_db():
+            sent_ids = []
+            released_ids = []
+            for email, result in zip(emails, results):
+                if not isinstance(result, Exception):
+                    sent_ids.append(email.id)
+                    continue
+                if isinstance(result, MailServiceUnavailable):
+                    # Письмо не отправлялось: цепь разомкнулась посреди пачки
+                    released_ids.append(email.id)
+                    continue
+
+                self.failed += 1
+                if email.attempts >= self.max_attempts:
+                    self.dead += 1
+                    logger.error(
+                        "Email %s moved to dead letter after %s attempts: %r", email.id, email.attempts, result
+                    )
+                    await mark_email_failed(email.id, repr(result), None)
+                    if email.password_reset_token_id is not None:
+                        # Письмо со ссылкой не дошло - токен не должен оставаться рабочим
+                        await invalidate_password_reset_token(email.password_reset_token_id, now)
+                else:
+                    logger.warning("Email %s delivery failed, attempt %s: %r", email.id, email.attempts, result)
+                    await mark_email_failed(email.id, repr(result), now + self.backoff(email.attempts))
+
+            await mark_emails_sent(sent_ids, now)
+            await release_emails(released_ids, now)
+            self.sent += len(sent_ids)
+
+        return len(emails)
+
+    async def purge(self, now: datetime | None = None, batch_size: int = 1000) -> int:
+        """Удалить отправленные и dead письма старше retention_days"""
+        before = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+        purged = 0
+        while True:
+            deleted = await purge_finished_emails(before, batch_size)
+            purged += deleted
+            if deleted < batch_size:
+                break
+        self._purged_monotonic = time.monotonic()
+        self.purged += purged
+        if purged:
+            logger.info("Purged %s delivered or dead emails from outbox", purged)
+        return purged
+
+    @property
+    def purge_due(self) -> bool:
+        return (
+            self._purged_monotonic is None
+            or time.monotonic() - self._purged_monotonic >= self.purge_interval_seconds
+        )
+
+    @staticmethod
+    def _payload(email: EmailOutbox) -> EmailPayload:
+        return EmailPayload(
+            to=email.recipient,
+            subject=email.subject,
+            text=email.text,
+            html=email.html,
+            sender_alias=email.sender_alias,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.dispatch_batch()
+            except Exception:
+                # БД или сеть недоступны - пробуем снова на следующем тике
+                logger.exception("Email outbox dispatch failed")
+                processed = 0
+
+            if self.purge_due:
+                try:
+                    await self.purge()
+                except Exception:
+                    logger.exception("Email outbox purge failed")
+                    self._purged_monotonic = time.monotonic()
+
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+
+email_outbox_dispatcher = EmailOutboxDispatcher()
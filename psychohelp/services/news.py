@@ -1,11 +1,30 @@
 from uuid import UUID
 
+from sqlalchemy import Row
+
 from psychohelp.models.news import News
 from psychohelp.repositories import news as news_repo
+from psychohelp.services.cache import invalidate_responses
+
+
+# Префикс закэшированных ответов GET /news
+CACHE_PREFIX = "/news"
+
+
+async def get_news_list(skip: int = 0, take: int = 100, cursor: str | None = None) -> list[News]:
+    return await news_repo.get_news_list(skip, take, cursor)
+
+
+def get_next_cursor(news_list: list[News], take: int) -> str | None:
+    return news_repo.NEWS_KEYSET.next_cursor(news_list, take)
+
+
+async def search_news(query: str, take: int = 20, cursor: str | None = None) -> list[Row]:
+    return await news_repo.search_news(query, take, cursor)
 
 
-async def get_news_list(skip: int = 0, take: int = 100) -> list[News]:
-    return await news_repo.get_news_list(skip, take)
+def get_search_next_cursor(rows: list[Row], take: int) -> str | None:
+    return news_repo.NEWS_SEARCH.next_cursor(rows, take)
 
 
 async def get_news_by_id(news_id: UUID) -> News | None:
@@ -13,12 +32,20 @@ async def get_news_by_id(news_id: UUID) -> News | None:
 
 
 async def create_news(news_data: dict) -> News:
-    return await news_repo.create_news(news_data)
+    news_item = await news_repo.create_news(news_data)
+    await invalidate_responses(CACHE_PREFIX)
+    return news_item
 
 
 async def update_news(news_id: UUID, news_data: dict) -> News | None:
-    return await news_repo.update_news(news_id, news_data)
+    news_item = await news_repo.update_news(news_id, news_data)
+    if news_item is not None:
+        await invalidate_responses(CACHE_PREFIX)
+    return news_item
 
 
 async def delete_news(news_id: UUID) -> bool:
-    return await news_repo.delete_news(news_id)
\ No newline at end of file
+    deleted = await news_repo.delete_news(news_id)
+    if deleted:
+        await invalidate_responses(CACHE_PREFIX)
+    return deleted
\ No newline at end of file
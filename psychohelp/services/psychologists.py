@@ -1,12 +1,26 @@
+from functools import partial
 from uuid import UUID
 
+from psychohelp.config.config import call_after_commit
 from psychohelp.models.psychologists import Psychologist
+from psychohelp.repositories.psychologists.directory import (
+    DirectoryFilters,
+    get_facet_counts as repo_get_facet_counts,
+    search_psychologists as repo_search_psychologists,
+)
 from psychohelp.repositories.psychologists.psychologists import (
     get_psychologist_by_id as repo_get_psychologist_by_id,
     get_psychologists as repo_get_psychologists,
     create_psychologist as repo_create_psychologist,
     delete_psychologist as repo_delete_psychologist,
+    PSYCHOLOGISTS_KEYSET,
 )
+from psychohelp.services.cache import invalidate_responses
+from psychohelp.services.rbac.cache import permission_cache
+
+
+# Префикс закэшированных ответов GET /therapists
+CACHE_PREFIX = "/therapists"
 
 
 async def get_psychologist_by_id(psychologist_id: UUID) -> Psychologist | None:
@@ -22,25 +36,56 @@ async def get_psychologist_by_id(psychologist_id: UUID) -> Psychologist | None:
     return await repo_get_psychologist_by_id(psychologist_id)
 
 
-async def get_psychologists(skip: int = 0, take: int = 10) -> list[Psychologist]:
+async def get_psychologists(
+    skip: int = 0, take: int = 10, cursor: str | None = None
+) -> list[Psychologist]:
     """
     Получить список всех психологов с пагинацией
     
     Args:
         skip: Количество записей для пропуска
         take: Количество записей для получения
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы (skip тогда не учитывается)
         
     Returns:
         list[Psychologist]: Список ORM моделей психологов
     """
-    psychologists = await repo_get_psychologists(skip=skip, take=take)
+    psychologists = await repo_get_psychologists(skip=skip, take=take, cursor=cursor)
     return list(psychologists)
 
 
+def get_next_cursor(psychologists: list[Psychologist], take: int) -> str | None:
+    return PSYCHOLOGISTS_KEYSET.next_cursor(psychologists, take)
+
+
+async def get_directory(
+    filters: DirectoryFilters, take: int = 20, cursor: str | None = None
+) -> tuple[list[Psychologist], dict[str, list[tuple[str, int]]]]:
+    """
+    Страница каталога психологов и счетчики фасетов для тех же фильтров
+
+    Returns:
+        (психологи с user и consult_area_tags, {фасет: [(значение, число психологов)]})
+    """
+    psychologists = await repo_search_psychologists(filters, take=take, cursor=cursor)
+    facets = await repo_get_facet_counts(filters)
+    return psychologists, facets
+
+
 async def create_psychologist(user_id: UUID, psychologist_data: dict) -> Psychologist:
-    return await repo_create_psychologist(user_id, psychologist_data)
+    psychologist = await repo_create_psychologist(user_id, psychologist_data)
+    # Пользователь получил роль psychologist
+    await call_after_commit(partial(permission_cache.invalidate_user, user_id))
+    await invalidate_responses(CACHE_PREFIX)
+    return psychologist
 
 
 async def delete_psychologist(psychologist_id: UUID) -> bool:
-    return await repo_delete_psychologist(psychologist_id)
+    psychologist = await repo_get_psychologist_by_id(psychologist_id)
+    deleted = await repo_delete_psychologist(psychologist_id)
+    if deleted and psychologist is not None:
+        await call_after_commit(partial(permission_cache.invalidate_user, psychologist.user_id))
+    if deleted:
+        await invalidate_responses(CACHE_PREFIX)
+    return deleted
 
@@ -0,0 +1,70 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryLog:
+    """SQL-запросы, выполненные внутри track_queries()"""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """
+        Одинаковый текст запроса, выполненный threshold и более раз.
+
+        Параметры в текст не входят, поэтому загрузка связей по одной
+        строке в цикле (N+1) выглядит как повтор одного запроса.
+        """
+        return {
+            statement: count
+            for statement, count in Counter(self.statements).items()
+            if count >= threshold
+        }
+
+    def report(self) -> str:
+        return "\n".join(f"{index}. {statement}" for index, statement in enumerate(self.statements, 1))
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, log: QueryLog, max_queries: int) -> None:
+        self.log = log
+        self.max_queries = max_queries
+        super().__init__(f"Выполнено {log.count} SQL-запросов при лимите {max_queries}:\n{log.report()}")
+
+
+# Вложенные track_queries() видят одни и те же запросы
+_active_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryLog]:
+    """Для тестов: упасть, если внутри блока выполнено больше max_queries запросов"""
+    with track_queries() as log:
+        yield log
+    if log.count > max_queries:
+        raise QueryBudgetExceeded(log, max_queries)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    for log in _active_logs.get():
+        log.statements.append(statement)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from uuid import UUID
+
+from psychohelp.config.config import config
+from psychohelp.repositories.rbac.rbac import (
+    get_role_permission_codes as repo_get_role_permission_codes,
+    get_user_role_ids as repo_get_user_role_ids,
+)
+
+
+class PermissionCache:
+    """
+    Кэш прав в памяти процесса.
+
+    Соответствие роль -> права загружается один раз из roles_permissions,
+    роли пользователя кэшируются с TTL и сбрасываются при изменении ролей.
+    """
+
+    def __init__(self, user_ttl_seconds: float, max_users: int) -> None:
+        self.user_ttl_seconds = user_ttl_seconds
+        self.max_users = max_users
+        self._role_permissions: dict[UUID, frozenset[str]] | None = None
+        self._role_codes: dict[UUID, str] = {}
+        self._code_permissions: dict[str, frozenset[str]] = {}
+        self._users: dict[UUID, tuple[float, frozenset[UUID], frozenset[str]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _ensure_roles_loaded(self) -> dict[UUID, frozenset[str]]:
+        if self._role_permissions is not None:
+            return self._role_permissions
+
+        async with self._lock:
+            if self._role_permissions is None:
+                rows = await repo_get_role_permission_codes()
+                grouped: dict[UUID, set[str]] = {}
+                role_codes: dict[UUID, str] = {}
+                for role_id, role_code, permission_code in rows:
+                    role_codes[role_id] = role_code
+                    permissions = grouped.setdefault(role_id, set())
+                    if permission_code is not None:
+                        permissions.add(permission_code)
+
+                self._role_codes = role_codes
+                self._code_permissions = {
+                    role_codes[role_id]: frozenset(codes)
+                    for role_id, codes in grouped.items()
+                }
+                self._role_permissions = {
+                    role_id: frozenset(codes) for role_id, codes in grouped.items()
+                }
+        return self._role_permissions
+
+    async def _get_user_entry(self, user_id: UUID) -> tuple[frozenset[UUID], frozenset[str]]:
+        now = time.monotonic()
+        entry = self._users.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1], entry[2]
+
+        role_permissions = await self._ensure_roles_loaded()
+        role_ids = frozenset(await repo_get_user_role_ids(user_id))
+        permissions = frozenset().union(
+            *(role_permissions.get(role_id, frozenset()) for role_id in role_ids)
+        )
+
+        if len(self._users) >= self.max_users:
+            self._users.pop(next(iter(self._users)))
+        self._users[user_id] = (now + self.user_ttl_seconds, role_ids, permissions)
+        return role_ids, permissions
+
+    async def get_user_permissions(self, user_id: UUID) -> frozenset[str]:
+        _, permissions = await self._get_user_entry(user_id)
+        return permissions
+
+    async def get_user_role_codes(self, user_id: UUID) -> frozenset[str]:
+        role_ids, _ = await self._get_user_entry(user_id)
+        return frozenset(
+            self._role_codes[role_id] for role_id in role_ids if role_id in self._role_codes
+        )
+
+    async def get_role_codes_permissions(self, role_codes) -> frozenset[str]:
+        """Права для набора кодов ролей (без обращения к ролям пользователя)."""
+        await self._ensure_roles_loaded()
+        return frozenset().union(
+            *(self._code_permissions.get(code, frozenset()) for code in role_codes)
+        )
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self._users.pop(user_id, None)
+
+    def invalidate_roles(self) -> None:
+        self._role_permissions = None
+        self._role_codes = {}
+        self._code_permissions = {}
+        self._users.clear()
+
+
+permission_cache = PermissionCache(
+    user_ttl_seconds=config.RBAC_USER_CACHE_TTL_SECONDS,
+    max_users=config.RBAC_USER_CACHE_MAX_ENTRIES,
+)
@@ -5,15 +5,14 @@ from fastapi import HTTPException, Request
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_401_UNAUTHORIZED
 
 from psychohelp.repositories import get_user_id_from_token
-from psychohelp.repositories.rbac.rbac import (
-    get_user_permissions as repo_get_user_permissions,
-)
+from psychohelp.services.rbac.cache import permission_cache
 from psychohelp.constants.rbac import PermissionCode
+from psychohelp.services.users.models import CurrentPrincipal
 
 
-async def get_user_permissions(user_id: UUID) -> list[str]:
-    """Return all permission codes granted to user via roles."""
-    return await repo_get_user_permissions(user_id)
+async def get_user_permissions(user_id: UUID) -> frozenset[str]:
+    """Return all permission codes granted to user via roles (cached)."""
+    return await permission_cache.get_user_permissions(user_id)
 
 
 async def user_has_permission(user_id: UUID, permission_code: PermissionCode) -> bool:
@@ -36,6 +35,7 @@ def require_permission(permission_code: PermissionCode):
         async def wrapper(*args, **kwargs):
             request = kwargs.get("request")
             current_user = kwargs.get("current_user")
+            principal = kwargs.get("principal")
 
             if request is None:
                 for arg in args:
@@ -43,31 +43,46 @@ def require_permission(permission_code: PermissionCode):
                         request = arg
                         break
 
-            if current_user is not None and getattr(current_user, "id", None):
-                user_id = current_user.id
+            # Пользователь уже загружен зависимостью авторизации в этом запросе
+            identity = getattr(getattr(request, "state", None), "identity", None)
+
+            if identity is not None:
+                has_permission = await identity.has_permission(permission_code)
+            elif principal is not None:
+                # Роли уже известны из access-токена - в БД не ходим
+                has_permission = await principal.has_permission(permission_code)
+            elif getattr(current_user, "roles", None) is not None:
+                # Роли загружены вместе с пользователем
+                has_permission = await CurrentPrincipal.from_user(current_user).has_permission(
+                    permission_code
+                )
             else:
-                if request is None:
-                    raise HTTPException(
-                        status_code=HTTP_401_UNAUTHORIZED,
-                        detail="Не авторизован",
-                    )
-
-                token = request.cookies.get("access_token")
-                if not token:
-                    raise HTTPException(
-                        status_code=HTTP_401_UNAUTHORIZED,
-                        detail="Не авторизован",
-                    )
-
-                try:
-                    user_id = get_user_id_from_token(token)
-                except Exception:
-                    raise HTTPException(
-                        status_code=HTTP_401_UNAUTHORIZED,
-                        detail="Невалидный токен",
-                    )
-
-            has_permission = await user_has_permission(user_id, permission_code)
+                if current_user is not None and getattr(current_user, "id", None):
+                    user_id = current_user.id
+                else:
+                    if request is None:
+                        raise HTTPException(
+                            status_code=HTTP_401_UNAUTHORIZED,
+                            detail="Не авторизован",
+                        )
+
+                    token = request.cookies.get("access_token")
+                    if not token:
+                        raise HTTPException(
+                            status_code=HTTP_401_UNAUTHORIZED,
+                            detail="Не авторизован",
+                        )
+
+                    try:
+                        user_id = get_user_id_from_token(token)
+                    except Exception:
+                        raise HTTPException(
+                            status_code=HTTP_401_UNAUTHORIZED,
+                            detail="Невалидный токен",
+                        )
+
+                has_permission = await user_has_permission(user_id, permission_code)
+
             if not has_permission:
                 raise HTTPException(
                     status_code=HTTP_403_FORBIDDEN,
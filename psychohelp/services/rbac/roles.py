@@ -0,0 +1,26 @@
+from functools import partial
+from uuid import UUID
+
+from psychohelp.config.config import call_after_commit
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.repositories.rbac.rbac import (
+    assign_role_to_user as repo_assign_role_to_user,
+    remove_role_from_user as repo_remove_role_from_user,
+)
+from psychohelp.services.rbac.cache import permission_cache
+
+
+async def assign_role_to_user(user_id: UUID, role_code: RoleCode) -> bool:
+    """Назначить роль и сбросить закэшированные права пользователя после commit."""
+    assigned = await repo_assign_role_to_user(user_id, role_code)
+    if assigned:
+        await call_after_commit(partial(permission_cache.invalidate_user, user_id))
+    return assigned
+
+
+async def remove_role_from_user(user_id: UUID, role_code: RoleCode) -> bool:
+    """Убрать роль и сбросить закэшированные права пользователя после commit."""
+    removed = await repo_remove_role_from_user(user_id, role_code)
+    if removed:
+        await call_after_commit(partial(permission_cache.invalidate_user, user_id))
+    return removed
@@ -0,0 +1,4 @@
+class InvalidSlotRangeException(Exception):
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Некорректный период поиска слотов: {reason}")
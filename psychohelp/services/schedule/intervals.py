@@ -0,0 +1,31 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """
+    Индекс полуоткрытых интервалов [start, end) для проверки пересечений.
+
+    Интервалы отсортированы по началу, рядом хранится префиксный максимум концов.
+    С [start, end) могут пересекаться только интервалы, начавшиеся до end (это
+    префикс массива), и пересечение есть, если хотя бы один из них закончился
+    после start. Построение O(n log n), проверка O(log n).
+    """
+
+    __slots__ = ("_starts", "_max_ends")
+
+    def __init__(self, intervals: Iterable[tuple[T, T]]) -> None:
+        ordered = sorted(intervals)
+        self._starts = [start for start, _ in ordered]
+        self._max_ends = list(accumulate((end for _, end in ordered), max))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: T, end: T) -> bool:
+        """Есть ли интервал, пересекающийся с [start, end)"""
+        count = bisect_left(self._starts, end)
+        return count > 0 and self._max_ends[count - 1] > start
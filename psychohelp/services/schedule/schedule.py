@@ -0,0 +1,125 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from psychohelp.config.config import config
+from psychohelp.models.working_hours import WorkingHours
+from psychohelp.repositories.appointments import get_busy_intervals
+from psychohelp.repositories.psychologists.working_hours import (
+    get_working_hours as repo_get_working_hours,
+    replace_working_hours as repo_replace_working_hours,
+)
+from psychohelp.services.cache import invalidate_responses
+from psychohelp.services.schedule.exceptions import InvalidSlotRangeException
+from psychohelp.services.schedule.intervals import IntervalIndex
+from psychohelp.services.schedule.models import Slot
+
+
+SLOTS_CACHE_PREFIX = "/therapists/slots"
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _validate_range(start: datetime, end: datetime) -> tuple[datetime, datetime]:
+    start, end = _as_utc(start), _as_utc(end)
+    if start >= end:
+        raise InvalidSlotRangeException("начало должно быть раньше конца")
+    if end - start > timedelta(days=config.SLOTS_MAX_RANGE_DAYS):
+        raise InvalidSlotRangeException(
+            f"период не может быть длиннее {config.SLOTS_MAX_RANGE_DAYS} дней"
+        )
+    return start, end
+
+
+def build_slots(
+    working_hours: list[WorkingHours],
+    busy: IntervalIndex[datetime],
+    start: datetime,
+    end: datetime,
+    tz: ZoneInfo,
+    duration: timedelta | None = None,
+) -> list[Slot]:
+    """
+    Свободные слоты в [start, end) по шаблону рабочих часов за вычетом занятых интервалов.
+
+    Слот длится столько же, сколько встреча (APPOINTMENT_DURATION_MINUTES), иначе
+    запись на него пересечется с соседней встречей или выйдет за конец рабочего
+    времени; slot_minutes шаблона - только шаг между началами слотов.
+    """
+    duration = duration or timedelta(minutes=config.APPOINTMENT_DURATION_MINUTES)
+    by_weekday = defaultdict(list)
+    for item in working_hours:
+        by_weekday[item.weekday].append(
+            (item.start_time, item.end_time, timedelta(minutes=item.slot_minutes))
+        )
+
+    slots = []
+    day = start.astimezone(tz).date()
+    last_day = end.astimezone(tz).date()
+    while day <= last_day:
+        for start_time, end_time, step in by_weekday.get(day.weekday(), ()):
+            slot_start = datetime.combine(day, start_time, tzinfo=tz).astimezone(timezone.utc)
+            day_end = datetime.combine(day, end_time, tzinfo=tz).astimezone(timezone.utc)
+            while slot_start + duration <= day_end:
+                slot_end = slot_start + duration
+                if slot_start >= start and slot_end <= end and not busy.overlaps(slot_start, slot_end):
+                    slots.append(Slot(slot_start, slot_end))
+                slot_start += step
+        day += timedelta(days=1)
+
+    slots.sort(key=lambda slot: slot.start)
+    return slots
+
+
+async def get_free_slots(
+    start: datetime,
+    end: datetime,
+    psychologist_id: UUID | None = None,
+    now: datetime | None = None,
+) -> dict[UUID, list[Slot]]:
+    """
+    Свободные слоты психолога (или всех психологов с заданным расписанием).
+
+    Два запроса: шаблоны рабочих часов и ожидающие встречи периода. Занятость
+    каждого психолога собирается в IntervalIndex, слоты проверяются по нему в памяти.
+    """
+    start, end = _validate_range(start, end)
+    # Прошедшее время не предлагаем
+    start = max(start, _as_utc(now or datetime.now(timezone.utc)))
+    if start >= end:
+        return {}
+
+    working_hours = defaultdict(list)
+    for item in await repo_get_working_hours(psychologist_id):
+        working_hours[item.psychologist_id].append(item)
+
+    busy = defaultdict(list)
+    for row in await get_busy_intervals(start, end, psychologist_id):
+        busy[row.psychologist_id].append(
+            (_as_utc(row.scheduled_time), _as_utc(row.scheduled_end_time))
+        )
+
+    tz = ZoneInfo(config.SCHEDULE_TIMEZONE)
+    return {
+        owner_id: build_slots(items, IntervalIndex(busy[owner_id]), start, end, tz)
+        for owner_id, items in working_hours.items()
+    }
+
+
+async def get_working_hours(psychologist_id: UUID) -> list[WorkingHours]:
+    return await repo_get_working_hours(psychologist_id)
+
+
+async def set_working_hours(psychologist_id: UUID, rows: list[dict]) -> list[WorkingHours]:
+    working_hours = await repo_replace_working_hours(psychologist_id, rows)
+    await invalidate_slots(psychologist_id)
+    await invalidate_responses(f"/therapists/{psychologist_id}/working-hours")
+    return working_hours
+
+
+async def invalidate_slots(psychologist_id: UUID) -> None:
+    """Сбросить закэшированные ответы со слотами после изменения занятости"""
+    await invalidate_responses(SLOTS_CACHE_PREFIX, f"/therapists/{psychologist_id}/slots")
@@ -0,0 +1,180 @@
+import time
+from datetime import date, datetime, timezone
+from itertools import chain
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from psychohelp.config.config import config
+from psychohelp.config.logging import get_logger
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.appointments import Appointment
+from psychohelp.repositories import statistics as repo
+from psychohelp.services.background import PeriodicTask
+
+
+logger = get_logger(__name__)
+
+# Изменения этих моделей делают статистику устаревшей
+TRACKED_MODELS = (Application, Appointment)
+_CHANGED_KEY = "statistics_changed"
+
+
+class StatisticsRefresher(PeriodicTask):
+    """
+    Обновляет материализованные представления статистики.
+
+    Обновление идет, только если с прошлого раза были закоммичены изменения
+    заявок или встреч (см. слушатели сессии ниже), и не реже чем раз в
+    max_age_seconds - на случай изменений в обход ORM.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = config.STATISTICS_REFRESH_INTERVAL_SECONDS,
+        max_age_seconds: float = config.STATISTICS_MAX_AGE_SECONDS,
+    ) -> None:
+        super().__init__("statistics-refresher", interval_seconds)
+        self.max_age_seconds = max_age_seconds
+        # После перезапуска неизвестно, что менялось, пока процесс не работал
+        self._dirty = True
+        self._refreshed_monotonic: float | None = None
+
+        self.refreshes = 0
+        self.last_refresh_at: datetime | None = None
+        self.last_duration_seconds: float | None = None
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    @property
+    def needs_refresh(self) -> bool:
+        if self._dirty or self._refreshed_monotonic is None:
+            return True
+        return time.monotonic() - self._refreshed_monotonic >= self.max_age_seconds
+
+    async def refresh(self) -> None:
+        # Сбрасываем до обновления: изменения во время REFRESH попадут в следующий
+        self._dirty = False
+        started = time.perf_counter()
+        try:
+            refreshed = await repo.refresh_statistics_views()
+        except Exception:
+            self._dirty = True
+            raise
+        self._refreshed_monotonic = time.monotonic()
+        if not refreshed:
+            # Представления как раз обновляет другой воркер
+            logger.debug("Statistics views are being refreshed by another worker")
+            return
+        self.last_duration_seconds = time.perf_counter() - started
+        self.last_refresh_at = datetime.now(timezone.utc)
+        self.refreshes += 1
+        logger.debug("Statistics views refreshed in %.3fs", self.last_duration_seconds)
+
+    async def run_once(self) -> bool:
+        if not self.needs_refresh:
+            return False
+        await self.refresh()
+        return True
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "dirty": self._dirty,
+            "last_refresh_at": self.last_refresh_at,
+            "last_duration_seconds": self.last_duration_seconds,
+        }
+
+    def start(self) -> None:
+        if config.SCHEDULE_TIMEZONE != repo.WEEKLY_LOAD_TIMEZONE:
+            raise ValueError(
+                f"Статистика по неделям считается в {repo.WEEKLY_LOAD_TIMEZONE}, а SCHEDULE_TIMEZONE "
+                f"= {config.SCHEDULE_TIMEZONE}: нужна миграция statistics_psychologist_weekly_load"
+            )
+        super().start()
+
+
+statistics_refresher = StatisticsRefresher()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session: Session, flush_context) -> None:
+    if any(isinstance(obj, TRACKED_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_changes(orm_execute_state) -> None:
+    # update()/delete() по модели, например пакетное истечение заявок
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, TRACKED_MODELS):
+        orm_execute_state.session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_statistics_dirty(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        statistics_refresher.mark_dirty()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def _rate(part: int, total: int) -> float | None:
+    return round(part / total, 4) if total else None
+
+
+def _hours(seconds: float | None) -> float | None:
+    return round(seconds / 3600, 2) if seconds is not None else None
+
+
+def _counts(totals: dict[str, int]) -> list[dict]:
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+async def get_application_statistics() -> dict:
+    """Заявки по статусам и статусу в университете, доля отмененных, медианы сроков"""
+    by_status: dict[str, int] = {}
+    by_university_status: dict[str, int] = {}
+    for row in await repo.get_application_counts():
+        by_status[row.status] = by_status.get(row.status, 0) + row.applications
+        by_university_status[row.university_status] = (
+            by_university_status.get(row.university_status, 0) + row.applications
+        )
+    total = sum(by_status.values())
+    durations = await repo.get_application_durations()
+
+    return {
+        "total": total,
+        "by_status": _counts(by_status),
+        "by_university_status": _counts(by_university_status),
+        "cancellation_rate": _rate(by_status.get(ApplicationStatus.CANCELLED.value, 0), total),
+        "median_hours_to_in_progress": _hours(durations.median_seconds_to_in_progress if durations else None),
+        "median_hours_to_completed": _hours(durations.median_seconds_to_completed if durations else None),
+        "refreshed_at": durations.refreshed_at if durations else None,
+    }
+
+
+async def get_psychologist_load(
+    date_from: date, date_to: date, psychologist_id: UUID | None = None
+) -> dict:
+    """Встречи психологов по неделям и доля отмененных за период"""
+    weeks = await repo.get_psychologist_weekly_load(date_from, date_to, psychologist_id)
+    appointments = sum(row.appointments for row in weeks)
+    cancelled = sum(row.cancelled for row in weeks)
+    return {
+        "weeks": weeks,
+        "appointments": appointments,
+        "cancelled": cancelled,
+        "cancellation_rate": _rate(cancelled, appointments),
+    }
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from uuid import UUID
 
+from psychohelp.constants.rbac import PermissionCode, RoleCode
 from psychohelp.models.users import User
+from psychohelp.services.rbac.cache import permission_cache
 
 
 @dataclass(frozen=True, slots=True)
@@ -8,3 +11,50 @@ class UserWithToken:
     user: User
     token: str
     refresh_token: str
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentPrincipal:
+    """Кто делает запрос: id пользователя и коды его ролей из access-токена."""
+
+    user_id: UUID
+    role_codes: frozenset[str]
+
+    @property
+    def id(self) -> UUID:
+        return self.user_id
+
+    def has_role(self, role_code: RoleCode | str) -> bool:
+        return getattr(role_code, "value", role_code) in self.role_codes
+
+    def has_any_role(self, *role_codes: RoleCode | str) -> bool:
+        return any(self.has_role(role_code) for role_code in role_codes)
+
+    async def has_permission(self, permission_code: PermissionCode) -> bool:
+        permissions = await permission_cache.get_role_codes_permissions(self.role_codes)
+        return permission_code.value in permissions
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentPrincipal":
+        return cls(
+            user_id=user.id,
+            role_codes=frozenset(
+                getattr(role.code, "value", role.code) for role in (user.roles or [])
+            ),
+        )
+
+
+@dataclass(slots=True)
+class RequestIdentity:
+    """Пользователь текущего запроса, один раз на запрос (request.state.identity)."""
+
+    principal: CurrentPrincipal
+    user: User | None = None
+    permissions: frozenset[str] | None = None
+
+    async def has_permission(self, permission_code: PermissionCode) -> bool:
+        if self.permissions is None:
+            self.permissions = await permission_cache.get_role_codes_permissions(
+                self.principal.role_codes
+            )
+        return permission_code.value in self.permissions
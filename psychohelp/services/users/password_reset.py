@@ -5,10 +5,11 @@ from secrets import token_urlsafe
 
 from psychohelp.config.config import config
 from psychohelp.config.logging import get_logger
-from psychohelp.repositories import hash_password
 from psychohelp.repositories import password_reset_tokens as reset_tokens_repo
 from psychohelp.repositories.users import get_user_by_email
-from psychohelp.services.email import EmailDeliveryError, EmailPayload, get_email_provider
+from psychohelp.services.users.passwords import hash_password
+from psychohelp.services.email import EmailPayload
+from psychohelp.services.email_outbox import enqueue_email
 
 
 logger = get_logger(__name__)
@@ -57,7 +58,7 @@ async def request_password_reset(email: str) -> str:
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(minutes=config.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
 
-    await reset_tokens_repo.create_password_reset_token(
+    reset_token = await reset_tokens_repo.create_password_reset_token(
         user_id=user.id,
         token_hash=token_hash,
         expires_at=expires_at,
@@ -67,20 +68,17 @@ async def request_password_reset(email: str) -> str:
     reset_url = _build_reset_url(token)
     subject, text, html = _build_password_reset_email(reset_url)
 
-    try:
-        await get_email_provider().send(
-            EmailPayload(
-                to=user.email,
-                subject=subject,
-                text=text,
-                html=html,
-                sender_alias=config.MAIL_FROM_NAME,
-            )
-        )
-    except EmailDeliveryError:
-        await reset_tokens_repo.invalidate_password_reset_token(token_hash, now)
-        logger.exception(f"Failed to send password reset email to user {user.id}")
-        raise
+    # Письмо уходит в outbox в той же транзакции, что и токен; отправит диспетчер
+    await enqueue_email(
+        EmailPayload(
+            to=user.email,
+            subject=subject,
+            text=text,
+            html=html,
+            sender_alias=config.MAIL_FROM_NAME,
+        ),
+        password_reset_token_id=reset_token.id,
+    )
 
     return PASSWORD_RESET_REQUEST_MESSAGE
 
@@ -90,7 +88,7 @@ async def reset_password(token: str, new_password: str) -> None:
     token_hash = _hash_token(token)
     updated = await reset_tokens_repo.use_password_reset_token(
         token_hash=token_hash,
-        hashed_password=hash_password(new_password),
+        hashed_password=await hash_password(new_password),
         now=now,
     )
     if not updated:
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from psychohelp.config.config import config
+from psychohelp.repositories import (
+    hash_password as _hash_password_sync,
+    password_hash_rounds,
+    verify_password as _verify_password_sync,
+)
+
+
+class PasswordHasherOverloaded(Exception):
+    """Очередь на хеширование паролей переполнена"""
+
+
+class PasswordHasher:
+    """
+    bcrypt в отдельном пуле потоков, чтобы не блокировать event loop.
+
+    Одновременно выполняется не больше max_workers операций, остальные ждут
+    в очереди длиной не больше max_pending; сверх нее запросы отклоняются.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(max_workers)
+
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.completed = 0
+        # Ошибка или отмена во время хеширования
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.queue_depth >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherOverloaded()
+
+        self.queue_depth += 1
+        self.queue_depth_max = max(self.queue_depth_max, self.queue_depth)
+        queued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        self.wait_seconds_total += started_at - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+            self.run_seconds_total += time.perf_counter() - started_at
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify_password_sync, plain_password, hashed_password)
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_depth_max": self.queue_depth_max,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_seconds_total": self.wait_seconds_total,
+            "run_seconds_total": self.run_seconds_total,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_pending=config.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Хеш посчитан с другой стоимостью, чем PASSWORD_HASH_ROUNDS"""
+    rounds = password_hash_rounds(hashed_password)
+    return rounds is not None and rounds != config.PASSWORD_HASH_ROUNDS
@@ -1,4 +1,5 @@
-from psychohelp.repositories import create_access_token, create_refresh_token, verify_password, hash_password, refresh_access_token
+from psychohelp.config.config import config
+from psychohelp.repositories import create_access_token, create_refresh_token, refresh_access_token
 from psychohelp.repositories.users import (
     get_user_by_id as repo_get_user_by_id,
     get_user_by_email as repo_get_user_by_email,
@@ -11,12 +12,22 @@ from psychohelp.services.users import exceptions, models
 from psychohelp.schemas.users import UserUpdateRequest
 from psychohelp.repositories.users import update_user, get_user_by_id
 from psychohelp.services.users.exceptions import UserNotFound, PermissionDenied
-from psychohelp.repositories import verify_password, hash_password
+from psychohelp.services.users.passwords import hash_password, needs_rehash, verify_password
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from starlette.status import HTTP_409_CONFLICT
 
 
+def issue_access_token(user: User) -> str:
+    """Access-токен пользователя, при включенной настройке - с кодами ролей."""
+    if not config.ACCESS_TOKEN_EMBED_ROLES:
+        return create_access_token(user.id)
+    return create_access_token(
+        user.id,
+        roles=[getattr(role.code, "value", role.code) for role in (user.roles or [])],
+    )
+
+
 async def get_user_by_id(user_id: UUID) -> User | None:
     return await repo_get_user_by_id(user_id)
 
@@ -44,12 +55,12 @@ async def register_user(
         last_name,
         phone_number,
         email,
-        hash_password(password),
+        await hash_password(password),
         middle_name,
         social_media,
         study_group,
     )
-    return new_user, create_access_token(new_user.id), create_refresh_token(new_user.id)
+    return new_user, issue_access_token(new_user), create_refresh_token(new_user.id)
 
 
 async def login_user(email: str, password: str) -> models.UserWithToken:
@@ -57,16 +68,28 @@ async def login_user(email: str, password: str) -> models.UserWithToken:
     if user is None:
         raise exceptions.UserNotFound()
 
-    if not verify_password(password, user.password):
+    if not await verify_password(password, user.password):
         raise exceptions.WrongPassword()
 
+    if needs_rehash(user.password):
+        # Стоимость хеширования изменилась - пересчитываем хеш, пока знаем пароль
+        await update_user(user.id, {"password": await hash_password(password)})
+
     return models.UserWithToken(
         user=user,
-        token=create_access_token(user.id),
+        token=issue_access_token(user),
         refresh_token=create_refresh_token(user.id),
     )
 
 
+async def refresh_user_token(refresh_token: str) -> tuple[User | None, str]:
+    """Выпустить новый access-токен по refresh-токену с актуальными ролями."""
+    user = await repo_get_user_by_token(refresh_access_token(refresh_token))
+    if user is None:
+        return None, ""
+    return user, issue_access_token(user)
+
+
 async def update_profile(
     current_user_id: UUID,
     target_user_id: UUID,
@@ -121,7 +144,7 @@ async def change_password(
     if not user:
         raise UserNotFound()
 
-    if not verify_password(old_password, user.password):
+    if not await verify_password(old_password, user.password):
         raise ValueError("Неверный старый пароль")
 
-    await update_user(user_id, {"password": hash_password(new_password)})
\ No newline at end of file
+    await update_user(user_id, {"password": await hash_password(new_password)})
\ No newline at end of file
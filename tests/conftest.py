@@ -1,8 +1,24 @@
 import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import psychohelp.config.config as config_module
+from psychohelp.config.config import Base
+from psychohelp.services.cache import get_response_cache
+from psychohelp.services.rbac.cache import permission_cache
 
 from . import client
 
 
+@pytest.fixture(autouse=True)
+async def clear_response_cache():
+    await get_response_cache().clear()
+    yield
+    await get_response_cache().clear()
+
+
 @pytest.fixture()
 async def user():
     data = {
@@ -24,3 +40,27 @@ async def user():
         assert r.status_code == 200
 
     return r.json()
+
+
+@pytest.fixture
+async def statements(monkeypatch):
+    """SQLite-БД в памяти; возвращает список выполненных SQL-запросов"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    executed: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    monkeypatch.setattr(
+        config_module,
+        "async_session",
+        sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    permission_cache.invalidate_roles()
+    yield executed
+    permission_cache.invalidate_roles()
+    await engine.dispose()
@@ -0,0 +1,30 @@
+from psychohelp.models.psychologists import Psychologist
+from psychohelp.models.users import User
+
+
+# Обязательные поля профиля психолога для тестовых данных
+PSYCHOLOGIST_PROFILE = {
+    "experience": "5 лет",
+    "qualification": "Психолог",
+    "consult_areas": "Тревога",
+    "description": "Описание",
+    "office": "А-101",
+    "education": "МГУ",
+    "short_description": "Кратко",
+}
+
+
+def make_user(index: int = 0, **fields) -> User:
+    """Пользователь для БД из фикстуры statements; index делает телефон и email уникальными"""
+    return User(**{
+        "first_name": "Иван",
+        "last_name": "Иванов",
+        "phone_number": f"+7999000000{index}",
+        "email": f"user{index}@example.com",
+        "password": "x",
+        **fields,
+    })
+
+
+def make_psychologist(user: User | None = None, **fields) -> Psychologist:
+    return Psychologist(user=user if user is not None else make_user(1), **{**PSYCHOLOGIST_PROFILE, **fields})
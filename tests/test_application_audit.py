@@ -0,0 +1,122 @@
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+import psychohelp.config.config as config_module
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.main import app
+from psychohelp.models.application_audit_log import ApplicationAuditLog
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.repositories import create_access_token
+from psychohelp.services import audit
+from psychohelp.services.applications.state_machine import ApplicationStateMachine
+
+from .factories import make_user
+
+
+async def _create_application() -> Application:
+    async with config_module.get_async_db() as session:
+        user = make_user()
+        application = Application(
+            user=user,
+            status=ApplicationStatus.NEW.value,
+            problem_description="Описание",
+            university_status="студент",
+        )
+        session.add(application)
+    return application
+
+
+async def _accept(application: Application) -> None:
+    async with config_module.get_async_db():
+        await ApplicationStateMachine(application).accept_to_processing(
+            uuid4(), application.user_id, "manager"
+        )
+
+
+async def _audit_rows() -> list[ApplicationAuditLog]:
+    async with config_module.get_async_db() as session:
+        return list((await session.execute(select(ApplicationAuditLog))).scalars().all())
+
+
+async def test_transition_writes_audit_in_same_transaction(statements):
+    application = await _create_application()
+
+    with pytest.raises(RuntimeError):
+        async with config_module.get_async_db():
+            await _accept(application)
+            raise RuntimeError("откат запроса")
+    assert await _audit_rows() == []
+
+    statements.clear()
+    await _accept(application)
+
+    # UPDATE заявки и INSERT журнала без отдельного commit
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "INSERT"]
+    rows = await _audit_rows()
+    assert [(row.previous_status, row.new_status, row.actor_type) for row in rows] == [
+        ("new", "in_progress", "manager"),
+    ]
+
+
+async def test_buffered_mode_writes_committed_entries_in_one_insert(statements, monkeypatch):
+    monkeypatch.setattr(config_module.config, "AUDIT_WRITE_MODE", "buffered")
+    writer = audit.AuditWriter(flush_interval_ms=10_000, batch_size=100)
+    monkeypatch.setattr(audit, "audit_writer", writer)
+    first = await _create_application()
+    async with config_module.get_async_db() as session:
+        second = Application(
+            user_id=first.user_id,
+            status=ApplicationStatus.NEW.value,
+            problem_description="Описание",
+            university_status="студент",
+        )
+        session.add(second)
+
+    with pytest.raises(RuntimeError):
+        async with config_module.get_async_db():
+            await _accept(first)
+            raise RuntimeError("откат запроса")
+    assert writer.pending == 0
+
+    await _accept(first)
+    await _accept(second)
+    assert writer.pending == 2
+    assert await _audit_rows() == []
+
+    statements.clear()
+    assert await writer.flush() == 2
+    assert [statement.split()[0] for statement in statements] == ["INSERT"]
+    assert {row.application_id for row in await _audit_rows()} == {first.id, second.id}
+    assert writer.snapshot() == {"pending": 0, "written": 2, "dropped": 0, "failures": 0}
+
+
+async def test_buffer_overflow_drops_new_entries():
+    writer = audit.AuditWriter(max_buffer=2)
+
+    writer.add([{"n": 1}, {"n": 2}, {"n": 3}])
+
+    assert writer.pending == 2
+    assert writer.dropped == 1
+
+
+async def test_history_endpoint(statements):
+    application = await _create_application()
+    await _accept(application)
+
+    async def history(user_id, roles):
+        token = create_access_token(user_id, roles=roles)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            client.cookies.set("access_token", token)
+            return await client.get(f"/applications/{application.id}/history")
+
+    response = await history(application.user_id, [RoleCode.USER.value])
+    assert response.status_code == 200
+    assert [(entry["previous_status"], entry["new_status"]) for entry in response.json()] == [
+        ("new", "in_progress"),
+    ]
+
+    response = await history(uuid4(), [RoleCode.USER.value])
+    assert response.status_code == 403
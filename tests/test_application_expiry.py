@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+import psychohelp.config.config as config_module
+from psychohelp.models.application_audit_log import ApplicationAuditLog
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.services.applications.expiry import ApplicationExpiryJob
+
+NOW = datetime(2030, 3, 4, 12, 0, tzinfo=timezone.utc)
+SLA = {
+    ApplicationStatus.NEW: timedelta(days=7),
+    ApplicationStatus.AWAITING_USER_CONFIRMATION: timedelta(days=3),
+}
+
+
+async def _seed() -> dict[str, Application]:
+    # SQLite хранит время без зоны, поэтому сразу в UTC
+    applications = {
+        "stale_new": Application(status=ApplicationStatus.NEW.value, updated_at=NOW - timedelta(days=8)),
+        "fresh_new": Application(status=ApplicationStatus.NEW.value, updated_at=NOW - timedelta(days=1)),
+        "stale_awaiting": Application(
+            status=ApplicationStatus.AWAITING_USER_CONFIRMATION.value, updated_at=NOW - timedelta(days=4)
+        ),
+        # Статус без SLA не трогаем
+        "old_in_progress": Application(
+            status=ApplicationStatus.IN_PROGRESS.value, updated_at=NOW - timedelta(days=30)
+        ),
+        "completed": Application(status=ApplicationStatus.COMPLETED.value, updated_at=NOW - timedelta(days=30)),
+    }
+    async with config_module.get_async_db() as session:
+        for application in applications.values():
+            application.problem_description = "Описание"
+            application.university_status = "студент"
+        session.add_all(applications.values())
+    return applications
+
+
+async def _statuses() -> dict:
+    async with config_module.get_async_db() as session:
+        result = await session.execute(select(Application.id, Application.status, Application.version))
+        return {row.id: (row.status, row.version) for row in result}
+
+
+async def test_dry_run_only_counts(statements):
+    await _seed()
+    before = await _statuses()
+
+    result = await ApplicationExpiryJob(sla=SLA).run_once(NOW, dry_run=True)
+
+    assert result.expired == {"new": 1, "awaiting_user_confirmation": 1}
+    assert await _statuses() == before
+
+
+async def test_run_expires_stale_applications_in_bulk(statements):
+    applications = await _seed()
+    job = ApplicationExpiryJob(sla=SLA, batch_size=10)
+    statements.clear()
+
+    result = await job.run_once(NOW, dry_run=False)
+
+    # Блокировка, UPDATE и INSERT в журнал - на всю пачку
+    assert len(statements) == 3
+    assert result.total == 2
+    statuses = await _statuses()
+    assert statuses[applications["stale_new"].id] == (ApplicationStatus.EXPIRED.value, 2)
+    assert statuses[applications["stale_awaiting"].id] == (ApplicationStatus.EXPIRED.value, 2)
+    assert statuses[applications["fresh_new"].id] == (ApplicationStatus.NEW.value, 1)
+    assert statuses[applications["old_in_progress"].id] == (ApplicationStatus.IN_PROGRESS.value, 1)
+
+    async with config_module.get_async_db() as session:
+        audit = (await session.execute(select(ApplicationAuditLog))).scalars().all()
+    assert {(entry.previous_status, entry.new_status, entry.actor_type) for entry in audit} == {
+        ("new", "expired", "system"),
+        ("awaiting_user_confirmation", "expired", "system"),
+    }
+    assert job.snapshot()["expired_total"] == {"new": 1, "awaiting_user_confirmation": 1}
+    assert (await job.run_once(NOW, dry_run=False)).total == 0
+
+
+async def test_run_stops_after_max_batches(statements):
+    await _seed()
+    job = ApplicationExpiryJob(sla=SLA, batch_size=1)
+
+    result = await job.run_once(NOW, dry_run=False, max_batches=1)
+
+    assert result.total == 1
+    assert result.has_more
+    assert (await job.run_once(NOW, dry_run=False)).total == 1
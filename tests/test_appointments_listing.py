@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import psychohelp.config.config as config_module
+from psychohelp.models.appointments import Appointment, AppointmentStatus, AppointmentType
+from psychohelp.repositories.appointments import get_appointments_by_user_id
+
+from .factories import make_psychologist, make_user
+
+START = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+async def _seed():
+    async with config_module.get_async_db() as session:
+        patient, therapist_user = make_user(1), make_user(2)
+        psychologist = make_psychologist(therapist_user)
+        session.add_all([patient, therapist_user, psychologist])
+        await session.flush()
+
+        def appointment(patient_id, hours, status=AppointmentStatus.awaiting):
+            return Appointment(
+                patient_id=patient_id,
+                psychologist_id=psychologist.id,
+                type=AppointmentType.Offline,
+                status=status,
+                scheduled_time=START + timedelta(hours=hours),
+                last_change_time=START,
+                venue="А-101",
+            )
+
+        appointments = [
+            appointment(patient.id, 0),
+            appointment(patient.id, 1, AppointmentStatus.done),
+            appointment(patient.id, 2),
+            # Психолог записан к самому себе
+            appointment(therapist_user.id, 3),
+        ]
+        session.add_all(appointments)
+    return patient, therapist_user, appointments
+
+
+async def test_both_sides_are_listed_newest_first_without_duplicates(statements):
+    patient, therapist_user, appointments = await _seed()
+
+    as_psychologist = await get_appointments_by_user_id(therapist_user.id)
+    as_patient = await get_appointments_by_user_id(patient.id)
+
+    assert [a.id for a in as_psychologist] == [a.id for a in reversed(appointments)]
+    assert [a.id for a in as_patient] == [a.id for a in reversed(appointments[:3])]
+
+
+async def test_filters_and_pagination(statements):
+    _, therapist_user, appointments = await _seed()
+
+    page = await get_appointments_by_user_id(therapist_user.id, skip=1, take=2)
+    done = await get_appointments_by_user_id(therapist_user.id, status=AppointmentStatus.done)
+    window = await get_appointments_by_user_id(
+        therapist_user.id, date_from=START + timedelta(hours=1), date_to=START + timedelta(hours=3)
+    )
+
+    assert [a.id for a in page] == [appointments[2].id, appointments[1].id]
+    assert [a.id for a in done] == [appointments[1].id]
+    assert [a.id for a in window] == [appointments[2].id, appointments[1].id]
+
+
+async def test_pages_do_not_skip_appointments_at_the_same_time(statements):
+    patient, therapist_user, _ = await _seed()
+    async with config_module.get_async_db() as session:
+        psychologist_id = (await get_appointments_by_user_id(patient.id))[0].psychologist_id
+        session.add_all([
+            Appointment(
+                patient_id=patient_id,
+                psychologist_id=psychologist_id,
+                type=AppointmentType.Offline,
+                status=AppointmentStatus.awaiting,
+                scheduled_time=START + timedelta(hours=10),
+                last_change_time=START,
+                venue="А-101",
+            )
+            for patient_id in (patient.id, therapist_user.id, patient.id, therapist_user.id)
+        ])
+
+    listed = [a.id for a in await get_appointments_by_user_id(therapist_user.id)]
+    pages = [
+        a.id
+        for skip in range(len(listed))
+        for a in await get_appointments_by_user_id(therapist_user.id, skip=skip, take=1)
+    ]
+
+    assert pages == listed
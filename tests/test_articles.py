@@ -2,7 +2,7 @@ from types import SimpleNamespace
 from uuid import uuid4
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from psychohelp.constants.rbac import PermissionCode
 from psychohelp.routes.controllers import articles as articles_controller
@@ -14,9 +14,10 @@ import psychohelp.services.rbac.permissions as permissions_module
 async def test_get_articles_is_public(monkeypatch):
     article_id = uuid4()
 
-    async def fake_get_articles(skip, take):
+    async def fake_get_articles(skip, take, cursor):
         assert skip == 0
         assert take == 100
+        assert cursor is None
         return [
             SimpleNamespace(
                 id=article_id,
@@ -27,7 +28,7 @@ async def test_get_articles_is_public(monkeypatch):
 
     monkeypatch.setattr(articles_controller.articles_service, "get_articles", fake_get_articles)
 
-    result = await articles_controller.get_articles(skip=0, take=100)
+    result = await articles_controller.get_articles(Response(), skip=0, take=100, cursor=None)
 
     assert len(result) == 1
     assert result[0].id == article_id
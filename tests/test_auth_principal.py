@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from psychohelp.constants.rbac import PermissionCode, RoleCode
+from psychohelp.dependencies import auth
+from psychohelp.repositories import create_access_token, decode_access_token
+from psychohelp.services.rbac.cache import permission_cache
+from psychohelp.services.users.models import CurrentPrincipal
+
+
+def test_access_token_contains_sorted_roles():
+    token = create_access_token(uuid4(), roles=["user", "admin", "user"])
+
+    assert decode_access_token(token)["roles"] == ["admin", "user"]
+
+
+def test_access_token_without_roles_has_no_claim():
+    token = create_access_token(uuid4())
+
+    assert "roles" not in decode_access_token(token)
+
+
+@pytest.mark.asyncio
+async def test_principal_uses_roles_from_token(monkeypatch):
+    user_id = uuid4()
+
+    async def fail_get_user_role_codes(_user_id):
+        raise AssertionError("roles must come from the token")
+
+    monkeypatch.setattr(permission_cache, "get_user_role_codes", fail_get_user_role_codes)
+    request = SimpleNamespace(
+        cookies={"access_token": create_access_token(user_id, roles=[RoleCode.ADMIN.value])}
+    )
+
+    principal = await auth.get_current_principal(request)
+
+    assert principal.user_id == user_id
+    assert principal.has_role(RoleCode.ADMIN)
+    assert not principal.has_role(RoleCode.PSYCHOLOGIST)
+
+
+@pytest.mark.asyncio
+async def test_principal_falls_back_to_cache_for_legacy_token(monkeypatch):
+    user_id = uuid4()
+
+    async def fake_get_user_role_codes(requested_user_id):
+        assert requested_user_id == user_id
+        return frozenset({RoleCode.PSYCHOLOGIST.value})
+
+    monkeypatch.setattr(permission_cache, "get_user_role_codes", fake_get_user_role_codes)
+    request = SimpleNamespace(cookies={"access_token": create_access_token(user_id)})
+
+    principal = await auth.get_current_principal(request)
+
+    assert principal.has_role(RoleCode.PSYCHOLOGIST)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cookies", [{}, {"access_token": "garbage"}])
+async def test_principal_rejects_missing_or_invalid_token(cookies):
+    with pytest.raises(HTTPException) as exc:
+        await auth.get_current_principal(SimpleNamespace(cookies=cookies))
+
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_principal_permissions_resolved_from_role_codes(monkeypatch):
+    async def fake_get_role_codes_permissions(role_codes):
+        assert role_codes == frozenset({RoleCode.ADMIN.value})
+        return frozenset({PermissionCode.PSYCHOLOGISTS_MANAGE.value})
+
+    monkeypatch.setattr(
+        permission_cache, "get_role_codes_permissions", fake_get_role_codes_permissions
+    )
+    principal = CurrentPrincipal(user_id=uuid4(), role_codes=frozenset({RoleCode.ADMIN.value}))
+
+    assert await principal.has_permission(PermissionCode.PSYCHOLOGISTS_MANAGE)
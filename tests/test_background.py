@@ -0,0 +1,26 @@
+import asyncio
+
+from psychohelp.services.background import PeriodicTask
+
+
+class _FailingOnce(PeriodicTask):
+    def __init__(self) -> None:
+        super().__init__("test-periodic", interval_seconds=0)
+        self.runs = 0
+
+    async def run_once(self) -> None:
+        self.runs += 1
+        if self.runs == 1:
+            raise RuntimeError("boom")
+
+
+async def test_periodic_task_survives_failures_and_stops():
+    task = _FailingOnce()
+    task.start()
+    task.start()
+    while task.runs < 3:
+        await asyncio.sleep(0)
+    await task.stop()
+
+    assert task.failures == 1
+    assert not task.running
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from psychohelp.config.config import (
+    Config,
+    PoolMetrics,
+    TimedAsyncAdaptedQueuePool,
+    async_engine,
+    build_async_engine,
+    config,
+)
+
+
+def test_app_and_repositories_share_engine():
+    import psychohelp.main as main_module
+
+    assert not hasattr(main_module, "engine")
+    assert main_module.async_engine is async_engine
+    assert isinstance(async_engine.sync_engine.pool, TimedAsyncAdaptedQueuePool)
+
+
+def test_engine_uses_pool_settings_from_config():
+    with patch.object(Config, "DB_POOL_SIZE", 3), patch.object(Config, "DB_MAX_OVERFLOW", 2), \
+            patch.object(Config, "DB_POOL_TIMEOUT", 5.0), patch.object(Config, "DB_ECHO", False):
+        engine = build_async_engine(Config())
+
+    pool = engine.sync_engine.pool
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._timeout == 5.0
+    assert engine.echo is False
+
+
+def test_echo_is_disabled_by_default():
+    assert config.DB_ECHO is False
+    assert async_engine.echo is False
+
+
+def test_pool_metrics_snapshot_tracks_wait_time():
+    metrics = PoolMetrics()
+    metrics.observe_wait(0.5)
+    metrics.observe_wait(0.1)
+
+    snapshot = metrics.snapshot(async_engine)
+
+    assert snapshot["wait_count"] == 2
+    assert snapshot["wait_seconds_max"] == 0.5
+    assert snapshot["checked_out"] == 0
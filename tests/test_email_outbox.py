@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import select
+
+import psychohelp.config.config as config_module
+from psychohelp.models.password_reset_tokens import PasswordResetToken
+from psychohelp.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from psychohelp.services.email import (
+    CircuitBreaker,
+    EmailDeliveryError,
+    EmailPayload,
+    MailServiceHttpProvider,
+    MailServiceUnavailable,
+    StubEmailProvider,
+)
+from psychohelp.services.email_outbox import EmailOutboxDispatcher, enqueue_email
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+class FailingEmailProvider(StubEmailProvider):
+    def __init__(self, failing: set[str]):
+        super().__init__()
+        self.failing = failing
+
+    async def send(self, payload):
+        if payload.to in self.failing:
+            raise EmailDeliveryError("mail unavailable")
+        await super().send(payload)
+
+
+async def _enqueue(*recipients: str) -> None:
+    for recipient in recipients:
+        await enqueue_email(EmailPayload(to=recipient, subject="Тема", text="Текст", html="<p>Текст</p>"))
+
+
+async def _outbox() -> dict[str, EmailOutbox]:
+    async with config_module.get_async_db() as session:
+        result = await session.execute(select(EmailOutbox))
+        return {email.recipient: email for email in result.scalars()}
+
+
+async def test_dispatcher_sends_and_reschedules_failures(statements):
+    await _enqueue("ok@example.com", "broken@example.com")
+    provider = FailingEmailProvider(failing={"broken@example.com"})
+    dispatcher = EmailOutboxDispatcher(provider_factory=lambda: provider, backoff_base_seconds=10)
+
+    assert await dispatcher.dispatch_batch(NOW + timedelta(seconds=1)) == 2
+
+    outbox = await _outbox()
+    assert [payload.to for payload in provider.sent] == ["ok@example.com"]
+    assert outbox["ok@example.com"].status == EmailOutboxStatus.SENT.value
+    broken = outbox["broken@example.com"]
+    assert broken.status == EmailOutboxStatus.PENDING.value
+    assert broken.attempts == 1
+    assert "mail unavailable" in broken.last_error
+
+    # До истечения задержки письмо повторно не забирается
+    assert await dispatcher.dispatch_batch(NOW + timedelta(seconds=2)) == 0
+
+
+async def test_dispatcher_dead_letters_after_max_attempts(statements):
+    await _enqueue("broken@example.com")
+    provider = FailingEmailProvider(failing={"broken@example.com"})
+    dispatcher = EmailOutboxDispatcher(
+        provider_factory=lambda: provider, max_attempts=2, backoff_base_seconds=1, backoff_max_seconds=1
+    )
+
+    now = datetime.now(timezone.utc)
+    assert await dispatcher.dispatch_batch(now) == 1
+    assert await dispatcher.dispatch_batch(now + timedelta(minutes=1)) == 1
+    assert await dispatcher.dispatch_batch(now + timedelta(minutes=2)) == 0
+
+    email = (await _outbox())["broken@example.com"]
+    assert email.status == EmailOutboxStatus.DEAD.value
+    assert email.attempts == 2
+    assert dispatcher.dead == 1
+
+
+async def test_dispatcher_waits_while_provider_is_unavailable(statements):
+    await _enqueue("user@example.com")
+    provider = StubEmailProvider()
+    provider.is_available = lambda: False
+    dispatcher = EmailOutboxDispatcher(provider_factory=lambda: provider)
+
+    assert await dispatcher.dispatch_batch() == 0
+    assert (await _outbox())["user@example.com"].attempts == 0
+
+
+async def test_dispatcher_erases_password_reset_link_after_sending(statements):
+    await _enqueue("user@example.com")
+    await enqueue_email(
+        EmailPayload(to="reset@example.com", subject="Тема", text="token=secret", html="<p>token=secret</p>"),
+        password_reset_token_id=uuid4(),
+    )
+    dispatcher = EmailOutboxDispatcher(provider_factory=StubEmailProvider)
+
+    assert await dispatcher.dispatch_batch(NOW + timedelta(seconds=1)) == 2
+
+    outbox = await _outbox()
+    assert outbox["reset@example.com"].status == EmailOutboxStatus.SENT.value
+    assert (outbox["reset@example.com"].text, outbox["reset@example.com"].html) == ("", "")
+    assert outbox["user@example.com"].text == "Текст"
+
+
+async def test_dead_password_reset_email_invalidates_token(statements):
+    async with config_module.get_async_db() as session:
+        token = PasswordResetToken(user_id=uuid4(), token_hash="a" * 64, expires_at=NOW + timedelta(hours=1))
+        session.add(token)
+        await session.flush()
+        await enqueue_email(
+            EmailPayload(to="broken@example.com", subject="Тема", text="Текст", html="<p>Текст</p>"),
+            password_reset_token_id=token.id,
+        )
+    provider = FailingEmailProvider(failing={"broken@example.com"})
+    dispatcher = EmailOutboxDispatcher(provider_factory=lambda: provider, max_attempts=1)
+
+    assert await dispatcher.dispatch_batch(NOW) == 1
+
+    async with config_module.get_async_db() as session:
+        assert (await session.get(PasswordResetToken, token.id)).used_at is not None
+
+
+async def test_purge_removes_only_old_finished_emails(statements):
+    await _enqueue("sent@example.com", "pending@example.com")
+    dispatcher = EmailOutboxDispatcher(provider_factory=StubEmailProvider, batch_size=1, retention_days=30)
+    assert await dispatcher.dispatch_batch(NOW) == 1
+
+    assert await dispatcher.purge(datetime.now(timezone.utc)) == 0
+    assert await dispatcher.purge(datetime.now(timezone.utc) + timedelta(days=31), batch_size=1) == 1
+    assert list(await _outbox()) == ["pending@example.com"]
+    assert dispatcher.purged == 1
+
+
+async def test_half_open_breaker_probes_with_single_email(statements):
+    await _enqueue("first@example.com", "second@example.com", "third@example.com")
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["to"])
+        return httpx.Response(200, json={"success": True, "logs": []})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+    breaker.record_failure()
+    provider = MailServiceHttpProvider(
+        base_url="https://mail.example.com",
+        from_user="root",
+        timeout_seconds=3,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        breaker=breaker,
+    )
+    dispatcher = EmailOutboxDispatcher(provider_factory=lambda: provider, batch_size=10)
+
+    assert await dispatcher.dispatch_batch(NOW) == 1
+    assert len(calls) == 1
+    assert dispatcher.failed == 0
+
+    # Проба прошла, цепь замкнута: остальные письма уходят одной пачкой
+    assert await dispatcher.dispatch_batch(NOW) == 2
+    outbox = await _outbox()
+    assert all(email.status == EmailOutboxStatus.SENT.value for email in outbox.values())
+    assert all(email.attempts == 1 for email in outbox.values())
+
+
+async def test_emails_rejected_by_open_circuit_keep_their_attempts(statements):
+    await _enqueue("user@example.com")
+
+    class OpenCircuitProvider(StubEmailProvider):
+        async def send(self, payload):
+            raise MailServiceUnavailable("mail service circuit is open")
+
+    dispatcher = EmailOutboxDispatcher(provider_factory=OpenCircuitProvider)
+
+    assert await dispatcher.dispatch_batch(NOW) == 1
+
+    email = (await _outbox())["user@example.com"]
+    assert email.status == EmailOutboxStatus.PENDING.value
+    assert email.attempts == 0
+    assert email.next_attempt_at.replace(tzinfo=timezone.utc) == NOW
+    assert dispatcher.failed == 0
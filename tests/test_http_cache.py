@@ -0,0 +1,126 @@
+import asyncio
+
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from psychohelp.middleware.http_cache import HTTPCacheMiddleware
+from psychohelp.services import news as news_service
+from psychohelp.services.cache import CachedResponse, MemoryLRUCache, get_response_cache
+
+
+def _build_app(cache: MemoryLRUCache, ttl_seconds: float = 60) -> tuple[FastAPI, dict]:
+    calls = {"news": 0, "missing": 0}
+    app = FastAPI()
+
+    @app.get("/news/")
+    async def news_list(take: int = 10):
+        calls["news"] += 1
+        return [{"title": f"Новость {i}"} for i in range(take)]
+
+    @app.get("/news/missing")
+    async def missing():
+        calls["missing"] += 1
+        raise HTTPException(status_code=404, detail="Новость не найдена")
+
+    @app.get("/private")
+    async def private():
+        return {"ok": True}
+
+    app.add_middleware(
+        HTTPCacheMiddleware,
+        rules={"/news": 30},
+        backend=lambda: cache,
+        ttl_seconds=ttl_seconds,
+    )
+    return app, calls
+
+
+def _client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_second_request_is_served_from_cache():
+    cache = MemoryLRUCache(max_entries=10)
+    app, calls = _build_app(cache)
+
+    async with _client(app) as client:
+        first = await client.get("/news/", params={"take": 2})
+        second = await client.get("/news/", params={"take": 2})
+        other_query = await client.get("/news/", params={"take": 3})
+
+    assert calls["news"] == 2
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Cache-Control"] == "public, max-age=30"
+    assert "Last-Modified" in second.headers
+    assert other_query.headers["X-Cache"] == "MISS"
+
+
+async def test_matching_etag_returns_304_without_body():
+    cache = MemoryLRUCache(max_entries=10)
+    app, _ = _build_app(cache)
+
+    async with _client(app) as client:
+        first = await client.get("/news/")
+        revalidated = await client.get("/news/", headers={"If-None-Match": first.headers["ETag"]})
+        changed = await client.get("/news/", headers={"If-None-Match": '"other"'})
+        by_date = await client.get(
+            "/news/", headers={"If-Modified-Since": first.headers["Last-Modified"]}
+        )
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+    assert changed.status_code == 200
+    assert by_date.status_code == 304
+
+
+async def test_errors_and_unlisted_paths_are_not_cached():
+    cache = MemoryLRUCache(max_entries=10)
+    app, calls = _build_app(cache)
+
+    async with _client(app) as client:
+        await client.get("/news/missing")
+        missing = await client.get("/news/missing")
+        private = await client.get("/private")
+
+    assert missing.status_code == 404
+    assert calls["missing"] == 2
+    assert "X-Cache" not in private.headers
+    assert len(cache) == 0
+
+
+async def test_memory_cache_evicts_least_recently_used_and_expired():
+    cache = MemoryLRUCache(max_entries=2)
+    value = CachedResponse(status=200, headers=[], body=b"", etag='"x"', last_modified="")
+
+    await cache.set("a", value, ttl_seconds=60)
+    await cache.set("b", value, ttl_seconds=60)
+    await cache.get("a")
+    await cache.set("c", value, ttl_seconds=60)
+
+    assert await cache.get("a") is value
+    assert await cache.get("b") is None
+
+    await cache.set("short", value, ttl_seconds=0.01)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get("short") is None
+
+
+async def test_news_write_invalidates_cached_responses(monkeypatch):
+    value = CachedResponse(status=200, headers=[], body=b"[]", etag='"x"', last_modified="")
+    await get_response_cache().set("/news/?take=10", value, ttl_seconds=60)
+    await get_response_cache().set("/articles/?", value, ttl_seconds=60)
+
+    async def fake_create_news(news_data):
+        return news_data
+
+    monkeypatch.setattr(news_service.news_repo, "create_news", fake_create_news)
+
+    await news_service.create_news({"title": "Заголовок", "text": "Текст"})
+
+    assert await get_response_cache().get("/news/?take=10") is None
+    assert await get_response_cache().get("/articles/?") is value
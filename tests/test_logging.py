@@ -0,0 +1,62 @@
+import json
+import logging
+import sys
+
+from httpx import ASGITransport, AsyncClient
+
+from psychohelp.config.logging import (
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    parse_sample_rates,
+    request_id_var,
+)
+from psychohelp.main import app
+
+
+def _record(name: str = "psychohelp.test", level: int = logging.INFO, **kwargs) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "Заявка %s: %s", ("42", "ok"), None, **kwargs)
+
+
+def test_json_formatter_includes_request_id_and_exception():
+    token = request_id_var.set("req-1")
+    try:
+        record = _record()
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+    record.application_id = "42"
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data["message"] == "Заявка 42: ok"
+    assert data["request_id"] == "req-1"
+    assert data["application_id"] == "42"
+    assert "ValueError: boom" in data["exception"]
+
+
+def test_sampling_keeps_warnings_and_uses_longest_prefix():
+    sampling = SamplingFilter({"psychohelp": 1.0, "psychohelp.routes.controllers.therapists": 0.0})
+
+    assert sampling.filter(_record("psychohelp.services"))
+    assert not sampling.filter(_record("psychohelp.routes.controllers.therapists"))
+    assert sampling.filter(_record("psychohelp.routes.controllers.therapists", logging.WARNING))
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("a.b=0.1, c=2,broken") == {"a.b": 0.1, "c": 1.0}
+    assert parse_sample_rates(None) == {}
+
+
+async def test_request_id_header():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/no-such-route", headers={"X-Request-ID": "abc-123"})
+        assert response.headers["X-Request-ID"] == "abc-123"
+
+        response = await client.get("/no-such-route", headers={"X-Request-ID": "bad id\n"})
+        assert response.headers["X-Request-ID"] != "bad id\n"
+        assert len(response.headers["X-Request-ID"]) == 32
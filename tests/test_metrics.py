@@ -0,0 +1,49 @@
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+
+from psychohelp.main import app
+from psychohelp.services.metrics import MetricsRegistry
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} не найдена")
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Задержка", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+async def test_metrics_by_route_template(statements):
+    route = 'method="GET",route="/news/{news_id}"'
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        before = (await client.get("/metrics")).text
+        for _ in range(2):
+            response = await client.get(f"/news/{uuid4()}")
+            assert response.status_code == 404
+        response = await client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    counted = f'http_requests_total{{{route},status="404"}}'
+    assert _sample(text, counted) - (_sample(before, counted) if counted in before else 0) == 2
+    # Каждый запрос сходил в БД
+    queries = _sample(text, f"http_request_db_queries_sum{{{route}}}")
+    assert queries >= 2
+    assert "db_pool_checked_out" in text
+    assert "http_requests_in_flight" in text
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+import psychohelp.config.config as config_module
+from psychohelp.main import app
+from psychohelp.models.news import News
+from psychohelp.repositories import create_access_token
+from psychohelp.repositories import news as news_repo
+from psychohelp.repositories.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip_keeps_types():
+    created_at = datetime(2026, 9, 1, 10, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    cursor = encode_cursor("created_at.desc", [created_at, row_id])
+
+    assert decode_cursor(cursor, "created_at.desc") == [created_at, row_id]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("title.asc", ["a", "b"])])
+def test_decode_cursor_rejects_garbage_and_foreign_sort(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created_at.desc")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2026-09-01", str(uuid4())],
+        [datetime(2026, 9, 1, tzinfo=timezone.utc)],
+        [datetime(2026, 9, 1, tzinfo=timezone.utc), uuid4(), 1],
+        [True, uuid4()],
+    ],
+)
+def test_decode_cursor_rejects_values_not_matching_key_types(values):
+    cursor = encode_cursor("created_at.desc", values)
+
+    with pytest.raises(InvalidCursorError):
+        news_repo.NEWS_KEYSET.apply(select(News), cursor)
+
+
+async def _create_news(count: int) -> None:
+    base = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    async with config_module.get_async_db() as session:
+        # Две новости с одинаковым временем - проверяем разбор ничьих по id
+        session.add_all(
+            News(title=f"Новость {i}", text="Текст", created_at=base + timedelta(minutes=i // 2))
+            for i in range(count)
+        )
+
+
+async def test_news_cursor_pages_do_not_overlap(statements):
+    await _create_news(7)
+
+    seen = []
+    cursor = None
+    while True:
+        page = await news_repo.get_news_list(take=3, cursor=cursor)
+        seen.extend(page)
+        cursor = news_repo.NEWS_KEYSET.next_cursor(page, 3)
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({item.id for item in seen}) == 7
+    keys = [(item.created_at, item.id) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+async def test_news_endpoint_returns_next_cursor_header(statements):
+    await _create_news(3)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/news/", params={"take": 2})
+        second = await client.get(
+            "/news/", params={"take": 2, "cursor": first.headers[NEXT_CURSOR_HEADER]}
+        )
+        invalid = await client.get("/news/", params={"cursor": "garbage"})
+
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    assert len(second.json()) == 1
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert invalid.status_code == 400
+
+
+async def test_applications_list_rejects_unsupported_sort():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        client.cookies.set("access_token", create_access_token(uuid4(), roles=["psychologist"]))
+        response = await client.get("/applications/", params={"sort_by": "problem_description"})
+
+    assert response.status_code == 422
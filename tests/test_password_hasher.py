@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from psychohelp.config.config import config
+from psychohelp.repositories import hash_password as hash_password_sync
+from psychohelp.services.users.passwords import (
+    PasswordHasher,
+    PasswordHasherOverloaded,
+    needs_rehash,
+)
+
+
+@pytest.fixture(autouse=True)
+def cheap_rounds(monkeypatch):
+    monkeypatch.setattr(config, "PASSWORD_HASH_ROUNDS", 4)
+
+
+async def test_hash_and_verify_run_in_worker_pool():
+    hasher = PasswordHasher(max_workers=2, max_pending=10)
+    try:
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.snapshot()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+async def test_hasher_caps_parallelism_and_rejects_overflow():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(hasher._run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(hasher._run(lambda: "done"))
+        await asyncio.sleep(0)
+
+        assert hasher.in_flight == 1
+        assert hasher.queue_depth == 1
+        with pytest.raises(PasswordHasherOverloaded):
+            await hasher._run(lambda: "rejected")
+
+        release.set()
+        assert await queued == "done"
+        await running
+        assert hasher.snapshot()["rejected"] == 1
+        assert hasher.snapshot()["queue_depth_max"] == 1
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+async def test_failed_hashing_is_not_counted_as_completed():
+    def broken():
+        raise ValueError("invalid salt")
+
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        with pytest.raises(ValueError):
+            await hasher._run(broken)
+
+        assert hasher.snapshot()["completed"] == 0
+        assert hasher.snapshot()["failed"] == 1
+        assert hasher.in_flight == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_needs_rehash_compares_cost_with_config():
+    assert not needs_rehash(hash_password_sync("secret"))
+    assert needs_rehash("$2b$12$" + "a" * 53)
+    assert not needs_rehash("not-a-bcrypt-hash")
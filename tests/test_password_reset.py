@@ -8,16 +8,22 @@ from fastapi import HTTPException
 
 from psychohelp.routes.controllers import users as users_controller
 from psychohelp.schemas.users import PasswordResetConfirmRequest, PasswordResetRequest
-from psychohelp.services import email as email_service
-from psychohelp.services.email import EmailDeliveryError, EmailPayload, MailServiceHttpProvider
+from psychohelp.services.email import (
+    CircuitBreaker,
+    EmailDeliveryError,
+    EmailPayload,
+    MailServiceHttpProvider,
+    MailServiceUnavailable,
+)
 from psychohelp.services.users import password_reset
 
 
 @pytest.mark.asyncio
-async def test_request_password_reset_sends_email_without_disclosing_user(monkeypatch):
+async def test_request_password_reset_queues_email_without_disclosing_user(monkeypatch):
     user_id = uuid4()
+    token_id = uuid4()
     created_token = {}
-    sent_payloads = []
+    queued_payloads = []
 
     async def fake_get_user_by_email(email):
         assert email == "user@example.com"
@@ -28,10 +34,11 @@ async def test_request_password_reset_sends_email_without_disclosing_user(monkey
         created_token["token_hash"] = token_hash
         created_token["expires_at"] = expires_at
         created_token["now"] = now
+        return SimpleNamespace(id=token_id)
 
-    class FakeEmailProvider:
-        async def send(self, payload):
-            sent_payloads.append(payload)
+    async def fake_enqueue_email(payload, password_reset_token_id=None):
+        queued_payloads.append(payload)
+        created_token["queued_token_id"] = password_reset_token_id
 
     monkeypatch.setattr(password_reset, "get_user_by_email", fake_get_user_by_email)
     monkeypatch.setattr(
@@ -39,7 +46,7 @@ async def test_request_password_reset_sends_email_without_disclosing_user(monkey
         "create_password_reset_token",
         fake_create_password_reset_token,
     )
-    monkeypatch.setattr(password_reset, "get_email_provider", lambda: FakeEmailProvider())
+    monkeypatch.setattr(password_reset, "enqueue_email", fake_enqueue_email)
     monkeypatch.setattr(password_reset, "token_urlsafe", lambda length: "reset-token")
     monkeypatch.setattr(
         password_reset.config,
@@ -53,9 +60,10 @@ async def test_request_password_reset_sends_email_without_disclosing_user(monkey
     assert created_token["user_id"] == user_id
     assert created_token["token_hash"] == sha256(b"reset-token").hexdigest()
     assert created_token["expires_at"] > created_token["now"]
-    assert len(sent_payloads) == 1
-    assert sent_payloads[0].to == "user@example.com"
-    assert "https://example.com/reset?token=reset-token" in sent_payloads[0].text
+    assert len(queued_payloads) == 1
+    assert queued_payloads[0].to == "user@example.com"
+    assert "https://example.com/reset?token=reset-token" in queued_payloads[0].text
+    assert created_token["queued_token_id"] == token_id
 
 
 @pytest.mark.asyncio
@@ -66,9 +74,8 @@ async def test_request_password_reset_for_unknown_email_does_not_send(monkeypatc
     async def fake_create_password_reset_token(*_args, **_kwargs):
         raise AssertionError("token should not be created")
 
-    class FakeEmailProvider:
-        async def send(self, _payload):
-            raise AssertionError("email should not be sent")
+    async def fake_enqueue_email(_payload, password_reset_token_id=None):
+        raise AssertionError("email should not be queued")
 
     monkeypatch.setattr(password_reset, "get_user_by_email", fake_get_user_by_email)
     monkeypatch.setattr(
@@ -76,53 +83,13 @@ async def test_request_password_reset_for_unknown_email_does_not_send(monkeypatc
         "create_password_reset_token",
         fake_create_password_reset_token,
     )
-    monkeypatch.setattr(password_reset, "get_email_provider", lambda: FakeEmailProvider())
+    monkeypatch.setattr(password_reset, "enqueue_email", fake_enqueue_email)
 
     result = await password_reset.request_password_reset("missing@example.com")
 
     assert result == password_reset.PASSWORD_RESET_REQUEST_MESSAGE
 
 
-@pytest.mark.asyncio
-async def test_request_password_reset_invalidates_token_when_email_fails(monkeypatch):
-    user_id = uuid4()
-    invalidated = {}
-
-    async def fake_get_user_by_email(email):
-        return SimpleNamespace(id=user_id, email=email)
-
-    async def fake_create_password_reset_token(*_args, **_kwargs):
-        return None
-
-    async def fake_invalidate_password_reset_token(token_hash, now):
-        invalidated["token_hash"] = token_hash
-        invalidated["now"] = now
-
-    class FailingEmailProvider:
-        async def send(self, _payload):
-            raise EmailDeliveryError("mail unavailable")
-
-    monkeypatch.setattr(password_reset, "get_user_by_email", fake_get_user_by_email)
-    monkeypatch.setattr(
-        password_reset.reset_tokens_repo,
-        "create_password_reset_token",
-        fake_create_password_reset_token,
-    )
-    monkeypatch.setattr(
-        password_reset.reset_tokens_repo,
-        "invalidate_password_reset_token",
-        fake_invalidate_password_reset_token,
-    )
-    monkeypatch.setattr(password_reset, "get_email_provider", lambda: FailingEmailProvider())
-    monkeypatch.setattr(password_reset, "token_urlsafe", lambda length: "reset-token")
-
-    with pytest.raises(EmailDeliveryError):
-        await password_reset.request_password_reset("user@example.com")
-
-    assert invalidated["token_hash"] == sha256(b"reset-token").hexdigest()
-    assert invalidated["now"] is not None
-
-
 @pytest.mark.asyncio
 async def test_reset_password_uses_token_hash_and_new_password(monkeypatch):
     captured = {}
@@ -133,7 +100,10 @@ async def test_reset_password_uses_token_hash_and_new_password(monkeypatch):
         captured["now"] = now
         return True
 
-    monkeypatch.setattr(password_reset, "hash_password", lambda password: f"hashed-{password}")
+    async def fake_hash_password(password):
+        return f"hashed-{password}"
+
+    monkeypatch.setattr(password_reset, "hash_password", fake_hash_password)
     monkeypatch.setattr(
         password_reset.reset_tokens_repo,
         "use_password_reset_token",
@@ -163,25 +133,18 @@ async def test_reset_password_rejects_invalid_token(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_mail_service_provider_posts_message(monkeypatch):
+async def test_mail_service_provider_posts_message():
     requests = []
 
     def handler(request):
         requests.append(request)
         return httpx.Response(200, json={"success": True, "logs": []})
 
-    transport = httpx.MockTransport(handler)
-    original_client = httpx.AsyncClient
-    monkeypatch.setattr(
-        email_service.httpx,
-        "AsyncClient",
-        lambda timeout: original_client(transport=transport, timeout=timeout),
-    )
-
     provider = MailServiceHttpProvider(
         base_url="https://mail.example.com/",
         from_user="root",
         timeout_seconds=3,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
     )
     await provider.send(
         EmailPayload(
@@ -202,7 +165,7 @@ async def test_mail_service_provider_posts_message(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_mail_service_provider_raises_on_unsuccessful_response(monkeypatch):
+async def test_mail_service_provider_raises_on_unsuccessful_response():
     def handler(_request):
         return httpx.Response(
             200,
@@ -218,18 +181,11 @@ async def test_mail_service_provider_raises_on_unsuccessful_response(monkeypatch
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    original_client = httpx.AsyncClient
-    monkeypatch.setattr(
-        email_service.httpx,
-        "AsyncClient",
-        lambda timeout: original_client(transport=transport, timeout=timeout),
-    )
-
     provider = MailServiceHttpProvider(
         base_url="https://mail.example.com",
         from_user="root",
         timeout_seconds=3,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
     )
 
     with pytest.raises(EmailDeliveryError) as exc:
@@ -243,6 +199,37 @@ async def test_mail_service_provider_raises_on_unsuccessful_response(monkeypatch
         )
 
     assert "DNS_LOOKUP" in str(exc.value)
+    # Сервис ответил, значит он доступен: цепь не размыкается
+    assert provider.is_available()
+
+
+@pytest.mark.asyncio
+async def test_mail_service_provider_reuses_client_and_fails_fast_when_down():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = MailServiceHttpProvider(
+        base_url="https://mail.example.com",
+        from_user="root",
+        timeout_seconds=3,
+        client=client,
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60),
+    )
+    payload = EmailPayload(to="user@example.com", subject="Subject", text="Text", html="<p>Text</p>")
+
+    for _ in range(2):
+        with pytest.raises(EmailDeliveryError):
+            await provider.send(payload)
+    with pytest.raises(MailServiceUnavailable):
+        await provider.send(payload)
+
+    assert provider.client is client
+    assert len(calls) == 2
+    assert not provider.is_available()
 
 
 @pytest.mark.asyncio
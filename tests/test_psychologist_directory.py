@@ -0,0 +1,89 @@
+from httpx import ASGITransport, AsyncClient
+
+import psychohelp.config.config as config_module
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.main import app
+from psychohelp.models.psychologists import parse_consult_areas
+from psychohelp.models.roles import Role
+from psychohelp.repositories.psychologists.directory import DirectoryFilters, get_facet_counts, search_psychologists
+from psychohelp.repositories.psychologists.psychologists import PSYCHOLOGISTS_KEYSET, create_psychologist
+from psychohelp.services.query_log import assert_max_queries
+
+from .factories import PSYCHOLOGIST_PROFILE, make_user
+
+
+PSYCHOLOGISTS = (
+    ("Анна", "Смирнова", "Тревожность, Отношения", "А-101", "КПТ-терапевт"),
+    ("Петр", "Иванов", "Тревожность,  учеба и стресс", "Б-202", "КПТ-терапевт"),
+    ("Ольга", "Кузнецова", "Отношения", "А-101", "Психоаналитик"),
+)
+
+
+async def _seed() -> dict[str, object]:
+    async with config_module.get_async_db() as session:
+        session.add(Role(code=RoleCode.PSYCHOLOGIST, name="Психолог"))
+        users = [
+            make_user(index, first_name=first_name, last_name=last_name)
+            for index, (first_name, last_name, *_) in enumerate(PSYCHOLOGISTS)
+        ]
+        session.add_all(users)
+
+    ids = {}
+    for user, (_, last_name, areas, office, qualification) in zip(users, PSYCHOLOGISTS):
+        psychologist = await create_psychologist(user.id, {
+            **PSYCHOLOGIST_PROFILE, "qualification": qualification, "consult_areas": areas, "office": office,
+        })
+        ids[last_name] = psychologist.id
+    return ids
+
+
+def test_parse_consult_areas():
+    assert parse_consult_areas(" Тревожность,  учеба  и стресс,,Тревожность ") == ["Тревожность", "учеба и стресс"]
+
+
+async def test_filters_combine_facets(statements):
+    ids = await _seed()
+
+    both = await search_psychologists(DirectoryFilters(consult_areas=("Тревожность", "Отношения"), offices=("А-101",)))
+    by_name = await search_psychologists(DirectoryFilters(name="Смирн Анн"))
+
+    assert {p.id for p in both} == {ids["Смирнова"], ids["Кузнецова"]}
+    assert [p.id for p in by_name] == [ids["Смирнова"]]
+    assert sorted(area.name for area in by_name[0].consult_area_tags) == ["Отношения", "Тревожность"]
+
+
+async def test_pages_are_ordered_by_last_name(statements):
+    ids = await _seed()
+
+    first = await search_psychologists(DirectoryFilters(), take=2)
+    cursor = PSYCHOLOGISTS_KEYSET.next_cursor(first, 2)
+    second = await search_psychologists(DirectoryFilters(), take=2, cursor=cursor)
+
+    assert [p.id for p in first + second] == [ids["Иванов"], ids["Кузнецова"], ids["Смирнова"]]
+
+
+async def test_facet_counts_ignore_own_filter(statements):
+    await _seed()
+
+    with assert_max_queries(1):
+        facets = await get_facet_counts(DirectoryFilters(offices=("А-101",)))
+
+    assert facets["offices"] == [("А-101", 2), ("Б-202", 1)]
+    assert facets["qualifications"] == [("КПТ-терапевт", 1), ("Психоаналитик", 1)]
+    assert facets["consult_areas"] == [("Отношения", 2), ("Тревожность", 1)]
+
+
+async def test_directory_endpoint(statements):
+    ids = await _seed()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(
+            "/therapists/directory", params={"area": "учеба и стресс", "qualification": "КПТ-терапевт"}
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [str(ids["Иванов"])]
+    assert body["items"][0]["areas"] == ["Тревожность", "учеба и стресс"]
+    assert body["facets"]["qualifications"] == [{"value": "КПТ-терапевт", "count": 1}]
+    assert body["facets"]["consult_areas"][0] == {"value": "Тревожность", "count": 2}
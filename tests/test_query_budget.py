@@ -0,0 +1,71 @@
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from starlette.responses import PlainTextResponse
+
+import psychohelp.config.config as config_module
+import psychohelp.main as main_module
+from psychohelp.constants.rbac import RoleCode
+from psychohelp.middleware.query_budget import QueryBudgetMiddleware
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.users import User
+from psychohelp.repositories import create_access_token
+from psychohelp.services.query_log import QueryBudgetExceeded, assert_max_queries, track_queries
+
+from .factories import make_user
+
+
+async def _lookup_users_one_by_one(scope, receive, send):
+    async with config_module.get_async_db() as session:
+        for _ in range(3):
+            await session.execute(select(User.id).where(User.id == uuid4()))
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def _get(app, url: str, token: str | None = None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        if token:
+            client.cookies.set("access_token", token)
+        return await client.get(url)
+
+
+async def test_assert_max_queries_reports_statements(statements):
+    with pytest.raises(QueryBudgetExceeded) as error:
+        with track_queries() as outer, assert_max_queries(1):
+            async with config_module.get_async_db() as session:
+                await session.execute(select(User.id))
+                await session.execute(select(Application.id))
+
+    assert outer.count == 2
+    assert "при лимите 1" in str(error.value)
+    assert "FROM applications" in str(error.value)
+
+
+async def test_middleware_flags_repeated_statements(statements):
+    app = QueryBudgetMiddleware(_lookup_users_one_by_one, repeat_threshold=3)
+
+    response = await _get(app, "/")
+
+    assert response.headers["X-DB-Queries"] == "3"
+    assert response.headers["X-DB-Repeated-Queries"] == "2"
+
+
+async def test_application_endpoint_query_budget(statements, monkeypatch):
+    monkeypatch.setattr(config_module.config, "DB_QUERY_DEBUG", True)
+    app = main_module.get_application()
+    async with config_module.get_async_db() as session:
+        user = make_user()
+        application = Application(user=user, status=ApplicationStatus.NEW.value,
+                                  problem_description="Описание", university_status="студент")
+        session.add(application)
+    token = create_access_token(user.id, roles=[RoleCode.USER.value])
+
+    # Заявка и ее автор; пустые связи selectinload не запрашивает
+    with assert_max_queries(2):
+        response = await _get(app, f"/applications/{application.id}", token)
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "2"
+    assert response.headers["X-DB-Repeated-Queries"] == "0"
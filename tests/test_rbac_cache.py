@@ -0,0 +1,120 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from psychohelp.config.config import get_async_db
+from psychohelp.constants.rbac import PermissionCode, RoleCode
+from psychohelp.services.rbac import cache as cache_module
+from psychohelp.services.rbac import roles as roles_service
+from psychohelp.services.rbac.cache import PermissionCache
+
+
+USER_ROLE_ID = uuid4()
+ADMIN_ROLE_ID = uuid4()
+
+
+@pytest.fixture
+def repo_calls(monkeypatch):
+    calls = {"roles": 0, "users": 0}
+    user_roles = {}
+
+    async def fake_get_role_permission_codes():
+        calls["roles"] += 1
+        return [
+            (USER_ROLE_ID, RoleCode.USER.value, PermissionCode.APPOINTMENTS_CREATE_OWN.value),
+            (USER_ROLE_ID, RoleCode.USER.value, PermissionCode.APPOINTMENTS_VIEW_OWN.value),
+            (ADMIN_ROLE_ID, RoleCode.ADMIN.value, PermissionCode.PSYCHOLOGISTS_MANAGE.value),
+        ]
+
+    async def fake_get_user_role_ids(user_id):
+        calls["users"] += 1
+        return list(user_roles.get(user_id, []))
+
+    monkeypatch.setattr(cache_module, "repo_get_role_permission_codes", fake_get_role_permission_codes)
+    monkeypatch.setattr(cache_module, "repo_get_user_role_ids", fake_get_user_role_ids)
+    calls["user_roles"] = user_roles
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_permissions_are_resolved_without_repeated_queries(repo_calls):
+    cache = PermissionCache(user_ttl_seconds=60, max_users=100)
+    user_id = uuid4()
+    repo_calls["user_roles"][user_id] = [USER_ROLE_ID]
+
+    for _ in range(5):
+        permissions = await cache.get_user_permissions(user_id)
+
+    assert permissions == frozenset({
+        PermissionCode.APPOINTMENTS_CREATE_OWN.value,
+        PermissionCode.APPOINTMENTS_VIEW_OWN.value,
+    })
+    assert repo_calls["roles"] == 1
+    assert repo_calls["users"] == 1
+    assert await cache.get_user_role_codes(user_id) == frozenset({RoleCode.USER.value})
+
+
+@pytest.mark.asyncio
+async def test_user_entry_expires_after_ttl(repo_calls):
+    cache = PermissionCache(user_ttl_seconds=0, max_users=100)
+    user_id = uuid4()
+
+    await cache.get_user_permissions(user_id)
+    await cache.get_user_permissions(user_id)
+
+    assert repo_calls["users"] == 2
+    assert repo_calls["roles"] == 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_user_entry(repo_calls, monkeypatch):
+    cache = PermissionCache(user_ttl_seconds=60, max_users=100)
+    monkeypatch.setattr(roles_service, "permission_cache", cache)
+    user_id = uuid4()
+    repo_calls["user_roles"][user_id] = [USER_ROLE_ID]
+
+    assert PermissionCode.PSYCHOLOGISTS_MANAGE.value not in await cache.get_user_permissions(user_id)
+
+    async def fake_repo_assign_role_to_user(actual_user_id, role_code):
+        assert role_code == RoleCode.ADMIN
+        repo_calls["user_roles"][actual_user_id].append(ADMIN_ROLE_ID)
+        return True
+
+    monkeypatch.setattr(roles_service, "repo_assign_role_to_user", fake_repo_assign_role_to_user)
+
+    assert await roles_service.assign_role_to_user(user_id, RoleCode.ADMIN) is True
+    assert PermissionCode.PSYCHOLOGISTS_MANAGE.value in await cache.get_user_permissions(user_id)
+    assert repo_calls["users"] == 2
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_user_entry_only_after_commit(repo_calls, monkeypatch, statements):
+    cache = PermissionCache(user_ttl_seconds=60, max_users=100)
+    monkeypatch.setattr(roles_service, "permission_cache", cache)
+    user_id = uuid4()
+    repo_calls["user_roles"][user_id] = [USER_ROLE_ID]
+
+    async def fake_repo_assign_role_to_user(actual_user_id, role_code):
+        repo_calls["user_roles"][actual_user_id].append(ADMIN_ROLE_ID)
+        return True
+
+    monkeypatch.setattr(roles_service, "repo_assign_role_to_user", fake_repo_assign_role_to_user)
+
+    async with get_async_db() as session:
+        await session.execute(text("SELECT 1"))
+        await cache.get_user_permissions(user_id)
+        await roles_service.assign_role_to_user(user_id, RoleCode.ADMIN)
+        # До commit другие запросы видят старые роли, кэш остается согласованным с ними
+        assert PermissionCode.PSYCHOLOGISTS_MANAGE.value not in await cache.get_user_permissions(user_id)
+
+    assert PermissionCode.PSYCHOLOGISTS_MANAGE.value in await cache.get_user_permissions(user_id)
+
+
+@pytest.mark.asyncio
+async def test_role_codes_resolve_to_permissions(repo_calls):
+    cache = PermissionCache(user_ttl_seconds=60, max_users=100)
+
+    permissions = await cache.get_role_codes_permissions({RoleCode.ADMIN.value, "unknown"})
+
+    assert permissions == frozenset({PermissionCode.PSYCHOLOGISTS_MANAGE.value})
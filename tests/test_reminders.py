@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+import psychohelp.config.config as config_module
+from psychohelp.models.appointments import Appointment, AppointmentStatus, AppointmentType
+from psychohelp.models.email_outbox import EmailOutbox
+from psychohelp.services.appointments.reminders import ReminderScheduler
+
+from .factories import make_psychologist, make_user
+
+NOW = datetime(2030, 3, 4, 9, 0, tzinfo=timezone.utc)
+
+
+async def _seed(*reminders: tuple[timedelta, AppointmentStatus]) -> list[Appointment]:
+    async with config_module.get_async_db() as session:
+        patient = make_user(2, first_name="Петр", last_name="Петров", email="patient@example.com")
+        psychologist = make_psychologist()
+        session.add_all([patient, psychologist])
+        await session.flush()
+
+        appointments = [
+            Appointment(
+                patient_id=patient.id,
+                psychologist_id=psychologist.id,
+                type=AppointmentType.Offline,
+                status=status,
+                scheduled_time=NOW + offset + timedelta(hours=index + 1),
+                remind_time=NOW + offset,
+                last_change_time=NOW,
+                venue="А-101",
+            )
+            for index, (offset, status) in enumerate(reminders)
+        ]
+        session.add_all(appointments)
+    return appointments
+
+
+async def _outbox() -> list[EmailOutbox]:
+    async with config_module.get_async_db() as session:
+        return list((await session.execute(select(EmailOutbox))).scalars())
+
+
+async def test_due_reminders_are_queued_once_across_workers(statements):
+    due, _cancelled, later = await _seed(
+        (timedelta(minutes=-5), AppointmentStatus.awaiting),
+        (timedelta(minutes=-5), AppointmentStatus.cancelled),
+        (timedelta(minutes=30), AppointmentStatus.awaiting),
+    )
+    first, second = ReminderScheduler(horizon_seconds=3600), ReminderScheduler(horizon_seconds=3600)
+    await first.reload(NOW)
+    await second.reload(NOW)
+
+    assert len(first) == 2
+    assert await first.run_due(NOW) == 1
+    assert await second.run_due(NOW) == 0
+
+    emails = await _outbox()
+    assert [email.recipient for email in emails] == ["patient@example.com"]
+    assert "А-101" in emails[0].text
+
+    # Следующее напоминание уходит, когда наступает его время
+    assert await first.run_due(NOW + timedelta(minutes=30)) == 1
+    assert first.sent == 2
+
+
+async def test_schedule_and_discard_update_loaded_window(statements):
+    (appointment,) = await _seed((timedelta(hours=2), AppointmentStatus.awaiting))
+    scheduler = ReminderScheduler(horizon_seconds=3600)
+    await scheduler.reload(NOW)
+    assert len(scheduler) == 0
+
+    # Напоминание перенесли внутрь окна, затем запись отменили
+    scheduler.schedule(appointment.id, NOW + timedelta(minutes=10))
+    assert len(scheduler) == 1
+    scheduler.discard(appointment.id)
+
+    assert await scheduler.run_due(NOW + timedelta(minutes=10)) == 0
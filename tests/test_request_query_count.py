@@ -0,0 +1,94 @@
+from httpx import ASGITransport, AsyncClient
+
+import psychohelp.config.config as config_module
+from psychohelp.constants.rbac import PermissionCode, RoleCode
+from psychohelp.main import app
+from psychohelp.models.applications import Application
+from psychohelp.models.permissions import Permission
+from psychohelp.models.roles import Role
+from psychohelp.models.users import User
+from psychohelp.repositories import create_access_token
+from psychohelp.services.rbac.cache import permission_cache
+
+from .factories import make_user
+
+
+async def _create_user(role_code: RoleCode, permission_codes: list[PermissionCode]) -> User:
+    async with config_module.get_async_db() as session:
+        role = Role(code=role_code, name=role_code.value)
+        role.permissions = [
+            Permission(code=code, name=code.value, resource=code.value.split(".")[0])
+            for code in permission_codes
+        ]
+        user = make_user(email=f"{role_code.value}@example.com")
+        user.roles = [role]
+        session.add(user)
+    return user
+
+
+def _selects_from(executed: list[str], table: str) -> int:
+    """Сколько раз загружались строки самой таблицы (без selectinload-подзапросов)"""
+    return sum(1 for statement in executed if statement.startswith(f"SELECT {table}.id"))
+
+
+async def _request(method: str, url: str, token: str, **kwargs):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        client.cookies.set("access_token", token)
+        return await client.request(method, url, **kwargs)
+
+
+async def test_applications_list_does_not_load_user(statements):
+    user = await _create_user(RoleCode.PSYCHOLOGIST, [])
+    token = create_access_token(user.id, roles=[RoleCode.PSYCHOLOGIST.value])
+    statements.clear()
+
+    response = await _request("GET", "/applications/", token)
+
+    assert response.status_code == 200
+    assert _selects_from(statements, "users") == 0
+    assert len(statements) == 1
+
+
+async def test_permission_check_reuses_loaded_user(statements):
+    user = await _create_user(RoleCode.ADMIN, [PermissionCode.ARTICLES_CREATE])
+    token = create_access_token(user.id, roles=[RoleCode.ADMIN.value])
+
+    await permission_cache.get_role_codes_permissions([])  # прогреваем карту ролей
+    statements.clear()
+
+    response = await _request("POST", "/articles/", token, json={"title": "Заголовок", "text": "Текст"})
+
+    assert response.status_code == 201
+    assert _selects_from(statements, "users") == 1
+    assert _selects_from(statements, "roles") == 0
+    # пользователь + его роли + вставка статьи + ее перечитывание
+    assert len(statements) == 4
+
+
+async def test_applications_summary_is_single_query(statements):
+    manager = await _create_user(RoleCode.PSYCHOLOGIST, [])
+    async with config_module.get_async_db() as session:
+        applicant = make_user(1, first_name="Петр", last_name="Петров")
+        session.add(applicant)
+        await session.flush()
+        session.add_all(
+            Application(
+                user_id=applicant.id,
+                assigned_to=manager.id,
+                problem_description="Описание",
+                university_status="студент",
+            )
+            for _ in range(3)
+        )
+    token = create_access_token(manager.id, roles=[RoleCode.PSYCHOLOGIST.value])
+    statements.clear()
+
+    response = await _request("GET", "/applications/summary", token)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    rows = response.json()
+    assert len(rows) == 3
+    assert rows[0]["user_name"] == "Петров Петр"
+    assert rows[0]["assigned_to_name"] == "Иванов Иван"
+    assert rows[0]["psychologist_name"] is None
@@ -7,6 +7,7 @@ from fastapi import HTTPException
 from psychohelp.constants.rbac import RoleCode
 from psychohelp.routes.controllers import roles as roles_controller
 from psychohelp.schemas.roles import RoleAssignRequest, RoleRemoveRequest
+from psychohelp.services.users.models import CurrentPrincipal, RequestIdentity
 
 
 @pytest.mark.asyncio
@@ -14,22 +15,18 @@ async def test_assign_role_allows_admin_role(monkeypatch):
     current_user_id = uuid4()
     target_user_id = uuid4()
 
-    monkeypatch.setattr(
-        roles_controller,
-        "get_user_id_from_token",
-        lambda token: current_user_id,
-    )
-
-    async def fake_get_user_by_id(user_id):
-        assert user_id == current_user_id
-        return SimpleNamespace(roles=[SimpleNamespace(code=RoleCode.ADMIN)])
+    async def fake_get_request_identity(request):
+        assert request.cookies["access_token"] == "token"
+        return RequestIdentity(
+            principal=CurrentPrincipal(user_id=current_user_id, role_codes=frozenset({RoleCode.ADMIN.value}))
+        )
 
     async def fake_assign_role_to_user(user_id, role_code):
         assert user_id == target_user_id
         assert role_code == RoleCode.PSYCHOLOGIST
         return True
 
-    monkeypatch.setattr(roles_controller.users, "get_user_by_id", fake_get_user_by_id)
+    monkeypatch.setattr(roles_controller, "get_request_identity", fake_get_request_identity)
     monkeypatch.setattr(roles_controller, "assign_role_to_user", fake_assign_role_to_user)
 
     result = await roles_controller.assign_role(
@@ -43,15 +40,15 @@ async def test_assign_role_allows_admin_role(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_assign_role_forbids_non_admin_role(monkeypatch):
-    monkeypatch.setattr(roles_controller, "get_user_id_from_token", lambda token: uuid4())
-
-    async def fake_get_user_by_id(_user_id):
-        return SimpleNamespace(roles=[SimpleNamespace(code=RoleCode.USER)])
+    async def fake_get_request_identity(_request):
+        return RequestIdentity(
+            principal=CurrentPrincipal(user_id=uuid4(), role_codes=frozenset({RoleCode.USER.value}))
+        )
 
     async def fake_assign_role_to_user(_user_id, _role_code):
         raise AssertionError("role should not be assigned")
 
-    monkeypatch.setattr(roles_controller.users, "get_user_by_id", fake_get_user_by_id)
+    monkeypatch.setattr(roles_controller, "get_request_identity", fake_get_request_identity)
     monkeypatch.setattr(roles_controller, "assign_role_to_user", fake_assign_role_to_user)
 
     with pytest.raises(HTTPException) as exc:
@@ -70,22 +67,18 @@ async def test_remove_role_allows_admin_role(monkeypatch):
     current_user_id = uuid4()
     target_user_id = uuid4()
 
-    monkeypatch.setattr(
-        roles_controller,
-        "get_user_id_from_token",
-        lambda token: current_user_id,
-    )
-
-    async def fake_get_user_by_id(user_id):
-        assert user_id == current_user_id
-        return SimpleNamespace(roles=[SimpleNamespace(code=RoleCode.ADMIN)])
+    async def fake_get_request_identity(request):
+        assert request.cookies["access_token"] == "token"
+        return RequestIdentity(
+            principal=CurrentPrincipal(user_id=current_user_id, role_codes=frozenset({RoleCode.ADMIN.value}))
+        )
 
     async def fake_remove_role_from_user(user_id, role_code):
         assert user_id == target_user_id
         assert role_code == RoleCode.PSYCHOLOGIST
         return True
 
-    monkeypatch.setattr(roles_controller.users, "get_user_by_id", fake_get_user_by_id)
+    monkeypatch.setattr(roles_controller, "get_request_identity", fake_get_request_identity)
     monkeypatch.setattr(roles_controller, "remove_role_from_user", fake_remove_role_from_user)
 
     result = await roles_controller.remove_role(
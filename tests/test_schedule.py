@@ -0,0 +1,134 @@
+import random
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+
+import psychohelp.config.config as config_module
+from psychohelp.main import app
+from psychohelp.models.appointments import Appointment, AppointmentStatus, AppointmentType
+from psychohelp.models.psychologists import Psychologist
+from psychohelp.models.working_hours import WorkingHours
+from psychohelp.repositories.appointments import has_overlapping_appointment
+from psychohelp.schemas.schedule import WorkingHoursRequest
+from psychohelp.services.schedule.intervals import IntervalIndex
+from psychohelp.services.schedule.schedule import build_slots
+
+from .factories import make_psychologist
+
+MSK = ZoneInfo("Europe/Moscow")
+# Понедельник
+MONDAY = datetime(2030, 3, 4, tzinfo=MSK)
+
+
+def test_interval_index_matches_linear_scan():
+    rng = random.Random(7)
+    for _ in range(500):
+        intervals = [
+            (start, start + rng.randint(1, 20))
+            for start in (rng.randint(0, 100) for _ in range(rng.randint(0, 30)))
+        ]
+        index = IntervalIndex(intervals)
+        start = rng.randint(0, 120)
+        end = start + rng.randint(1, 20)
+
+        expected = any(a < end and start < b for a, b in intervals)
+        assert index.overlaps(start, end) is expected
+
+
+def test_build_slots_skips_busy_time():
+    template = [WorkingHours(weekday=0, start_time=time(10), end_time=time(13), slot_minutes=60)]
+    busy = IntervalIndex([(MONDAY.replace(hour=11, minute=30), MONDAY.replace(hour=12, minute=30))])
+
+    slots = build_slots(template, busy, MONDAY, MONDAY + timedelta(days=7), MSK)
+
+    assert [slot.start.astimezone(MSK).hour for slot in slots] == [10]
+
+
+def test_build_slots_last_appointment_length_not_template_step():
+    template = [WorkingHours(weekday=0, start_time=time(10), end_time=time(13), slot_minutes=30)]
+    busy = IntervalIndex([(MONDAY.replace(hour=11), MONDAY.replace(hour=12))])
+
+    slots = build_slots(template, busy, MONDAY, MONDAY + timedelta(days=1), MSK, timedelta(minutes=60))
+
+    # 10:30 пересеклась бы с 11:00, 12:30 вышла бы за конец рабочего времени
+    assert [slot.start.astimezone(MSK).strftime("%H:%M") for slot in slots] == ["10:00", "12:00"]
+    assert all(slot.end - slot.start == timedelta(minutes=60) for slot in slots)
+
+
+def test_working_hours_request_rejects_overlapping_ranges():
+    items = [
+        {"weekday": 0, "start_time": "10:00", "end_time": "13:00"},
+        {"weekday": 0, "start_time": "12:00", "end_time": "15:00"},
+    ]
+    with pytest.raises(ValidationError):
+        WorkingHoursRequest(items=items)
+
+    items[1]["weekday"] = 1
+    assert len(WorkingHoursRequest(items=items).items) == 2
+
+
+async def _seed_psychologist() -> Psychologist:
+    async with config_module.get_async_db() as session:
+        psychologist = make_psychologist()
+        session.add(psychologist)
+        await session.flush()
+        session.add(
+            WorkingHours(
+                psychologist_id=psychologist.id,
+                weekday=0,
+                start_time=time(10),
+                end_time=time(13),
+                slot_minutes=60,
+            )
+        )
+        session.add(
+            Appointment(
+                patient_id=psychologist.user_id,
+                psychologist_id=psychologist.id,
+                type=AppointmentType.Offline,
+                status=AppointmentStatus.awaiting,
+                # SQLite хранит время без зоны, поэтому сразу в UTC
+                scheduled_time=MONDAY.replace(hour=11).astimezone(timezone.utc),
+                last_change_time=MONDAY.astimezone(timezone.utc),
+                venue="А-101",
+            )
+        )
+    return psychologist
+
+
+async def test_slots_endpoint_excludes_booked_time(statements):
+    psychologist = await _seed_psychologist()
+    params = {"from": MONDAY.isoformat(), "to": (MONDAY + timedelta(days=7)).isoformat()}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        one = await client.get(f"/therapists/{psychologist.id}/slots", params=params)
+        everyone = await client.get("/therapists/slots", params=params)
+
+    assert one.status_code == 200
+    starts = [datetime.fromisoformat(slot["start"]).astimezone(MSK).hour for slot in one.json()]
+    assert starts == [10, 12]
+    assert everyone.json() == [{"psychologist_id": str(psychologist.id), "slots": one.json()}]
+
+
+async def test_slots_endpoint_rejects_too_long_range(statements):
+    params = {"from": MONDAY.isoformat(), "to": (MONDAY + timedelta(days=365)).isoformat()}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/therapists/slots", params=params)
+
+    assert response.status_code == 400
+
+
+async def test_overlapping_appointment_is_detected(statements):
+    psychologist = await _seed_psychologist()
+    booked = MONDAY.replace(hour=11).astimezone(timezone.utc)
+
+    assert await has_overlapping_appointment(
+        psychologist.id, booked + timedelta(minutes=30), booked + timedelta(minutes=90)
+    )
+    assert not await has_overlapping_appointment(
+        psychologist.id, booked + timedelta(hours=1), booked + timedelta(hours=2)
+    )
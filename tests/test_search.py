@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from psychohelp.main import app
+from psychohelp.repositories import articles as articles_repo
+from psychohelp.repositories.news import NEWS_SEARCH
+from psychohelp.repositories.pagination import NEXT_CURSOR_HEADER
+from psychohelp.services import articles as articles_service
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=asyncpg.dialect()))
+
+
+def test_search_statement_builds_snippets_for_page_only():
+    sql = _sql(NEWS_SEARCH.statement(take=20))
+
+    page_start = sql.index("(SELECT")
+    assert "news.search_vector @@ websearch_to_tsquery" in sql
+    assert "ts_rank(news.search_vector" in sql[page_start:]
+    assert "ts_headline" in sql[:page_start]
+    assert "ORDER BY anon_1.rank DESC, anon_1.id DESC" in sql
+
+
+def test_search_cursor_continues_after_last_row():
+    rows = [SimpleNamespace(id=uuid4(), rank=0.6), SimpleNamespace(id=uuid4(), rank=0.25)]
+    cursor = NEWS_SEARCH.next_cursor(rows, take=2)
+
+    sql = _sql(NEWS_SEARCH.statement(take=2, cursor=cursor))
+
+    assert "(ts_rank(news.search_vector" in sql
+    assert ", news.id) < (" in sql
+    assert NEWS_SEARCH.next_cursor(rows[:1], take=2) is None
+
+
+async def test_search_articles_route(monkeypatch):
+    article_id = uuid4()
+    rows = [SimpleNamespace(id=article_id, title="Тревога", rank=0.5, snippet="<mark>тревога</mark> перед сессией")]
+
+    async def fake_search(query, take, cursor):
+        assert (query, take, cursor) == ("тревога", 1, None)
+        return rows
+
+    monkeypatch.setattr(articles_service.repo, "search_articles", fake_search)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/articles/search", params={"q": "тревога", "take": 1})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": str(article_id), "title": "Тревога", "snippet": "<mark>тревога</mark> перед сессией", "rank": 0.5}
+    ]
+    assert response.headers[NEXT_CURSOR_HEADER]
+
+
+async def test_search_vector_is_not_loaded_with_articles(statements):
+    article = await articles_repo.create_article({"title": "Заголовок", "text": "Текст"})
+
+    articles = await articles_repo.get_articles()
+
+    assert [item.id for item in articles] == [article.id]
+    assert "search_vector" not in statements[-1]
+
+
+async def test_generated_search_vector_is_left_out_of_writes(statements):
+    article = await articles_repo.create_article({"title": "Заголовок", "text": "Текст"})
+    await articles_repo.update_article(article.id, {"title": "Новый заголовок"})
+
+    writes = [sql for sql in statements if sql.startswith(("INSERT INTO articles", "UPDATE articles"))]
+    assert len(writes) == 2
+    assert all("search_vector" not in sql for sql in writes)
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+import psychohelp.config.config as config_module
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.appointments import Appointment
+from psychohelp.models.reviews import Review
+from psychohelp.models.users import User
+from psychohelp.repositories import verify_password
+from psychohelp.seeding.cli import seed
+from psychohelp.seeding.generator import SEED_PASSWORD, SEED_PASSWORD_HASH, DatasetGenerator, DatasetSize
+from psychohelp.seeding.loader import load_dataset
+
+
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+SIZE = DatasetSize(users=40, psychologists=3, appointments=60, applications=70, admins=2, review_share=0.5)
+
+
+def _generator(seed: int = 7) -> DatasetGenerator:
+    return DatasetGenerator(SIZE, seed=seed, password_hash="hash", now=NOW)
+
+
+def test_generator_is_deterministic():
+    first, second = _generator(), _generator()
+
+    assert list(first.users()) == list(second.users())
+    assert list(first.appointments()) == list(second.appointments())
+    assert list(first.applications()) == list(second.applications())
+    assert list(_generator(8).applications()) != list(first.applications())
+
+
+def test_generated_appointments_do_not_overlap():
+    by_psychologist: dict = {}
+    for row in _generator().appointments():
+        by_psychologist.setdefault(row["psychologist_id"], []).append(row)
+
+    for rows in by_psychologist.values():
+        rows.sort(key=lambda row: row["scheduled_time"])
+        for previous, current in zip(rows, rows[1:]):
+            assert previous["scheduled_end_time"] <= current["scheduled_time"]
+
+
+def test_dataset_size_validation():
+    with pytest.raises(ValueError):
+        DatasetSize(users=5, psychologists=5)
+
+
+def test_precomputed_password_hash():
+    assert verify_password(SEED_PASSWORD, SEED_PASSWORD_HASH)
+
+
+async def test_load_dataset(statements):
+    loaded = await load_dataset(_generator(), batch_size=25)
+
+    reviews = len(list(_generator().reviews()))
+    assert reviews > 0
+    assert loaded == {
+        "users": 40, "users_roles": 45, "psychologists": 3, "psychologists_consult_areas": 6, "appointments": 60,
+        "reviews": reviews, "applications": 70,
+    }
+    async with config_module.get_async_db() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 40
+        assert await session.scalar(select(func.count()).select_from(Appointment)) == 60
+        assert await session.scalar(select(func.count()).select_from(Review)) == reviews
+        statuses = set((await session.execute(select(Application.status).distinct())).scalars())
+    assert ApplicationStatus.COMPLETED.value in statuses
+
+
+async def test_seed_skips_loaded_database(statements):
+    assert await seed(SIZE, random_seed=7) is not None
+    assert await seed(SIZE, random_seed=7) is None
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import psychohelp.config.config as config_module
+from psychohelp.constants.rbac import PermissionCode, RoleCode
+from psychohelp.main import app
+from psychohelp.models.applications import Application, ApplicationStatus
+from psychohelp.models.permissions import Permission
+from psychohelp.models.roles import Role
+from psychohelp.repositories import create_access_token
+from psychohelp.services import statistics as statistics_service
+from psychohelp.services.statistics import StatisticsRefresher, statistics_refresher
+
+from .factories import make_user
+
+
+async def _get(url: str, role: RoleCode, params: dict | None = None):
+    async with config_module.get_async_db() as session:
+        manager = Role(code=RoleCode.ADMIN, name="Администратор")
+        code = PermissionCode.STATISTICS_VIEW
+        manager.permissions = [Permission(code=code, name=code.value, resource="statistics")]
+        session.add_all([manager, Role(code=RoleCode.USER, name="Пользователь")])
+    token = create_access_token(uuid4(), roles=[role.value])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        client.cookies.set("access_token", token)
+        return await client.get(url, params=params)
+
+
+async def test_refresher_skips_refresh_without_changes(monkeypatch):
+    refreshed = []
+
+    async def fake_refresh():
+        refreshed.append(True)
+        return True
+
+    monkeypatch.setattr(statistics_service.repo, "refresh_statistics_views", fake_refresh)
+    refresher = StatisticsRefresher(interval_seconds=60, max_age_seconds=3600)
+
+    assert await refresher.run_once() is True
+    assert await refresher.run_once() is False
+    refresher.mark_dirty()
+    assert await refresher.run_once() is True
+    assert len(refreshed) == 2
+
+
+async def test_refresher_skips_while_another_worker_refreshes(monkeypatch):
+    async def locked_elsewhere():
+        return False
+
+    monkeypatch.setattr(statistics_service.repo, "refresh_statistics_views", locked_elsewhere)
+    refresher = StatisticsRefresher(interval_seconds=60, max_age_seconds=3600)
+
+    assert await refresher.run_once() is True
+    assert refresher.refreshes == 0
+    assert refresher.needs_refresh is False
+
+
+def test_refresher_rejects_schedule_timezone_other_than_views(monkeypatch):
+    monkeypatch.setattr(statistics_service.config, "SCHEDULE_TIMEZONE", "Asia/Yekaterinburg")
+    refresher = StatisticsRefresher()
+
+    with pytest.raises(ValueError, match="SCHEDULE_TIMEZONE"):
+        refresher.start()
+
+
+async def test_committed_application_changes_mark_statistics_dirty(statements, monkeypatch):
+    async def fake_refresh():
+        return True
+
+    monkeypatch.setattr(statistics_service.repo, "refresh_statistics_views", fake_refresh)
+    await statistics_refresher.refresh()
+
+    async with config_module.get_async_db() as session:
+        session.add(make_user())
+    assert statistics_refresher.needs_refresh is False
+
+    async with config_module.get_async_db() as session:
+        session.add(Application(status=ApplicationStatus.NEW.value, problem_description="Описание",
+                                university_status="студент"))
+    assert statistics_refresher.needs_refresh is True
+
+
+async def test_application_statistics(statements, monkeypatch):
+    async def fake_counts():
+        return [
+            SimpleNamespace(status="completed", university_status="студент", applications=6),
+            SimpleNamespace(status="cancelled", university_status="студент", applications=1),
+            SimpleNamespace(status="completed", university_status="сотрудник", applications=3),
+        ]
+
+    async def fake_durations():
+        return SimpleNamespace(
+            median_seconds_to_in_progress=5400.0,
+            median_seconds_to_completed=None,
+            refreshed_at=datetime(2026, 3, 1, tzinfo=timezone.utc),
+        )
+
+    monkeypatch.setattr(statistics_service.repo, "get_application_counts", fake_counts)
+    monkeypatch.setattr(statistics_service.repo, "get_application_durations", fake_durations)
+
+    response = await _get("/statistics/applications", RoleCode.ADMIN)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total"] == 10
+    assert body["by_status"] == [{"value": "completed", "count": 9}, {"value": "cancelled", "count": 1}]
+    assert body["by_university_status"][0] == {"value": "студент", "count": 7}
+    assert body["cancellation_rate"] == 0.1
+    assert body["median_hours_to_in_progress"] == 1.5
+    assert body["median_hours_to_completed"] is None
+
+
+async def test_statistics_require_permission(statements):
+    response = await _get("/statistics/applications", RoleCode.USER)
+
+    assert response.status_code == 403
+
+
+async def test_psychologist_load_validates_period(statements):
+    response = await _get(
+        "/statistics/psychologists/load", RoleCode.ADMIN, {"from": "2026-03-01", "to": "2025-01-01"}
+    )
+
+    assert response.status_code == 400
+
+
+async def test_psychologist_load_cancellation_rate(monkeypatch):
+    psychologist_id = uuid4()
+
+    async def fake_load(date_from, date_to, psychologist_id_filter):
+        assert (date_from, date_to) == (date(2026, 3, 2), date(2026, 3, 15))
+        return [
+            SimpleNamespace(psychologist_id=psychologist_id, week=date(2026, 3, 2), appointments=8, done=6, cancelled=2),
+            SimpleNamespace(psychologist_id=psychologist_id, week=date(2026, 3, 9), appointments=12, done=9, cancelled=3),
+        ]
+
+    monkeypatch.setattr(statistics_service.repo, "get_psychologist_weekly_load", fake_load)
+
+    load = await statistics_service.get_psychologist_load(date(2026, 3, 2), date(2026, 3, 15))
+
+    assert (load["appointments"], load["cancelled"], load["cancellation_rate"]) == (20, 5, 0.25)
@@ -0,0 +1,106 @@
+import pytest
+
+import psychohelp.config.config as config_module
+from psychohelp.config.config import call_after_commit, get_async_db
+from psychohelp.dependencies.database import get_db_session
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.info = {}
+
+    def in_transaction(self):
+        return True
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    created = []
+
+    def factory():
+        session = FakeSession()
+        created.append(session)
+        return session
+
+    monkeypatch.setattr(config_module, "async_session", factory)
+    return created
+
+
+@pytest.mark.asyncio
+async def test_nested_units_of_work_share_one_session_and_commit_once(sessions):
+    async with get_async_db() as outer:
+        async with get_async_db() as first:
+            assert first is outer
+        async with get_async_db() as second:
+            assert second is outer
+        assert outer.commits == 0
+
+    assert len(sessions) == 1
+    assert sessions[0].commits == 1
+    assert sessions[0].closed
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_whole_transaction_on_error(sessions):
+    with pytest.raises(RuntimeError):
+        async with get_async_db():
+            async with get_async_db():
+                raise RuntimeError("boom")
+
+    assert len(sessions) == 1
+    assert sessions[0].commits == 0
+    assert sessions[0].rollbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_request_dependency_scopes_repository_sessions(sessions):
+    dependency = get_db_session()
+    request_session = await dependency.__anext__()
+
+    async with get_async_db() as repository_session:
+        assert repository_session is request_session
+
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+    assert len(sessions) == 1
+    assert request_session.commits == 1
+
+    async with get_async_db() as standalone:
+        assert standalone is not request_session
+    assert len(sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_run_only_after_successful_commit(sessions):
+    calls = []
+
+    async def callback():
+        calls.append(sessions[-1].commits)
+
+    async with get_async_db():
+        async with get_async_db():
+            await call_after_commit(callback)
+        assert calls == []
+    assert calls == [1]
+
+    with pytest.raises(RuntimeError):
+        async with get_async_db():
+            await call_after_commit(callback)
+            raise RuntimeError("boom")
+    assert calls == [1]
+
+    await call_after_commit(callback)
+    assert calls == [1, 0]